@@ -0,0 +1,79 @@
+"""Compares the per-site extract_education functions with the one-pass enrichment stage.
+
+Usage: python benchmarks/bench_enrich.py [--rows 20000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from enrich import CITIES, SKILLS, enrich, enrich_many
+
+def legacy_extract_education(text, window):
+    """The function each scraper carried before, differing only in the window size."""
+    if not text: return ""
+    clean = text.replace('\n', ' ')
+    patterns = [r"博士", r"硕士", r"研究生", r"本科"]
+    intro = clean[:window]
+    for p in patterns:
+        if re.search(p, intro):
+            return f"{p}及以上"
+    return "不限/未提及"
+
+YEAR_RE = re.compile(r"20\d{2}\s*(?:届|年?应届|年?毕业|年?[春秋]招|年?校招)")
+CITY_RE = re.compile("|".join(CITIES))
+SKILL_RE = re.compile("|".join(re.escape(s) for s in SKILLS), re.IGNORECASE)
+
+def separate_scans(texts):
+    """The same four fields extracted the straightforward way, one regex scan per field."""
+    text = "\n".join(t for t in texts if t)
+    return (legacy_extract_education(text, len(text)), YEAR_RE.findall(text),
+            CITY_RE.findall(text), SKILL_RE.findall(text))
+
+def make_texts(n):
+    """Yields (nature, requirement, description); every third posting states education late in the text."""
+    duty = "1. 负责游戏客户端功能开发与性能优化，参与引擎工具链建设；\n2. 与策划、美术协作推进版本迭代。\n" * 3
+    skills = "熟悉 C++/C#，了解 Lua 与 Unity 引擎，有 Python 脚本经验；工作地点：上海、深圳。\n"
+    for i in range(n):
+        if i % 3 == 0:
+            req = "1. 对游戏有热情，具备良好的沟通能力；\n" * 12 + skills + "5. 2026届本科及以上学历，计算机相关专业。"
+        else:
+            req = "1. 2026届硕士及以上学历，计算机相关专业；\n" + skills + "3. 对游戏有热情。"
+        yield "2026秋招", req, duty
+
+def measure(name, func, texts):
+    start = time.perf_counter()
+    results = func(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {elapsed:7.2f}s  {elapsed / len(texts) * 1e6:7.1f} us/row")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    texts = list(make_texts(args.rows))
+    print(f"Enriching {args.rows} postings")
+    # 旧版本各站点的窗口：米哈游 100、字节 200（只看任职要求），腾讯和美团 800（任职要求 + 工作职责）
+    legacy = {}
+    for name, window, joined in (("mihoyo (100 chars)", 100, False), ("bytedance (200 chars)", 200, False),
+                                 ("tencent/meituan (800)", 800, True)):
+        legacy[name] = measure(name, lambda rows: [legacy_extract_education(req + " " + desc if joined else req, window)
+                                                   for _, req, desc in rows], texts)
+    measure("separate scans (4)", lambda rows: [separate_scans(row) for row in rows], texts)
+    results = measure("enrich (4 fields)", lambda rows: list(enrich_many(rows)), texts)
+
+    print("\nEducation found vs. stated:")
+    stated = [enrich(req)["学历要求"] for _, req, _ in texts]
+    for name, values in legacy.items():
+        missed = sum(1 for value, expected in zip(values, stated) if value != expected)
+        print(f"{name:<22} {missed:>6} rows differ")
+    missed = sum(1 for result, expected in zip(results, stated) if result["学历要求"] != expected)
+    print(f"{'enrich (4 fields)':<22} {missed:>6} rows differ")
+    print(f"\nSample: {results[0]}")
+
+if __name__ == "__main__":
+    main()
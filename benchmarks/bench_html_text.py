@@ -0,0 +1,80 @@
+"""Measures HTML-to-text throughput on recorded detail payloads.
+
+Payloads are read from the HTTP cache that the Tencent and Meituan scrapers
+fill (.http_cache/ by default); when it holds no detail responses, synthetic
+payloads shaped like them are used instead.
+
+Usage: python benchmarks/bench_html_text.py [--cache-dir .http_cache] [--repeat 20]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_cache import DEFAULT_CACHE_DIR
+from html_text import html_to_text
+
+# 详情接口中的正文字段：腾讯 request/desc，美团 jobRequirement/jobDuty
+TEXT_KEYS = ("request", "desc", "jobRequirement", "jobDuty")
+
+def legacy_clean_text(text):
+    """The cleaner Tencent and Meituan used before: strip tags, squeeze newlines."""
+    if not text: return ""
+    text = re.sub(r'<[^>]+>', '', str(text))
+    text = re.sub(r'\n+', '\n', text)
+    return text.strip()
+
+def load_recorded(cache_dir):
+    texts = []
+    for path in glob.glob(os.path.join(cache_dir, "*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.loads(json.load(f)["text"]).get("data")
+        except (OSError, ValueError, KeyError, AttributeError):
+            continue
+        if isinstance(data, dict):
+            texts.extend(data[key] for key in TEXT_KEYS if isinstance(data.get(key), str))
+    return texts
+
+def make_synthetic(n):
+    texts = []
+    for i in range(n):
+        texts.append("<p>岗位职责：</p><ol>" + "".join(
+            f"<li>负责游戏客户端第 {k} 个模块的开发与&nbsp;性能优化，与策划&amp;美术协作；</li>" for k in range(5))
+            + "</ol>")
+        texts.append("<div>任职要求：<br/>1. 本科及以上学历&#65292;计算机相关专业；<br/>"
+                     "2. 熟悉 C++/C#，了解 Lua；</div><ul><li>有上线项目经验</li><li>热爱游戏</li></ul>")
+    return texts
+
+def measure(name, func, texts, repeat):
+    size = sum(len(t.encode("utf-8")) for t in texts) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(texts)
+    elapsed = time.perf_counter() - start
+    count = len(texts) * repeat
+    print(f"{name:<24} {elapsed:7.2f}s  {count / elapsed:10,.0f} texts/s  {size / elapsed / 1024 / 1024:7.1f} MB/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    texts = load_recorded(args.cache_dir) if os.path.isdir(args.cache_dir) else []
+    source = f"recorded payloads from {args.cache_dir}"
+    if not texts:
+        texts = make_synthetic(1000)
+        source = "synthetic payloads (no recorded detail responses found)"
+    print(f"{len(texts)} texts, {source}")
+
+    measure("legacy clean_text", lambda ts: [legacy_clean_text(t) for t in ts], texts, args.repeat)
+    measure("html_to_text", lambda ts: [html_to_text(t) for t in ts], texts, args.repeat)
+    print(f"\nSample:\n{html_to_text(texts[0])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Measures job_index build time and query latency at tens of thousands of postings.
+
+Postings are the scrapers' latest outputs in the project directory, repeated
+with varied titles and cities up to --postings. When no output exists,
+synthetic postings built from the mock payloads in benchmarks/mock_servers.py
+are used instead.
+
+Usage: python benchmarks/bench_job_index.py [--postings 30000] [--repeat 50]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+from enrich import enrich
+from html_text import html_to_text_many
+from job_index import SCRIPT_DIR, SITE_OUTPUTS, JobIndex, parse_query
+from sinks import find_output, read_rows
+from mock_servers import CITIES, FAMILIES, duty_html, requirement_html
+
+TITLES = ["后台开发工程师", "前端开发工程师", "算法工程师", "游戏客户端开发", "数据分析师", "产品经理",
+          "测试开发工程师", "大模型算法实习生", "嵌入式软件工程师", "交互设计师"]
+NATURES = ["应届生", "实习生", "2026届校园招聘", "日常实习"]
+QUERIES = ["后端", "算法 city:上海", "C++ Linux", "游戏 degree:硕士", "python nature:实习", "city:北京 category:技术",
+           "性能优化", "大模型", "Go", "沟通能力 团队"]
+
+def load_recorded():
+    rows = []
+    for site, base in SITE_OUTPUTS.items():
+        path = find_output(os.path.join(SCRIPT_DIR, base))
+        if path:
+            rows.extend((site, row) for row in read_rows(path))
+    return rows
+
+def replicate(recorded, n, seed=1):
+    """Repeats recorded postings up to n, varying title suffix and cities per copy."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        site, row = recorded[i % len(recorded)]
+        copy = i // len(recorded)
+        if copy:
+            row = dict(row, 岗位名称=f"{row.get('岗位名称')}-{copy}", 工作城市=" ".join(rng.sample(CITIES, rng.randint(1, 2))))
+        rows.append((site, row))
+    return rows
+
+def make_synthetic(n, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        req, duty = html_to_text_many([requirement_html(i), duty_html(i)])
+        title = f"{rng.choice(TITLES)}-{rng.choice(['基础架构', '广告', '推荐', '搜索', '游戏引擎', '风控'])}"
+        fields = enrich(req, duty)
+        rows.append((("tencent", "meituan", "mihoyo", "bytedance")[i % 4], {
+            "岗位名称": title, "岗位类别": rng.choice(FAMILIES), "性质": rng.choice(NATURES),
+            "学历要求": fields["学历要求"], "工作城市": " ".join(rng.sample(CITIES, rng.randint(1, 2))),
+            "任职要求": req, "工作职责": duty}))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--postings", type=int, default=30000)
+    parser.add_argument("--repeat", type=int, default=50, help="每个查询重复次数")
+    args = parser.parse_args()
+
+    recorded = load_recorded()
+    if recorded:
+        print(f"{len(recorded)} recorded postings, repeated to {args.postings}")
+        rows = replicate(recorded, args.postings)
+    else:
+        print("No scraper outputs found; using synthetic postings")
+        rows = make_synthetic(args.postings)
+
+    start = time.perf_counter()
+    index = JobIndex()
+    for site, row in rows:
+        index.add(row, site)
+    build = time.perf_counter() - start
+    print(f"Indexed {len(index)} postings, {len(index.postings)} bigrams in {build:.2f}s")
+
+    print(f"\n{'query':<26} {'matches':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for text in QUERIES:
+        query, filters = parse_query(text)
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = index.search(query, limit=20, filters=filters)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        p99 = times[min(len(times) - 1, int(round(0.99 * (len(times) - 1))))]
+        print(f"{text:<26} {result['total']:>8} {times[len(times) // 2] * 1000:>8.2f} {p99 * 1000:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compares peak memory of keeping raw API payloads with compact JobRecords.
+
+Usage: python benchmarks/bench_job_records.py [--jobs 12000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from job_record import JobRecord
+from main import record_fields
+
+def make_payloads(n):
+    """Yields (list item, detail) pairs shaped like the miHoYo API responses."""
+    for i in range(n):
+        job = {
+            "id": str(i),
+            "title": f"游戏客户端开发工程师-{i}",
+            "competencyType": "技术",
+            "projectName": "2026秋招",
+            "addressDetail": [{"addressDetail": "上海市徐汇区", "code": "310104", "name": "上海"}] * 3,
+            "jobNature": "全职",
+            "department": {"id": i % 50, "name": "技术中心", "path": ["米哈游", "技术中心", "客户端组"]},
+            "tags": [{"id": t, "name": f"标签{t}"} for t in range(6)],
+            "publishTime": 1760000000000 + i,
+            "updateTime": 1760000000000 + i,
+        }
+        detail = {
+            "jobRequire": "1. 本科及以上学历，计算机相关专业；\n2. 熟悉 C++/C# 至少一门语言；\n3. 热爱游戏。" * 3,
+            "description": "1. 负责游戏客户端功能开发；\n2. 参与引擎工具链与性能优化。" * 3,
+            "addition": "有上线项目经验者优先",
+            "channelDetail": {"channel": "campus", "links": [f"https://example.com/{i}/{k}" for k in range(8)]},
+            "interviewProcess": [{"step": k, "name": f"第{k}轮面试"} for k in range(4)],
+            "welfare": ["六险一金", "弹性工作", "免费三餐", "年度体检"],
+        }
+        yield job, detail
+
+def keep_raw(payloads):
+    """The old approach: the list item is stored and updated with the whole detail payload."""
+    jobs = {}
+    for job, detail in payloads:
+        stored = dict(job)
+        stored.update(detail)
+        jobs[job["id"]] = stored
+    return jobs
+
+def keep_records(payloads):
+    jobs = {}
+    for job, detail in payloads:
+        record = JobRecord("mihoyo", job["id"], **record_fields(job))
+        record.update(**record_fields(detail))
+        jobs[job["id"]] = record
+    return jobs
+
+def measure(name, func, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    # 与抓取时一样，每个响应解析后要么整体保留，要么只抽取字段后丢弃
+    jobs = func(make_payloads(n))
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del jobs
+    print(f"{name:<8} {elapsed:8.2f}s  retained {current / 1024 / 1024:8.1f} MB  peak {peak / 1024 / 1024:8.1f} MB")
+    return current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=12000)
+    args = parser.parse_args()
+
+    print(f"Storing {args.jobs} postings")
+    old = measure("raw", keep_raw, args.jobs)
+    new = measure("records", keep_records, args.jobs)
+    print(f"Memory reduction: {old / new:.1f}x")
+
+if __name__ == "__main__":
+    main()
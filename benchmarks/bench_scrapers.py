@@ -0,0 +1,225 @@
+"""Offline end-to-end benchmark of the scrapers against local mock APIs.
+
+Starts benchmarks/mock_servers.py in-process, then runs each scraper in its
+own spawned process, one site at a time, with its output, job store and log
+in a temporary directory. For each site it reports jobs/sec, the p50/p99
+latency of every HTTP request the scraper made and the process's peak RSS.
+miHoYo runs in API mode. ByteDance needs a Playwright browser; its latency
+column is per list page.
+
+--json saves the results, and --baseline compares a run with saved results.
+The run exits with status 1 when jobs/sec drops, or peak RSS grows, by more
+than --tolerance.
+
+Usage: python benchmarks/bench_scrapers.py [--sites tencent meituan] [--jobs 300] [--latency 0.02]
+       [--error-rate 0.05] [--json results.json] [--baseline results.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import traceback
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+from mock_servers import MockRecruitingServer
+
+SITES = ["tencent", "meituan", "mihoyo", "bytedance"]
+# 本地模拟服务无需礼貌限速，放宽速率上限，测的是抓取本身的吞吐
+MAX_RATE = 50.0
+
+def run_tencent(base_url, workdir):
+    from job_store import JobStore
+    from rate_limit import RateLimiter
+    from tencent_crawler import TencentJobScraper
+    scraper = TencentJobScraper(base_url=base_url, store=JobStore(os.path.join(workdir, "jobs.db")),
+                                limiter=RateLimiter(max_rate=MAX_RATE))
+    scraper.scrape()
+    return len(scraper.jobs), []
+
+def run_meituan(base_url, workdir):
+    from job_store import JobStore
+    from meituan_crawler import MeituanJobScraper
+    from rate_limit import RateLimiter
+    scraper = MeituanJobScraper(base_url=base_url, store=JobStore(os.path.join(workdir, "jobs.db")),
+                                limiter=RateLimiter(max_rate=MAX_RATE))
+    scraper.scrape()
+    return len(scraper.jobs), []
+
+def run_mihoyo(base_url, workdir):
+    import main
+    from job_record import COLUMNS, to_rows
+    from job_store import JobStore
+    from sinks import JobOutput
+    output = JobOutput(os.path.join(workdir, "mihoyo_campus_jobs_full"), COLUMNS, main.COLUMN_WIDTHS, to_rows)
+    scraper = main.MihoyoJobScraper(store=JobStore(os.path.join(workdir, "jobs.db")), output=output)
+    main.scrape_with_api(scraper, api_base=base_url)
+    scraper.record_to_store()
+    main.save_jobs(scraper.jobs.values(), output)
+    return len(scraper.jobs), []
+
+def run_bytedance(base_url, workdir):
+    import asyncio
+    from urllib.parse import urlparse
+    from browser_pool import BrowserPool
+    from browser_profile import BrowserProfile
+    from bytedance_crawler import BytedanceJobScraper
+    from job_store import JobStore
+    profile = BrowserProfile(fast=True)
+    scraper = BytedanceJobScraper(profile=profile, store=JobStore(os.path.join(workdir, "jobs.db")))
+
+    async def forward(route):
+        # 官网页面和接口都转发到本地模拟服务，页面地址保持不变
+        response = await route.fetch(url=base_url + urlparse(route.request.url).path)
+        await route.fulfill(response=response)
+
+    async def crawl():
+        async with BrowserPool(profile) as pool:
+            await scraper.start_browser(pool)
+            await scraper.context.route("https://jobs.bytedance.com/**", forward)
+            try:
+                await scraper.scrape()
+            finally:
+                await scraper.close()
+
+    asyncio.run(crawl())
+    scraper.record_to_store()
+    scraper.save()
+    return len(scraper.jobs), scraper.page_latencies
+
+RUNNERS = {"tencent": run_tencent, "meituan": run_meituan, "mihoyo": run_mihoyo, "bytedance": run_bytedance}
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def run_site(site, base_url, workdir, result_queue):
+    """Child process entry: runs one scraper with every HTTP request timed."""
+    import resource
+    from requests.adapters import HTTPAdapter
+    os.chdir(workdir)
+    log = open(os.path.join(workdir, f"{site}.log"), "w", encoding="utf-8", buffering=1)
+    sys.stdout = sys.stderr = log
+
+    latencies = []
+    original_send = HTTPAdapter.send
+    def timed_send(adapter, request, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_send(adapter, request, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+    HTTPAdapter.send = timed_send
+
+    start = time.perf_counter()
+    try:
+        jobs, page_latencies = RUNNERS[site](base_url, workdir)
+        status, error = "ok", ""
+    except BaseException as e:
+        traceback.print_exc()
+        jobs, page_latencies = 0, []
+        status, error = "failed", f"{type(e).__name__}: {str(e).strip().splitlines()[0] if str(e).strip() else ''}"
+    elapsed = time.perf_counter() - start
+    samples = latencies or page_latencies
+    # Linux 上 ru_maxrss 的单位是 KB
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    log.flush()
+    result_queue.put({
+        "site": site, "status": status, "error": error, "jobs": jobs, "seconds": elapsed,
+        "jobs_per_sec": jobs / elapsed if elapsed > 0 else 0.0, "requests": len(samples),
+        "p50_ms": percentile(samples, 50) * 1000, "p99_ms": percentile(samples, 99) * 1000,
+        "peak_rss_mb": peak_rss,
+    })
+
+def run_benchmark(sites, server, workdir, timeout):
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for site in sites:
+        before = dict(server.errors)
+        queue = ctx.Queue()
+        proc = ctx.Process(target=run_site, args=(site, server.base_url, workdir, queue), name=f"bench-{site}")
+        print(f"Running {site}...")
+        proc.start()
+        try:
+            result = queue.get(timeout=timeout)
+        except Exception:
+            result = {"site": site, "status": "timeout", "error": f"exceeded {timeout}s", "jobs": 0, "seconds": timeout,
+                      "jobs_per_sec": 0.0, "requests": 0, "p50_ms": 0.0, "p99_ms": 0.0, "peak_rss_mb": 0.0}
+        proc.join(5)
+        if proc.is_alive():
+            proc.kill()
+        result["injected_errors"] = sum(server.errors.values()) - sum(before.values())
+        results[site] = result
+    return results
+
+def print_results(results):
+    print(f"\n{'site':<10} {'status':<8} {'jobs':>6} {'time':>8} {'jobs/s':>8} {'reqs':>6} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'errors':>6} {'RSS MB':>7}")
+    for site, r in results.items():
+        print(f"{site:<10} {r['status']:<8} {r['jobs']:>6} {r['seconds']:>7.1f}s {r['jobs_per_sec']:>8.1f} "
+              f"{r['requests']:>6} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['injected_errors']:>6} "
+              f"{r['peak_rss_mb']:>7.1f}")
+        if r["error"]:
+            print(f"{'':<10} {r['error']}")
+
+def compare(results, baseline, tolerance):
+    """Returns a list of regressions against a saved run."""
+    regressions = []
+    for site, r in results.items():
+        base = baseline.get("results", {}).get(site)
+        if not base or base.get("status") != "ok" or r["status"] != "ok":
+            continue
+        if r["jobs_per_sec"] < base["jobs_per_sec"] * (1 - tolerance):
+            regressions.append(f"{site}: jobs/sec {base['jobs_per_sec']:.1f} -> {r['jobs_per_sec']:.1f}")
+        if r["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{site}: peak RSS {base['peak_rss_mb']:.1f} MB -> {r['peak_rss_mb']:.1f} MB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", nargs="+", choices=SITES, default=SITES)
+    parser.add_argument("--jobs", type=int, default=300, help="每个站点的模拟岗位数")
+    parser.add_argument("--latency", type=float, default=0.02, help="每个响应的固定延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.01, help="额外随机延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="详情接口返回 500 的概率")
+    parser.add_argument("--list-errors", action="store_true", help="列表接口也注入错误")
+    parser.add_argument("--timeout", type=int, default=900, help="每个站点的超时（秒）")
+    parser.add_argument("--json", help="把结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与之前保存的 JSON 结果对比")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的相对退化幅度")
+    args = parser.parse_args()
+
+    server = MockRecruitingServer(jobs=args.jobs, latency=args.latency, jitter=args.jitter,
+                                  error_rate=args.error_rate, list_errors=args.list_errors).start()
+    print(f"Mock APIs on {server.base_url}: {args.jobs} jobs/site, latency {args.latency * 1000:.0f}"
+          f"+{args.jitter * 1000:.0f} ms, error rate {args.error_rate:.0%}")
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            results = run_benchmark(args.sites, server, workdir, args.timeout)
+    finally:
+        server.stop()
+    print_results(results)
+
+    if args.json:
+        config = {name: getattr(args, name) for name in ("jobs", "latency", "jitter", "error_rate", "list_errors")}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\nResults written to {args.json}")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions beyond tolerance:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
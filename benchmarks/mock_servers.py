@@ -0,0 +1,232 @@
+"""Local stand-ins for the recruiting APIs the scrapers call.
+
+One threaded HTTP server answers every endpoint, with payloads shaped like
+the recorded responses of each site:
+
+  Tencent   POST /api/v1/position/searchPosition, GET /api/v1/jobDetails/getJobDetailsByPostId
+  Meituan   POST /api/official/job/getJobList, POST /api/official/job/getJobDetail
+  miHoYo    POST /ats-portal/v1/job/list, GET /ats-portal/v1/job/info
+  ByteDance GET /campus/position (a minimal paginated page), POST /api/v1/search/job/posts
+
+Every response is delayed by latency (plus up to jitter) seconds. Detail
+endpoints fail with HTTP 500 at error_rate; list endpoints fail too when
+list_errors is set.
+
+Usage: python benchmarks/mock_servers.py [--port 8765] [--jobs 300] [--latency 0.02] [--error-rate 0.05]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FAMILIES = ["技术", "产品", "设计", "市场", "职能"]
+CITIES = ["北京", "上海", "深圳", "杭州", "成都"]
+
+def requirement_html(i):
+    level = ("本科", "硕士", "博士")[i % 3]
+    return (f"<p>任职要求：</p><ol><li>2026届{level}及以上学历，计算机、软件工程等相关专业；</li>"
+            "<li>熟悉 C++/Java/Go 至少一门语言，了解 Linux 与常用数据结构&amp;算法；</li>"
+            "<li>具备良好的沟通能力和团队合作精神。</li></ol>")
+
+def duty_html(i):
+    return (f"<p>工作职责：</p><ul><li>负责第 {i} 号业务后台服务的设计与开发；</li>"
+            "<li>参与系统性能优化与稳定性建设，保障服务&nbsp;高可用；</li>"
+            f"<li>工作地点：{CITIES[i % len(CITIES)]}。</li></ul>")
+
+BYTEDANCE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>mock campus</title></head>
+<body><div id="list"></div>
+<ul class="atsx-pagination"><li title="下一页" class=" atsx-pagination-next" aria-disabled="false">下一页</li></ul>
+<script>
+let offset = 0; const limit = 10;
+const next = document.querySelector(".atsx-pagination-next");
+async function load() {
+  const res = await fetch("/api/v1/search/job/posts", {method: "POST",
+    headers: {"Content-Type": "application/json"}, body: JSON.stringify({offset: offset, limit: limit})});
+  const data = (await res.json()).data || {};
+  document.getElementById("list").textContent = (data.job_post_list || []).map(j => j.title).join(",");
+  if (offset + limit >= (data.count || 0)) {
+    next.className = " atsx-pagination-next atsx-pagination-disabled";
+    next.setAttribute("aria-disabled", "true");
+  }
+}
+next.addEventListener("click", () => { if (next.getAttribute("aria-disabled") !== "true") { offset += limit; load(); } });
+load();
+</script></body></html>"""
+
+class MockRecruitingServer:
+    """Serves all mocked endpoints on one port; stats counts requests per endpoint."""
+
+    def __init__(self, port=0, jobs=300, latency=0.02, jitter=0.01, error_rate=0.0, list_errors=False, seed=1):
+        self.jobs = jobs
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.list_errors = list_errors
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.errors = Counter()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _delay_and_fail(self, endpoint, is_list):
+        """Sleeps for the configured latency; returns True if this request should fail."""
+        with self.lock:
+            self.stats[endpoint] += 1
+            delay = self.latency + self.random.random() * self.jitter
+            fail = (self.list_errors or not is_list) and self.random.random() < self.error_rate
+            if fail:
+                self.errors[endpoint] += 1
+        time.sleep(delay)
+        return fail
+
+    # --- Tencent ---
+    def tencent_list(self, body, query):
+        page, size = body.get("pageIndex", 1), body.get("pageSize", 10)
+        ids = range((page - 1) * size, min(page * size, self.jobs))
+        return {"status": 0, "data": {"count": self.jobs, "positionList": [{
+            "postId": f"tx{i}", "positionTitle": f"后台开发工程师-{i}", "positionFamily": 2 + i % 5,
+            "projectName": "2026届校园招聘", "workCities": CITIES[i % len(CITIES)], "bgs": "CSIG",
+        } for i in ids]}}
+
+    def tencent_detail(self, body, query):
+        i = int(query.get("postId", ["tx0"])[0][2:])
+        return {"status": 0, "data": {"postId": f"tx{i}", "title": f"后台开发工程师-{i}",
+                                      "request": requirement_html(i), "desc": duty_html(i)}}
+
+    # --- Meituan ---
+    def meituan_list(self, body, query):
+        page = body.get("page", {})
+        number, size = page.get("pageNo", 1), page.get("pageSize", 10)
+        # 应届生和实习生各占一半岗位，并有 10% 重叠，覆盖跨类别去重
+        code = (body.get("jobType") or [{}])[0].get("code", "1")
+        half = self.jobs // 2
+        overlap = self.jobs // 10
+        ids = list(range(0, half + overlap)) if code == "1" else list(range(half, self.jobs))
+        chunk = ids[(number - 1) * size:number * size]
+        return {"status": 1, "data": {"page": {"pageNo": number, "pageSize": size, "totalCount": len(ids)},
+                                      "list": [{
+            "jobUnionId": f"mt{i}", "name": f"算法工程师-{i}", "jobFamily": "技术类",
+            "cityList": [{"code": str(i % 5), "name": CITIES[i % len(CITIES)]}], "jobType": code,
+        } for i in chunk]}}
+
+    def meituan_detail(self, body, query):
+        i = int(str(body.get("jobUnionId", "mt0"))[2:])
+        return {"status": 1, "data": {"jobUnionId": f"mt{i}", "name": f"算法工程师-{i}",
+                                      "jobDuty": duty_html(i), "jobRequirement": requirement_html(i)}}
+
+    # --- miHoYo ---
+    def mihoyo_list(self, body, query):
+        number, size = body.get("pageNo", 1), body.get("pageSize", 10)
+        ids = range((number - 1) * size, min(number * size, self.jobs))
+        return {"code": 0, "data": {"total": self.jobs, "list": [{
+            "id": 10000 + i, "title": f"游戏客户端开发工程师-{i}", "competencyType": "技术",
+            "projectName": "2026秋招", "addressDetail": [{"addressDetail": CITIES[i % len(CITIES)]}],
+        } for i in ids]}}
+
+    def mihoyo_detail(self, body, query):
+        jid = int(query.get("id", ["10000"])[0])
+        i = jid - 10000
+        return {"code": 0, "data": {"id": jid, "title": f"游戏客户端开发工程师-{i}", "jobRequire": requirement_html(i),
+                                    "description": duty_html(i), "addition": "<p>有上线项目经验者优先</p>"}}
+
+    # --- ByteDance ---
+    def bytedance_posts(self, body, query):
+        offset, limit = body.get("offset", 0), body.get("limit", 10)
+        ids = range(offset, min(offset + limit, self.jobs))
+        return {"code": 0, "data": {"count": self.jobs, "job_post_list": [{
+            "id": f"bd{i}", "title": f"后端开发工程师-{i}", "job_category": {"name": "研发"},
+            "job_subject": {"name": {"zh_cn": "2026届校招"}},
+            "requirement": requirement_html(i), "description": duty_html(i),
+        } for i in ids]}}
+
+    def _handler(self):
+        server = self
+        routes = {
+            "/api/v1/position/searchPosition": ("tencent_list", True),
+            "/api/v1/jobDetails/getJobDetailsByPostId": ("tencent_detail", False),
+            "/api/official/job/getJobList": ("meituan_list", True),
+            "/api/official/job/getJobDetail": ("meituan_detail", False),
+            "/ats-portal/v1/job/list": ("mihoyo_list", True),
+            "/ats-portal/v1/job/info": ("mihoyo_detail", False),
+            "/api/v1/search/job/posts": ("bytedance_posts", True),
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def send(self, status, body, content_type="application/json; charset=utf-8"):
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def dispatch(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                except ValueError:
+                    body = {}
+                if url.path == "/campus/position":
+                    server._delay_and_fail("bytedance_page", True)
+                    return self.send(200, BYTEDANCE_PAGE, "text/html; charset=utf-8")
+                route = routes.get(url.path)
+                if route is None:
+                    return self.send(404, json.dumps({"code": 404}))
+                name, is_list = route
+                if server._delay_and_fail(name, is_list):
+                    return self.send(500, json.dumps({"code": 500, "message": "injected error"}))
+                payload = getattr(server, name)(body if isinstance(body, dict) else {}, parse_qs(url.query))
+                self.send(200, json.dumps(payload, ensure_ascii=False))
+
+            do_GET = dispatch
+            do_POST = dispatch
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jobs", type=int, default=300, help="每个站点的岗位数")
+    parser.add_argument("--latency", type=float, default=0.02, help="每个响应的固定延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.01, help="额外随机延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="详情接口返回 500 的概率")
+    parser.add_argument("--list-errors", action="store_true", help="列表接口也注入错误")
+    args = parser.parse_args()
+
+    server = MockRecruitingServer(port=args.port, jobs=args.jobs, latency=args.latency, jitter=args.jitter,
+                                  error_rate=args.error_rate, list_errors=args.list_errors).start()
+    print(f"Mock recruiting APIs listening on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import asyncio
+from playwright.async_api import async_playwright
+from browser_profile import BrowserProfile
+
+class BrowserPool:
+    """One Playwright browser shared by the browser-based scrapers, one context per site.
+
+    The browser is launched on the first new_context() call, so a site that
+    never needs it (miHoYo when its direct API works) costs nothing. Each
+    context is isolated: cookies, cache and route handlers of one site never
+    reach another, and each site's profile counts its own blocked requests.
+    All callers must run on the same asyncio event loop.
+    """
+
+    def __init__(self, profile=None):
+        self.profile = profile or BrowserProfile() # 启动浏览器（有头/无头、通道）用的配置
+        self.playwright = None
+        self.browser = None
+        self.contexts = []
+        self.lock = None
+
+    async def new_context(self, profile=None):
+        """Returns a fresh context set up by profile (default: the pool's own)."""
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            # 两个站点同时请求时只启动一次浏览器
+            if self.browser is None:
+                self.playwright = await async_playwright().start()
+                try:
+                    self.browser = await self.profile.launch(self.playwright)
+                except Exception:
+                    await self.playwright.stop()
+                    self.playwright = None
+                    raise
+        context = await (profile or self.profile).new_context(self.browser)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        for context in self.contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self.contexts = []
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
@@ -0,0 +1,118 @@
+import json
+import os
+import sys
+from urllib.parse import urlparse
+
+# 浏览器通道按此顺序尝试，None 表示 Playwright 自带的 Chromium
+CHANNELS = ["chrome", "msedge", None]
+
+# 快速模式下直接丢弃的资源类型，这些内容不影响接口拦截
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# 常见统计/埋点服务的第三方域名
+BLOCKED_HOST_KEYWORDS = [
+    "google-analytics", "googletagmanager", "doubleclick", "hm.baidu.com",
+    "cnzz.com", "growingio", "sensorsdata", "mcs.snssdk.com", "mon.snssdk.com",
+    "sentry", "bdstatic.com", "hotjar", "clarity.ms",
+]
+
+CHANNEL_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".browser_channel.json")
+
+def has_display():
+    """False on display-less servers, where the fast headless profile is the default."""
+    if sys.platform.startswith("linux"):
+        return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return True
+
+class BrowserProfile:
+    """Launch options shared by the Playwright scrapers.
+
+    fast=True runs headless and aborts non-essential resources and tracker
+    hosts; fast=False keeps the original headed, load-everything behaviour.
+    The default is fast on machines without a display. Methods take
+    Playwright async API objects.
+    """
+
+    def __init__(self, fast=None, allowed_hosts=None, cache_file=CHANNEL_CACHE_FILE):
+        self.fast = (not has_display()) if fast is None else fast
+        # 若指定，快速模式下只放行这些域名（及其子域名）的请求
+        self.allowed_hosts = allowed_hosts
+        self.cache_file = cache_file
+        self.blocked_count = 0
+
+    @property
+    def headless(self):
+        return self.fast
+
+    def load_cached_channel(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f).get("channel", "")
+        except (OSError, ValueError):
+            return ""
+
+    def save_cached_channel(self, channel):
+        try:
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump({"channel": channel}, f)
+        except OSError:
+            pass
+
+    async def launch(self, p):
+        """Launches chromium, trying the channel that worked last time first."""
+        channels = list(CHANNELS)
+        cached = self.load_cached_channel()
+        if cached != "":
+            cached = cached or None
+            if cached in channels:
+                channels.remove(cached)
+                channels.insert(0, cached)
+
+        last_error = None
+        for channel in channels:
+            name = channel or "bundled Chromium"
+            print(f"Launching {name} ({'headless' if self.headless else 'headed'})...")
+            try:
+                if channel:
+                    browser = await p.chromium.launch(channel=channel, headless=self.headless)
+                else:
+                    browser = await p.chromium.launch(headless=self.headless)
+            except Exception as e:
+                print(f"{name} not available.")
+                last_error = e
+                continue
+            if channel != cached:
+                self.save_cached_channel(channel)
+            return browser
+        raise last_error
+
+    async def new_context(self, browser):
+        context = await browser.new_context()
+        if self.fast:
+            await context.route("**/*", self.handle_route)
+        return context
+
+    def should_block(self, request):
+        if request.resource_type in BLOCKED_RESOURCE_TYPES:
+            return True
+        host = urlparse(request.url).hostname or ""
+        if any(keyword in host for keyword in BLOCKED_HOST_KEYWORDS):
+            return True
+        if self.allowed_hosts and request.resource_type != "document":
+            return not any(host == h or host.endswith("." + h) for h in self.allowed_hosts)
+        return False
+
+    async def handle_route(self, route):
+        if self.should_block(route.request):
+            self.blocked_count += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+def add_profile_arguments(parser):
+    """Adds --fast/--headed switches to an argparse parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--fast", dest="fast", action="store_true", default=None,
+                       help="无头模式并屏蔽图片/字体/样式及统计脚本（无显示器的服务器上默认开启）")
+    group.add_argument("--headed", dest="fast", action="store_false",
+                       help="有界面模式并加载全部资源（原有行为）")
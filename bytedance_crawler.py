@@ -1,231 +1,290 @@
+import asyncio
 import json
+import os
 import time
-import re
-import pandas as pd
-from playwright.sync_api import sync_playwright
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from browser_pool import BrowserPool
+from browser_profile import BrowserProfile, add_profile_arguments
+from job_store import DEFAULT_DB, JobStore, content_hash
+from checkpoint import CheckpointJournal
+from job_record import COLUMNS, JobRecord, to_rows
+from html_text import html_to_text_many
+from sinks import JobOutput, add_output_arguments
+from metrics import RunMetrics, add_metrics_arguments, browser_latency, endpoint_name, response_size
+from snapshot_diff import SnapshotDiff
+
+COLUMN_WIDTHS = [25, 15, 15, 20, 15, 12, 25, 60, 60, 30]
 
 class BytedanceJobScraper:
-    def __init__(self):
-        self.jobs = {} 
-        self.browser = None
-        self.context = None
+    def __init__(self, profile=None, store=None, journal=None, keep_raw=False, formats=None, metrics=None,
+                 snapshot=None):
+        self.jobs = {} # JobRecord keyed by ID
+        self.list_hashes = {} # 原始岗位数据的哈希，写入本地岗位库
+        self.keep_raw = keep_raw # 调试用：在记录中保留原始接口数据
+        self.context = None # 共享浏览器（BrowserPool）中本站点独立的 context
         self.page = None
+        self.profile = profile or BrowserProfile()
+        self.store = store
+        self.journal = journal # 断点续爬日志，浏览器崩溃后可恢复已抓取的岗位
+        if journal:
+            for jid, data in journal.restored_jobs():
+                self.jobs[jid] = JobRecord.from_dict(data)
         self.output_file = "bytedance_campus_jobs.xlsx"
+        self.output = JobOutput(os.path.splitext(self.output_file)[0], COLUMNS, COLUMN_WIDTHS, to_rows, formats,
+                                snapshot=snapshot)
+        self.response_timeout = 15000 # 每次翻页等待列表接口响应的上限（毫秒）
+        self.total_count = None
+        self.next_offset = 0
+        self.page_limit = 0
+        self.page_latencies = []
+        self.metrics = metrics or RunMetrics("bytedance") # 列表接口耗时、翻页重试等运行指标
 
-    def start_browser(self, p):
-        try:
-            print("Launching Chrome...")
-            self.browser = p.chromium.launch(channel="chrome", headless=False)
-        except Exception:
-            try:
-                print("Chrome not found. Launching Edge...")
-                self.browser = p.chromium.launch(channel="msedge", headless=False)
-            except Exception:
-                print("Edge not found. Launching bundled Chromium...")
-                self.browser = p.chromium.launch(headless=False)
-        
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
+    async def start_browser(self, pool):
+        self.context = await pool.new_context(self.profile)
+        self.page = await self.context.new_page()
 
-    def handle_response(self, response):
-        """Intercepts the job list API."""
-        if "search/job/posts" in response.url and response.request.method in ["POST", "GET"]:
+    async def handle_response(self, response):
+        """Intercepts the job list API and records the paging state it reports."""
+        if is_posts_response(response):
             try:
-                data = response.json()
+                data = await response.json()
+                self.metrics.observe(endpoint_name(response.url), browser_latency(response), response_size(response),
+                                     error=response.status >= 400)
                 if isinstance(data, dict):
-                     payload = data.get("data", {})
+                     payload = data.get("data", {}) or {}
                      job_list = payload.get("job_post_list", [])
+                     self.metrics.count("list_pages")
+                     if not job_list:
+                         self.metrics.count("empty_pages")
                      if job_list:
                          print(f"Captured {len(job_list)} jobs from API")
                          for job in job_list:
                              jid = str(job.get("id"))
+                             self.list_hashes.setdefault(jid, content_hash(job))
                              if jid not in self.jobs:
-                                 self.jobs[jid] = job
+                                 self.jobs[jid] = record = record_from_post(job, self.keep_raw)
+                                 self.output.add(record)
+                                 if self.journal:
+                                     self.journal.record_job(jid, record.to_dict())
+                     if payload.get("count") is not None:
+                         self.total_count = payload["count"]
+                     request_body = request_json(response)
+                     offset = request_body.get("offset", self.next_offset)
+                     self.page_limit = request_body.get("limit", self.page_limit) or len(job_list)
+                     self.next_offset = offset + len(job_list)
+                     return len(job_list)
             except Exception:
                 pass
+        return None
 
-    def simplify_job_data(self):
-        """Convert raw JSON jobs to simple list for DataFrame."""
-        simplified = []
-        for jid, job in self.jobs.items():
-            # 1. Title
-            title = job.get("title", "")
-            
-            # 2. Category
-            category = ""
-            if job.get("job_category"):
-                category = job["job_category"].get("name", "")
-            
-            # 3. Nature (Subject/Project)
-            nature = ""
-            subject = job.get("job_subject")
-            if subject and isinstance(subject.get("name"), dict):
-                nature = subject["name"].get("zh_cn", "")
-            elif job.get("recruit_type"):
-                nature = job["recruit_type"].get("name", "")
-            
-            # 4. Requirements & Description
-            req = clean_text(job.get("requirement", ""))
-            desc = clean_text(job.get("description", ""))
-            
-            # 5. Education
-            education = extract_education(req)
-            
-            # 6. Addition (Not present in explicit field, check text?)
-            # Leaving empty as per previous logic unless we parse text.
-            addition = ""
-
-            simplified.append({
-                "岗位名称": title,
-                "岗位类别": category,
-                "性质": nature,
-                "学历要求": education,
-                "任职要求": req,
-                "工作职责": desc,
-                "加分项": addition
-            })
-        return simplified
-
-    def scrape(self):
+    async def scrape(self):
         print("--- Scraping Bytedance Job List ---")
-        self.page.on("response", self.handle_response)
         
         url = "https://jobs.bytedance.com/campus/position"
-        self.page.goto(url)
-        self.page.wait_for_timeout(5000)
+        start = time.time()
+        async with self.page.expect_response(is_posts_response, timeout=self.response_timeout) as response_info:
+            await self.page.goto(url)
+        await self.handle_response(await response_info.value)
+        if self.journal:
+            self.journal.commit_page(1)
+        self.page_latencies.append(time.time() - start)
+        print(f"Page 1 loaded in {self.page_latencies[-1]:.2f}s (total reported: {self.total_count})")
 
         page_num = 1
-        last_job_count = 0
-        no_change_count = 0
-        
         while True:
-            print(f"Scanning page {page_num}...")
-            
-            current_job_count = len(self.jobs)
-            if current_job_count > last_job_count:
-                no_change_count = 0
-                last_job_count = current_job_count
-            else:
-                no_change_count += 1
-            
-            if no_change_count >= 5:
-                # If we haven't found new jobs for 5 checks/pages, maybe we are done
-                # But let's verify if we reached the end of pagination
-                print("No new jobs associated with recent actions. Stopping.")
+            # 以接口返回的 count/offset 判断是否到达列表末尾
+            if self.total_count is not None and self.next_offset >= self.total_count:
+                print(f"Reached end of list ({self.next_offset}/{self.total_count}).")
                 break
 
-            # Scroll to bottom first to trigger potential lazy loading
-            self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            self.page.wait_for_timeout(2000)
-            
-            # Pagination Logic
             try:
                 # Bytedance / AtsPagination specific selectors
                 # Based on debug: <li title="下一页" class=" atsx-pagination-next" aria-disabled="false">
-                next_btn = self.page.locator(".atsx-pagination-next, li[title='下一页']")
-                
-                if next_btn.count() > 0:
-                    btn = next_btn.first
-                    if btn.is_visible():
-                        # Check disabled state
-                        classes = btn.get_attribute("class") or ""
-                        disabled = btn.get_attribute("aria-disabled")
-                        
-                        if "atsx-pagination-disabled" in classes or disabled == "true":
-                            print("Next button disabled. Reached end.")
-                            break
-                        
-                        # Click the button (or the link inside it if clicking <li> doesn't work)
-                        # Usually clicking <li> works, but sometimes we need to click <a> inside
-                        # Safe bet: click the element itself first
-                        btn.click()
-                        page_num += 1
-                        
-                        # Wait for API response to be captured
-                        self.page.wait_for_timeout(3000) 
-                        continue
-                
-                print("No next page button found.")
-                break
+                btn = self.page.locator(".atsx-pagination-next, li[title='下一页']").first
+                classes = await btn.get_attribute("class", timeout=self.response_timeout) or ""
+                if "atsx-pagination-disabled" in classes or await btn.get_attribute("aria-disabled") == "true":
+                    print("Next button disabled. Reached end.")
+                    break
 
+                count = await self.click_and_wait(btn, page_num + 1)
             except Exception as e:
                 print(f"Pagination error: {e}")
                 break
+
+            if count is None:
+                print(f"No list response for page {page_num + 1}. Stopping.")
+                break
+            page_num += 1
+            if count == 0 or (self.total_count is None and count < self.page_limit):
+                print("Last page returned no further jobs. Reached end.")
+                break
+
+        if self.page_latencies:
+            avg = sum(self.page_latencies) / len(self.page_latencies)
+            print(f"Scanned {len(self.page_latencies)} pages, avg {avg:.2f}s/page, max {max(self.page_latencies):.2f}s")
+
+    async def click_and_wait(self, btn, page_num, attempts=2):
+        """Clicks next and waits for the search/job/posts response of the expected offset.
+
+        Retries click the page number inside the pager rather than the next
+        button, so a slow response to an earlier click cannot skip a page. A
+        response that arrives late is still accepted by the next attempt.
+        """
+        expected_offset = self.next_offset
+        def matches(response):
+            return is_posts_response(response) and request_json(response).get("offset", expected_offset) == expected_offset
+
+        arrived = asyncio.get_running_loop().create_future()
+        def collect(response):
+            if matches(response) and not arrived.done():
+                arrived.set_result(response)
+        self.page.on("response", collect)
+        try:
+            for attempt in range(1, attempts + 1):
+                target = btn
+                if attempt > 1:
+                    self.metrics.retry("job/posts")
+                    target = self.page.locator(f".atsx-pagination-item-{page_num}, li[title='{page_num}']").first
+                start = time.time()
+                try:
+                    # 上一次点击的响应已经到达时不再点击
+                    if not arrived.done():
+                        await target.click(timeout=self.response_timeout)
+                    response = await asyncio.wait_for(asyncio.shield(arrived), self.response_timeout / 1000)
+                except (asyncio.TimeoutError, PlaywrightTimeoutError):
+                    print(f"Page {page_num}: no response after {self.response_timeout / 1000:.0f}s (attempt {attempt}/{attempts})")
+                    continue
+                count = await self.handle_response(response)
+                if self.journal:
+                    self.journal.commit_page(page_num)
+                self.page_latencies.append(time.time() - start)
+                print(f"Page {page_num} loaded in {self.page_latencies[-1]:.2f}s ({len(self.jobs)} jobs so far)")
+                return count
+            return None
+        finally:
+            self.page.remove_listener("response", collect)
         
-    def save(self):
-        print(f"--- Saving {len(self.jobs)} jobs to {self.output_file} ---")
-        data = self.simplify_job_data()
-        df = pd.DataFrame(data, columns=["岗位名称", "岗位类别", "性质", "学历要求", "任职要求", "工作职责", "加分项"])
-        
-        df.to_excel(self.output_file, index=False, engine='openpyxl')
-        self.format_excel()
+    def record_to_store(self):
+        """Records seen postings; the list API already carries full text, so there is no detail to skip."""
+        if not self.store:
+            return
+        for jid, record in self.jobs.items():
+            self.store.upsert("bytedance", jid, self.list_hashes.get(jid) or content_hash(record.to_dict()))
+        self.store.report("bytedance")
+        self.store.close()
+
+    def save(self, complete=True):
+        print(f"--- Saving {len(self.jobs)} jobs ---")
+        self.metrics.set("jobs", len(self.jobs))
+        with self.metrics.phase("save"):
+            changes = self.output.save(self.jobs.values(), complete)
+        if changes:
+            self.metrics.update("changes", changes["counts"])
         print("Done.")
 
-    def format_excel(self):
-        try:
-            wb = load_workbook(self.output_file)
-            ws = wb.active
-            
-            header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-            header_font = Font(name='微软雅黑', size=11, bold=True, color="FFFFFF")
-            content_font = Font(name='微软雅黑', size=10)
-            center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            top_left_align = Alignment(horizontal='left', vertical='top', wrap_text=True)
-            thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), 
-                                 top=Side(style='thin'), bottom=Side(style='thin'))
-
-            ws.column_dimensions['A'].width = 25
-            ws.column_dimensions['B'].width = 15
-            ws.column_dimensions['C'].width = 20
-            ws.column_dimensions['D'].width = 15
-            ws.column_dimensions['E'].width = 60
-            ws.column_dimensions['F'].width = 60
-            ws.column_dimensions['G'].width = 30
-
-            for row in ws.iter_rows():
-                for cell in row:
-                    cell.border = thin_border
-                    if cell.row == 1:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = center_align
-                    else:
-                        cell.font = content_font
-                        cell.alignment = top_left_align
-            
-            wb.save(self.output_file)
-        except Exception as e:
-            print(f"Formatting failed: {e}")
-
-    def close(self):
-        if self.browser:
-            self.browser.close()
-
-def extract_education(text):
-    if not text: return ""
-    clean = text.replace('\n', ' ')
-    patterns = [r"博士", r"硕士", r"研究生", r"本科"]
-    intro = clean[:200]
-    for p in patterns:
-        if re.search(p, intro):
-            return f"{p}及以上"
-    return "不限/未提及"
-
-def clean_text(text):
-    if not text: return ""
-    return text.strip()
-
-def run_bd_crawler():
-    scraper = BytedanceJobScraper()
-    with sync_playwright() as p:
-        scraper.start_browser(p)
+    async def close(self):
+        if self.profile.blocked_count:
+            print(f"Blocked {self.profile.blocked_count} non-essential requests.")
+            self.metrics.set("blocked_requests", self.profile.blocked_count)
+        if self.context:
+            await self.context.close()
+            self.context = None
+
+def record_from_post(job, keep_raw=False):
+    """Builds a JobRecord from one entry of search/job/posts' job_post_list."""
+    # 1. Category
+    category = ""
+    if job.get("job_category"):
+        category = job["job_category"].get("name", "")
+
+    # 2. Nature (Subject/Project)
+    nature = ""
+    subject = job.get("job_subject")
+    if subject and isinstance(subject.get("name"), dict):
+        nature = subject["name"].get("zh_cn", "")
+    elif job.get("recruit_type"):
+        nature = job["recruit_type"].get("name", "")
+
+    requirement, description = html_to_text_many([job.get("requirement", ""), job.get("description", "")])
+    return JobRecord(
+        "bytedance", job.get("id"),
+        title=job.get("title", ""),
+        category=category,
+        nature=nature,
+        requirement=requirement,
+        description=description,
+        raw=job if keep_raw else None,
+    )
+
+def is_posts_response(response):
+    return "search/job/posts" in response.url and response.request.method in ["POST", "GET"]
+
+def request_json(response):
+    """Returns the JSON body of the request behind a response, or {}."""
+    try:
+        body = response.request.post_data_json
+        return body if isinstance(body, dict) else {}
+    except Exception:
+        return {}
+
+async def crawl_bytedance(fast=None, db=DEFAULT_DB, resume=False, keep_raw=False, formats=None, report=None,
+                          prometheus=None, pool=None):
+    """pool is a shared BrowserPool; without one the crawl launches and closes its own browser."""
+    journal = CheckpointJournal("bytedance", resume=resume)
+    store = JobStore(db)
+    metrics = RunMetrics("bytedance")
+    profile = BrowserProfile(fast=fast)
+    scraper = BytedanceJobScraper(profile=profile, store=store, journal=journal,
+                                  keep_raw=keep_raw, formats=formats, metrics=metrics,
+                                  snapshot=SnapshotDiff("bytedance"))
+    own_pool = pool is None
+    pool = pool or BrowserPool(profile)
+    finished = False
+    try:
+        await scraper.start_browser(pool)
         try:
-            scraper.scrape()
+            # 字节的列表接口已带全文，没有单独的详情阶段
+            with metrics.phase("list"):
+                await scraper.scrape()
+            finished = True
         finally:
-            scraper.close()
-            scraper.save()
+            await scraper.close()
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        metrics.status = "interrupted"
+        raise
+    except Exception:
+        metrics.status = "failed"
+        raise
+    finally:
+        # 浏览器崩溃时同样保存已抓取的数据，断点日志保留以便 --resume
+        scraper.record_to_store()
+        metrics.update("store", store.stats)
+        scraper.save(finished)
+        if finished:
+            journal.complete()
+        else:
+            journal.close()
+        metrics.write(report, prometheus)
+        if own_pool:
+            await pool.close()
+    return len(scraper.jobs)
+
+def run_bd_crawler(fast=None, db=DEFAULT_DB, resume=False, keep_raw=False, formats=None, report=None,
+                   prometheus=None):
+    """Synchronous entry point with its own browser; see crawl_bytedance."""
+    return asyncio.run(crawl_bytedance(fast=fast, db=db, resume=resume, keep_raw=keep_raw, formats=formats,
+                                       report=report, prometheus=prometheus))
 
 if __name__ == "__main__":
-    run_bd_crawler()
+    import argparse
+    parser = argparse.ArgumentParser(description="Bytedance campus jobs scraper")
+    parser.add_argument("--db", default=DEFAULT_DB, help="本地岗位库路径")
+    parser.add_argument("--resume", action="store_true", help="恢复上次中断前已抓取的岗位")
+    parser.add_argument("--keep-raw", action="store_true", help="调试用：保留每个岗位的原始接口数据")
+    add_profile_arguments(parser)
+    add_output_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    run_bd_crawler(fast=args.fast, db=args.db, resume=args.resume, keep_raw=args.keep_raw, formats=args.formats,
+                   report=args.report, prometheus=args.prometheus)
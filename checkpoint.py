@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".checkpoints")
+
+class CheckpointJournal:
+    """Append-only JSONL journal of crawl progress, used by --resume.
+
+    Two record types are written:
+      {"type": "job", "category": ..., "id": ..., "row": {...}}   a finished job
+      {"type": "page", "category": ..., "page": N}                 page N fully done
+    A job whose detail fetch failed is written with "pending": <list hash>;
+    --resume skips it on the list pages but hands it back through
+    pending_jobs() so it goes onto the retry queue again. A job recorded
+    again (e.g. after a retried detail fetch) replaces its earlier row.
+    Sites that restore list order on save also write "order": [page, index],
+    read back through restored_order().
+
+    Pages may be committed out of order when list pages are fetched
+    concurrently; last_page() is the end of the unbroken run from page 1.
+    Job records are flushed as they are written and page records are
+    fsynced, so a killed process loses at most the lines still in flight.
+    A torn last line is ignored when the journal is read back.
+    """
+
+    def __init__(self, site, resume=False, directory=CHECKPOINT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{site}.jsonl")
+        self.lock = threading.Lock()
+        self.rows = {} # category -> [(job_id, row), ...] in journal order
+        self.done_ids = set() # (category, job_id)
+        self.pending = {} # (category, job_id) -> 列表哈希，详情尚未抓到
+        self.orders = {} # (category, job_id) -> (页码, 页内序号)
+        self.pages = {} # category -> set of committed pages
+        if resume:
+            self._load()
+            if self.done_ids:
+                pages = {category: self.last_page(category) for category in self.pages}
+                print(f"Resuming from checkpoint: {len(self.done_ids)} jobs done "
+                      f"({len(self.pending)} still missing details), pages {pages}")
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self):
+        positions = {} # (category, job_id) -> 在 rows[category] 中的下标
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    category = record.get("category", "")
+                    if record.get("type") == "job":
+                        job_id = str(record["id"])
+                        if record.get("pending") is not None:
+                            self.pending[(category, job_id)] = record["pending"]
+                        else:
+                            self.pending.pop((category, job_id), None)
+                        # 重试补齐详情时不再写入位置，沿用首次记录的
+                        if record.get("order") is not None:
+                            self.orders[(category, job_id)] = tuple(record["order"])
+                        rows = self.rows.setdefault(category, [])
+                        if (category, job_id) in positions:
+                            rows[positions[(category, job_id)]] = (job_id, record["row"])
+                        else:
+                            self.done_ids.add((category, job_id))
+                            positions[(category, job_id)] = len(rows)
+                            rows.append((job_id, record["row"]))
+                    elif record.get("type") == "page":
+                        self.pages.setdefault(category, set()).add(record["page"])
+        except OSError:
+            pass
+
+    def _append(self, record, sync=False):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            if sync:
+                os.fsync(self.file.fileno())
+
+    def is_done(self, job_id, category=""):
+        return (category, str(job_id)) in self.done_ids
+
+    def pending_jobs(self, category=""):
+        """Returns {job_id: list hash} of restored jobs that still lack a detail."""
+        return {job_id: list_hash for (cat, job_id), list_hash in self.pending.items() if cat == category}
+
+    def restored_jobs(self, category=""):
+        """Returns the restored (job_id, row) pairs of a category, in journal order."""
+        return list(self.rows.get(category, []))
+
+    def restored_order(self, category=""):
+        """Returns {job_id: (page, index)} of restored jobs that recorded their list position."""
+        return {job_id: order for (cat, job_id), order in self.orders.items() if cat == category}
+
+    def restored_rows(self, category=""):
+        return [row for _, row in self.rows.get(category, [])]
+
+    def last_page(self, category=""):
+        pages = self.pages.get(category, ())
+        page = 0
+        while page + 1 in pages:
+            page += 1
+        return page
+
+    def record_job(self, job_id, row, category="", pending=None, order=None):
+        """Records a job; pass its list hash as pending when the detail fetch failed.
+
+        order is the job's (page, index) on the list, kept so --resume can
+        sort restored jobs back into list order.
+        """
+        record = {"type": "job", "category": category, "id": str(job_id), "row": row}
+        if order is not None:
+            record["order"] = list(order)
+        with self.lock:
+            self.done_ids.add((category, str(job_id)))
+            if pending is not None:
+                self.pending[(category, str(job_id))] = record["pending"] = pending
+            else:
+                self.pending.pop((category, str(job_id)), None)
+        self._append(record)
+
+    def commit_page(self, page, category=""):
+        with self.lock:
+            self.pages.setdefault(category, set()).add(page)
+        self._append({"type": "page", "category": category, "page": page}, sync=True)
+
+    def complete(self):
+        """Removes the journal once the crawl has finished and been saved."""
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
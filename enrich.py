@@ -0,0 +1,88 @@
+import re
+
+# 学历等级：数值越小门槛越低
+EDUCATION_LEVELS = {"大专": 0, "本科": 1, "硕士": 2, "研究生": 2, "博士": 3}
+
+CITIES = ["北京", "上海", "深圳", "广州", "杭州", "成都", "武汉", "南京", "西安", "苏州", "长沙", "重庆",
+          "天津", "厦门", "合肥", "珠海", "青岛", "济南", "郑州", "大连", "香港", "新加坡", "东京", "首尔"]
+
+SKILLS = ["C++", "C#", "JavaScript", "TypeScript", "Java", "Python", "Go", "Rust", "Kotlin", "Swift",
+          "Objective-C", "Lua", "SQL", "Linux", "Shell", "PyTorch", "TensorFlow", "CUDA", "Spark", "Hadoop",
+          "Kubernetes", "Docker", "React", "Vue", "Unity", "Unreal", "UE4", "UE5", "OpenGL", "Vulkan",
+          "Photoshop", "Maya", "Blender", "Figma", "Excel", "英语", "日语", "韩语"]
+
+def _build_terms():
+    """Maps every literal the matcher looks for to (field, value)."""
+    terms = {}
+    for level in EDUCATION_LEVELS:
+        terms[level] = ("education", level)
+        terms[level + "以上"] = terms[level + "及以上"] = ("education_min", level)
+    for city in CITIES:
+        terms[city] = ("city", city)
+    for skill in SKILLS:
+        # 常见大小写写法逐个列出；Go 只认原样写法，避免误中英文单词
+        variants = {skill} if skill == "Go" else {skill, skill.lower(), skill.upper(), skill.capitalize()}
+        for variant in variants:
+            terms[variant] = ("skill", skill)
+    terms["Golang"] = terms["golang"] = ("skill", "Go")
+    return terms
+
+TERMS = _build_terms()
+
+# 所有字段合并为一个预编译的正则，一次扫描同时找出学历、届别、城市和技能关键词。
+# 每个分支都以字面字符开头，re 可以据此跳过不可能匹配的位置；长的写法排在前面
+MATCHER = re.compile("|".join(re.escape(term) for term in sorted(TERMS, key=len, reverse=True))
+                     + r"|20\d{2}\s*(?:届|年?应届|年?毕业|年?[春秋]招|年?校招)")
+
+# 城市名后紧跟的院校名（北京大学、上海交通大学、北京电影学院）不是工作城市
+INSTITUTION = re.compile(r"[\u4e00-\u9fff]{0,4}?(?:大学|学院)")
+
+def _is_ascii_word(ch):
+    return ch.isascii() and (ch.isalnum() or ch in "+#")
+
+def enrich(*texts):
+    """Scans the given texts once and returns the enriched output columns.
+
+    Education is the lowest level stated with 及以上/以上 if any, otherwise the
+    lowest level mentioned anywhere in the text, since that is the entry bar.
+    Years, cities and skills keep their first-seen order without duplicates.
+    """
+    text = "\n".join(t for t in texts if t)
+    if not text:
+        return {"学历要求": "", "届别": "", "工作城市": "", "技能关键词": ""}
+    explicit = None
+    mentioned = None
+    years, cities, skills = {}, {}, {}
+    for match in MATCHER.finditer(text):
+        found = match.group()
+        kind, value = TERMS.get(found) or ("year", found[:4] + "届")
+        if kind == "education_min":
+            if explicit is None or EDUCATION_LEVELS[value] < EDUCATION_LEVELS[explicit]:
+                explicit = value
+        elif kind == "education":
+            if mentioned is None or EDUCATION_LEVELS[value] < EDUCATION_LEVELS[mentioned]:
+                mentioned = value
+        elif kind == "year":
+            years.setdefault(value, None)
+        elif kind == "city":
+            if not INSTITUTION.match(text, match.end()):
+                cities.setdefault(value, None)
+        else:
+            # 英文关键词需要是独立的词，例如 Go 不能是 Google 的一部分
+            start, end = match.span()
+            if value.isascii() and ((start > 0 and _is_ascii_word(text[start - 1]))
+                                    or (end < len(text) and _is_ascii_word(text[end]))):
+                continue
+            skills.setdefault(value, None)
+    education = explicit or mentioned
+    return {
+        "学历要求": f"{education}及以上" if education else "不限/未提及",
+        "届别": "/".join(years),
+        "工作城市": " ".join(cities),
+        "技能关键词": ", ".join(skills),
+    }
+
+def enrich_many(rows):
+    """Enriches a batch lazily; each row is a tuple of texts for one posting."""
+    for texts in rows:
+        yield enrich(*texts)
@@ -0,0 +1,50 @@
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+
+def _styles():
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                         top=Side(style='thin'), bottom=Side(style='thin'))
+    header = NamedStyle(name="job_header")
+    header.fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+    header.font = Font(name='微软雅黑', size=11, bold=True, color="FFFFFF")
+    header.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    header.border = thin_border
+
+    content = NamedStyle(name="job_content")
+    content.font = Font(name='微软雅黑', size=10)
+    content.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
+    content.border = thin_border
+    return header, content
+
+def write_styled_excel(rows, columns, widths, filename):
+    """Writes rows (dicts keyed by column name) to a styled .xlsx in a single pass.
+
+    Uses openpyxl's write-only mode, so rows are streamed to disk as they are
+    consumed and memory stays flat regardless of row count. Styles are two
+    named styles registered once and referenced by every cell. Returns the
+    number of data rows written.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    header_style, content_style = _styles()
+    wb.add_named_style(header_style)
+    wb.add_named_style(content_style)
+
+    # 列宽必须在写入第一行之前设置
+    for i, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+    def styled(value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    ws.append([styled(name, "job_header") for name in columns])
+    count = 0
+    for row in rows:
+        ws.append([styled(row.get(name, ""), "job_content") for name in columns])
+        count += 1
+    wb.save(filename)
+    return count
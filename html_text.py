@@ -0,0 +1,61 @@
+import html
+import re
+
+# 块级标签前后换行；其余标签直接去掉。列表标签（li/ol/ul）单独处理
+BLOCK_TAGS = ("p", "div", "br", "tr", "table", "section", "article", "header", "footer", "blockquote", "pre",
+              "h1", "h2", "h3", "h4", "h5", "h6", "dl", "dt", "dd")
+
+COMMENT = re.compile(r"<!--.*?-->", re.S)
+LIST_TAG = re.compile(r"<(/?)(li|ol|ul)\b[^>]*>", re.I)
+# 块级标签与其余标签都用固定字符串替换，不经过 Python 回调
+BLOCK_TAG = re.compile(r"</?(?:%s)\b[^>]*>" % "|".join(sorted(BLOCK_TAGS, key=len, reverse=True)), re.I)
+TAG = re.compile(r"</?[A-Za-z][A-Za-z0-9]*\b[^>]*>")
+
+def _replace_lists(text):
+    lists = [] # 嵌套列表栈：<ol> 存当前序号，<ul> 存 None
+
+    def replace(match):
+        closing, name = match.group(1), match.group(2).lower()
+        if name == "li":
+            if closing:
+                return "\n"
+            if lists and lists[-1] is not None:
+                lists[-1] += 1
+                return f"\n{lists[-1]}. "
+            return "\n- "
+        if closing:
+            if lists:
+                lists.pop()
+        else:
+            lists.append(0 if name == "ol" else None)
+        return "\n"
+
+    return LIST_TAG.sub(replace, text)
+
+def html_to_text(text):
+    """Converts one HTML fragment to plain text.
+
+    List items become "- " lines, or "1. " lines inside <ol>; block tags and
+    <br> become line breaks; entities are decoded; runs of spaces collapse to
+    one and blank lines are dropped. Plain text passes through with only
+    whitespace normalised.
+    """
+    if not text:
+        return ""
+    text = str(text)
+    if "<" in text:
+        text = COMMENT.sub("", text)
+        # 只有含列表标签的正文才需要按嵌套状态编号
+        if "<l" in text or "<L" in text or "<o" in text or "<O" in text or "<u" in text or "<U" in text:
+            text = _replace_lists(text)
+        text = TAG.sub("", BLOCK_TAG.sub("\n", text))
+    if "&" in text:
+        # 标签去掉之后再解码，&lt; 解出的尖括号不会被当成标签
+        text = html.unescape(text)
+    # 空白（含 &nbsp; 解出的不换行空格和全角空格）压成单个空格，去掉空行
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def html_to_text_many(texts):
+    """Converts each fragment with html_to_text; returns a list in the same order."""
+    return [html_to_text(text) for text in texts]
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache")
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response built from a cache entry."""
+
+    def __init__(self, status_code, text, url=""):
+        self.status_code = status_code
+        self.text = text
+        self.url = url
+
+    def json(self):
+        return json.loads(self.text)
+
+def has_data(res):
+    """Whether a JSON API response carries a non-empty "data" field; error bodies are not cached."""
+    try:
+        body = res.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and bool(body.get("data"))
+
+class HttpCache:
+    """Disk-backed response cache with a TTL, LRU eviction and conditional revalidation.
+
+    Entries younger than ttl are served without touching the network. Older
+    entries that carry an ETag or Last-Modified are revalidated with
+    If-None-Match / If-Modified-Since; a 304 refreshes the entry. Once the
+    directory grows past max_bytes the least recently used entries are removed.
+    Only 200 responses accepted by the request's cacheable check are stored.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, ttl=6 * 3600, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(os.path.getsize(path) for path in self._entry_paths())
+
+    def _entry_paths(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if name.endswith(".json")]
+
+    def _key(self, method, url, params=None, body=None):
+        raw = json.dumps([method.upper(), url, params, body], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, path, entry):
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self.lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.total_bytes += len(data) - old_size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # 按最近访问时间（mtime）从旧到新删除，直到回到上限的 90%
+        entries = sorted(self._entry_paths(), key=lambda p: os.path.getmtime(p))
+        target = self.max_bytes * 0.9
+        for path in entries:
+            if self.total_bytes <= target:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self.total_bytes -= size
+            except OSError:
+                pass
+
+    def request(self, session, method, url, params=None, json_body=None, cacheable=None, **kwargs):
+        """Performs a request through the cache. Returns (response, from_network).
+
+        cacheable(response) decides whether a 200 response may be stored; an
+        empty or error payload would otherwise be replayed to every retry
+        until the entry expires.
+        """
+        path = os.path.join(self.directory, self._key(method, url, params, json_body) + ".json")
+        entry = self._load(path)
+        now = time.time()
+        if entry and cacheable and not cacheable(CachedResponse(entry["status_code"], entry["text"], url)):
+            # 旧版本缓存下来的无效响应直接作废
+            entry = None
+
+        if entry and now - entry["stored_at"] < self.ttl:
+            os.utime(path, None)
+            with self.lock:
+                self.stats["hits"] += 1
+            return CachedResponse(entry["status_code"], entry["text"], url), False
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        res = session.request(method, url, params=params, json=json_body, headers=headers, **kwargs)
+
+        if res.status_code == 304 and entry:
+            entry["stored_at"] = now
+            self._store(path, entry)
+            with self.lock:
+                self.stats["revalidated"] += 1
+            return CachedResponse(entry["status_code"], entry["text"], url), True
+
+        with self.lock:
+            self.stats["misses"] += 1
+        if res.status_code == 200 and (cacheable is None or cacheable(res)):
+            self._store(path, {
+                "url": url,
+                "status_code": res.status_code,
+                "text": res.text,
+                "etag": res.headers.get("ETag"),
+                "last_modified": res.headers.get("Last-Modified"),
+                "stored_at": now,
+            })
+        return res, True
+
+    def report(self):
+        s = self.stats
+        total = s["hits"] + s["revalidated"] + s["misses"]
+        rate = (s["hits"] + s["revalidated"]) / total * 100 if total else 0.0
+        print(f"HTTP cache: {s['hits']} hits, {s['revalidated']} revalidated (304), "
+              f"{s['misses']} misses ({rate:.0f}% served from cache), {self.total_bytes / 1024:.0f} KB on disk")
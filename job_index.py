@@ -0,0 +1,259 @@
+"""In-memory search over the postings of every site's latest output.
+
+Postings are indexed by character bigrams of 岗位名称/任职要求/工作职责, so
+Chinese queries work without a word segmenter. A query term matches a posting
+only if the term really occurs in it: bigram postings narrow the candidates,
+then each candidate is checked with a substring test. Terms are ANDed and
+hits are ranked by weighted occurrence counts, with the title weighted
+highest. Filters on 岗位类别, 性质, 学历要求, 工作城市 and 站点 use facet sets; a
+filter accepts a posting when one of its values contains the filter text, so
+degree:硕士 matches 硕士及以上 and city:北京 matches 北京市.
+
+Usage: python job_index.py 后端 Go --city 北京 --degree 本科
+       python job_index.py "算法 city:上海 nature:实习" --limit 5
+       python job_index.py -i        # load once, then query interactively
+"""
+import argparse
+import heapq
+import os
+import time
+from array import array
+from collections import Counter
+from sinks import find_output, read_rows
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 站点 -> 输出文件（不含扩展名），与各爬虫的输出路径一致
+SITE_OUTPUTS = {
+    "mihoyo": "mihoyo_campus_jobs_full",
+    "bytedance": "bytedance_campus_jobs",
+    "tencent": "tencent_campus_jobs",
+    "meituan": "meituan_campus_jobs",
+}
+
+SEARCH_FIELDS = ("岗位名称", "任职要求", "工作职责")
+TITLE_WEIGHT = 5 # 标题命中的权重，正文（任职要求 + 工作职责）为 1
+
+# 过滤参数名 -> 列名；工作城市按空格、性质按 "/" 拆成多个取值
+FACETS = {"category": "岗位类别", "nature": "性质", "degree": "学历要求", "city": "工作城市", "site": "站点"}
+FACET_ALIASES = dict({column: name for name, column in FACETS.items()}, 类别="category", 学历="degree", 城市="city")
+
+def normalize(text):
+    return " ".join(str(text or "").lower().split())
+
+def bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)} if len(text) > 1 else {text}
+
+def facet_values(column, value):
+    value = normalize(value)
+    if not value:
+        return []
+    if column == "工作城市":
+        return value.split(" ")
+    if column == "性质":
+        return [part.strip() for part in value.split("/") if part.strip()]
+    return [value]
+
+class JobIndex:
+    """Bigram inverted index plus facet sets over posting rows."""
+
+    def __init__(self):
+        self.docs = [] # 原始行（含 "站点"）
+        self.titles = [] # 规整后的岗位名称（小写、单空格）
+        self.bodies = [] # 规整后的任职要求 + 工作职责
+        self.postings = {} # bigram -> array('I') 升序岗位编号
+        self.facets = {column: {} for column in FACETS.values()} # 列名 -> 取值 -> 岗位编号集合
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, row, site=""):
+        doc_id = len(self.docs)
+        row = dict(row, 站点=row.get("站点") or site)
+        title = normalize(row.get(SEARCH_FIELDS[0]))
+        body = "\n".join(normalize(row.get(field)) for field in SEARCH_FIELDS[1:])
+        self.docs.append(row)
+        self.titles.append(title)
+        self.bodies.append(body)
+        # 末尾补空格，单字查询也能通过以该字开头的 bigram 找到
+        grams = bigrams(title + " ") | bigrams(body + " ")
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if ids is None:
+                ids = self.postings[gram] = array("I")
+            ids.append(doc_id)
+        for column, values in self.facets.items():
+            for value in facet_values(column, row.get(column)):
+                values.setdefault(value, set()).add(doc_id)
+        return doc_id
+
+    def _candidates(self, term):
+        if len(term) == 1:
+            ids = set()
+            for gram, postings in self.postings.items():
+                if gram[0] == term:
+                    ids.update(postings)
+            return ids
+        lists = sorted((self.postings.get(gram, ()) for gram in bigrams(term)), key=len)
+        ids = set(lists[0])
+        for postings in lists[1:]:
+            if not ids:
+                break
+            ids.intersection_update(postings)
+        return ids
+
+    def _facet_ids(self, column, wanted):
+        wanted = [normalize(value) for value in wanted]
+        ids = set()
+        for value, doc_ids in self.facets[column].items():
+            if any(w in value for w in wanted):
+                ids |= doc_ids
+        return ids
+
+    def search(self, query="", limit=20, filters=None):
+        """Returns {"total", "hits": [(score, row)], "facets": {column: Counter}} for a query.
+
+        filters maps a facet name (category, nature, degree, city, site) to a
+        list of accepted texts; a posting must match one of them for every facet.
+        """
+        terms = [normalize(term) for term in query.split() if term.strip()]
+        candidates = None
+        for term in sorted(terms, key=len, reverse=True):
+            ids = self._candidates(term)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                break
+        if candidates is None:
+            candidates = set(range(len(self.docs)))
+        for name, wanted in (filters or {}).items():
+            if wanted:
+                candidates &= self._facet_ids(FACETS[name], wanted)
+
+        titles, bodies = self.titles, self.bodies
+        scored = []
+        for doc_id in candidates:
+            title, body = titles[doc_id], bodies[doc_id]
+            score = 0
+            for term in terms:
+                # bigram 全部命中不代表连续出现，这里做最终校验并计分
+                hits = TITLE_WEIGHT * title.count(term) + body.count(term)
+                if not hits:
+                    break
+                score += hits
+            else:
+                scored.append((score, -doc_id))
+        top = heapq.nlargest(limit, scored)
+
+        # 各取值的命中数用集合交集在 C 层计算，不逐行统计
+        matched = {-neg_id for _, neg_id in scored} if len(scored) < len(self.docs) else None
+        facets = {}
+        for column, values in self.facets.items():
+            counts = Counter()
+            for value, doc_ids in values.items():
+                count = len(doc_ids) if matched is None else len(matched.intersection(doc_ids))
+                if count:
+                    counts[value] = count
+            facets[column] = counts
+        return {"total": len(scored), "hits": [(score, self.docs[-neg_id]) for score, neg_id in top],
+                "facets": facets}
+
+def parse_query(text):
+    """Splits "算法 city:上海 degree:硕士" into ("算法", {"city": ["上海"], "degree": ["硕士"]})."""
+    terms, filters = [], {}
+    for token in text.split():
+        key, sep, value = token.partition(":")
+        name = key if key in FACETS else FACET_ALIASES.get(key)
+        if sep and name and value:
+            filters.setdefault(name, []).append(value)
+        else:
+            terms.append(token)
+    return " ".join(terms), filters
+
+def load_index(paths=None, sites=None):
+    """Builds an index from the given output files, or from the newest output of each site."""
+    index = JobIndex()
+    if paths:
+        sources = [(os.path.basename(path).split("_")[0], path) for path in paths]
+    else:
+        sources = []
+        for site in sites or SITE_OUTPUTS:
+            path = find_output(os.path.join(SCRIPT_DIR, SITE_OUTPUTS[site]))
+            if path:
+                sources.append((site, path))
+            else:
+                print(f"No output found for {site}; skipping.")
+    for site, path in sources:
+        before = len(index)
+        for row in read_rows(path):
+            index.add(row, site)
+        print(f"Loaded {len(index) - before} postings from {os.path.relpath(path)}")
+    return index
+
+def snippet(row, term, width=30):
+    """A short excerpt of 任职要求/工作职责 around the first occurrence of term."""
+    for field in SEARCH_FIELDS[1:]:
+        text = " ".join(str(row.get(field) or "").split())
+        pos = text.lower().find(term) if term else -1
+        if pos >= 0:
+            start = max(pos - width, 0)
+            return ("…" if start else "") + text[start:pos + len(term) + width] + "…"
+    return ""
+
+def print_result(result, query, elapsed):
+    print(f"{result['total']} matches in {elapsed * 1000:.1f} ms")
+    first_term = normalize(query.split()[0]) if query.split() else ""
+    for score, row in result["hits"]:
+        city = row.get("工作城市") or "-"
+        print(f"  [{row['站点']}] {row.get('岗位名称')} | {row.get('岗位类别') or '-'} | {row.get('性质') or '-'} | "
+              f"{row.get('学历要求') or '-'} | {city}  (score {score})")
+        text = snippet(row, first_term)
+        if text:
+            print(f"      {text}")
+    if result["total"] > len(result["hits"]):
+        print(f"  ... {result['total'] - len(result['hits'])} more")
+    for column, counts in result["facets"].items():
+        if counts:
+            top = ", ".join(f"{value} {count}" for value, count in counts.most_common(6))
+            print(f"  {column}: {top}")
+
+def run_query(index, text, limit, base_filters):
+    query, filters = parse_query(text)
+    for name, values in base_filters.items():
+        if values:
+            filters.setdefault(name, []).extend(values)
+    start = time.perf_counter()
+    result = index.search(query, limit=limit, filters=filters)
+    print_result(result, query, time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="*", help="检索词（空格分隔，全部命中），可夹带 city:北京 等过滤条件")
+    parser.add_argument("--files", nargs="+", help="要索引的输出文件（默认各站点最新的输出）")
+    parser.add_argument("--sites", nargs="+", choices=list(SITE_OUTPUTS), help="只索引这些站点")
+    parser.add_argument("--category", nargs="+", help="岗位类别")
+    parser.add_argument("--nature", nargs="+", help="性质，如 实习生、2026届校园招聘")
+    parser.add_argument("--degree", nargs="+", help="学历要求，如 本科、硕士")
+    parser.add_argument("--city", nargs="+", help="工作城市")
+    parser.add_argument("--limit", type=int, default=20, help="显示的结果数")
+    parser.add_argument("-i", "--interactive", action="store_true", help="加载一次后交互查询")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = load_index(args.files, args.sites)
+    print(f"Indexed {len(index)} postings ({len(index.postings)} bigrams) in {time.perf_counter() - start:.2f}s")
+    filters = {name: getattr(args, name) for name in ("category", "nature", "degree", "city")}
+    if args.query or not args.interactive:
+        run_query(index, " ".join(args.query), args.limit, filters)
+    if args.interactive:
+        print("Enter a query (e.g. 后端 Go city:北京 degree:本科), empty line to quit.")
+        while True:
+            try:
+                text = input("> ").strip()
+            except (EOFError, KeyboardInterrupt):
+                break
+            if not text:
+                break
+            run_query(index, text, args.limit, filters)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from enrich import enrich
+
+class JobRecord:
+    """Compact, fixed-field record of one posting, shared by all scrapers.
+
+    Scrapers fill a record as soon as a list or detail response is captured
+    and drop the raw API payload, which is typically an order of magnitude
+    larger than the handful of fields that reach the output. Set keep_raw on
+    a scraper to keep the payload in ``raw`` for debugging.
+    """
+
+    __slots__ = ("site", "job_id", "title", "category", "nature", "city",
+                 "requirement", "description", "addition", "raw")
+
+    FIELDS = ("site", "job_id", "title", "category", "nature", "city",
+              "requirement", "description", "addition")
+
+    def __init__(self, site, job_id, title="", category="", nature="", city="",
+                 requirement="", description="", addition="", raw=None):
+        self.site = site
+        self.job_id = str(job_id) if job_id is not None else None
+        self.title = title
+        self.category = category
+        self.nature = nature
+        self.city = city
+        self.requirement = requirement
+        self.description = description
+        self.addition = addition
+        self.raw = raw
+
+    def update(self, **fields):
+        """Overwrites the given fields; None values are ignored."""
+        for name, value in fields.items():
+            if value is not None:
+                setattr(self, name, value)
+
+    def to_dict(self):
+        """Returns the record without its raw payload, for journals and stores."""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name, "") for name in cls.FIELDS})
+
+    def __repr__(self):
+        return f"JobRecord({self.site}:{self.job_id} {self.title!r})"
+
+# 四个站点共用的输出列，列宽由各站点自行设置
+COLUMNS = ["岗位名称", "岗位类别", "工作城市", "性质", "学历要求", "届别", "技能关键词", "任职要求", "工作职责", "加分项"]
+
+def to_rows(records):
+    """Maps JobRecords to output rows, lazily; the derived columns come from one enrich() pass."""
+    for record in records:
+        fields = enrich(record.nature, record.requirement, record.description)
+        yield {
+            "岗位名称": record.title,
+            "岗位类别": record.category,
+            "工作城市": record.city or fields["工作城市"],
+            "性质": record.nature,
+            "学历要求": fields["学历要求"],
+            "届别": fields["届别"],
+            "技能关键词": fields["技能关键词"],
+            "任职要求": record.requirement,
+            "工作职责": record.description,
+            "加分项": record.addition
+        }
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.db")
+
+def content_hash(data):
+    """Stable hash of a JSON-serialisable value."""
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class JobStore:
+    """SQLite store of postings keyed by (site, job_id), used for incremental crawls.
+
+    list_hash covers the list-level fields of a posting; when it is unchanged
+    and a detail payload is stored, incremental runs reuse that detail instead
+    of fetching it again.
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        # 多个站点进程可能同时写入同一个库，使用 WAL 并放宽锁等待时间
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                site TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                list_hash TEXT,
+                content_hash TEXT,
+                detail TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (site, job_id)
+            )
+        """)
+        self.conn.commit()
+        self.stats = {"new": 0, "changed": 0, "unchanged": 0}
+
+    def cached_detail(self, site, job_id, list_hash):
+        """Returns the stored detail if the posting's list fields are unchanged, else None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT list_hash, detail FROM jobs WHERE site = ? AND job_id = ?",
+                (site, str(job_id))).fetchone()
+        if row and row[0] == list_hash and row[1]:
+            return json.loads(row[1])
+        return None
+
+    def upsert(self, site, job_id, list_hash, detail=None):
+        """Records a posting seen in this run, keeping its first_seen timestamp."""
+        now = datetime.now().isoformat(timespec="seconds")
+        job_id = str(job_id)
+        new_hash = content_hash([list_hash, detail])
+        detail_json = json.dumps(detail, ensure_ascii=False) if detail else None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT content_hash FROM jobs WHERE site = ? AND job_id = ?",
+                (site, job_id)).fetchone()
+            if row is None:
+                self.stats["new"] += 1
+                self.conn.execute(
+                    "INSERT INTO jobs (site, job_id, list_hash, content_hash, detail, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (site, job_id, list_hash, new_hash, detail_json, now, now))
+            else:
+                self.stats["unchanged" if row[0] == new_hash else "changed"] += 1
+                self.conn.execute(
+                    "UPDATE jobs SET list_hash = ?, content_hash = ?, detail = COALESCE(?, detail), last_seen = ? "
+                    "WHERE site = ? AND job_id = ?",
+                    (list_hash, new_hash, detail_json, now, site, job_id))
+
+    def commit(self):
+        with self.lock:
+            self.conn.commit()
+
+    def report(self, site):
+        print(f"Job store ({site}): {self.stats['new']} new, {self.stats['changed']} changed, "
+              f"{self.stats['unchanged']} unchanged.")
+
+    def close(self):
+        self.commit()
+        self.conn.close()
@@ -1,247 +1,601 @@
+import asyncio
+import threading
 import time
-import re
-import pandas as pd
 import os
-from playwright.sync_api import sync_playwright
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from browser_pool import BrowserPool
+from browser_profile import BrowserProfile, add_profile_arguments
+from job_store import DEFAULT_DB, JobStore, content_hash
+from checkpoint import CheckpointJournal
+from job_record import COLUMNS, JobRecord, to_rows
+from html_text import html_to_text
+from sinks import JobOutput, add_output_arguments
+from metrics import RunMetrics, add_metrics_arguments, browser_latency, endpoint_name, response_size
+from snapshot_diff import SnapshotDiff
+
+API_BASE = "https://ats.openout.mihoyo.com"
+SITE_URL = "https://jobs.mihoyo.com"
+
+class ApiRejectedError(Exception):
+    """Raised when the ats-portal API refuses a direct (browserless) request."""
 
 class MihoyoJobScraper:
-    def __init__(self):
-        self.jobs = {} # Use dict keyed by ID to avoid duplicates
-        self.browser = None
-        self.context = None
+    def __init__(self, workers=4, detail_timeout=10, profile=None, store=None, incremental=False, journal=None,
+                 keep_raw=False, output=None, metrics=None):
+        self.jobs = {} # JobRecord keyed by ID to avoid duplicates
+        self.output = output # 可选的输出（JobOutput），详情补齐后逐条写入流式格式
+        self.metrics = metrics or RunMetrics("mihoyo") # 两种模式共用的运行指标
+        self.keep_raw = keep_raw # 调试用：在记录中保留原始接口数据
+        self.list_hashes = {} # 列表接口原始字段的哈希，用于增量判断
+        self.context = None # 共享浏览器（BrowserPool）中本站点独立的 context
         self.page = None
+        self.profile = profile or BrowserProfile()
+        self.store = store
+        self.incremental = incremental and store is not None
+        self.journal = journal # 断点续爬日志，记录已完成详情的岗位
+        if journal:
+            for jid, data in journal.restored_jobs():
+                self.jobs[jid] = JobRecord.from_dict(data)
+        self.workers = max(workers, 1) # 详情阶段并行的页面数
+        self.detail_timeout = detail_timeout # 单个详情页等待 job/info 的超时（秒）
+        self.page_timeout = 15000 # 列表翻页等待 job/list 响应的上限（毫秒）
+        self.list_total = 0
+        self.page_times = []
 
-    def start_browser(self, p):
-        # Try different browser channels
-        try:
-            print("Launching Chrome...")
-            self.browser = p.chromium.launch(channel="chrome", headless=False)
-        except Exception:
-            try:
-                print("Chrome not found. Launching Edge...")
-                self.browser = p.chromium.launch(channel="msedge", headless=False)
-            except Exception:
-                print("Edge not found. Launching bundled Chromium...")
-                self.browser = p.chromium.launch(headless=False)
-        
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
+    def add_list_jobs(self, job_list):
+        """Stores jobs from a job/list payload, keeping the first copy of each ID."""
+        for job in job_list:
+            jid = str(job.get("id"))
+            if jid not in self.list_hashes:
+                self.list_hashes[jid] = content_hash(job)
+            if jid not in self.jobs:
+                self.jobs[jid] = JobRecord("mihoyo", jid, raw=dict(job) if self.keep_raw else None,
+                                           **record_fields(job))
 
-    def handle_list_response(self, response):
-        """Intercepts the job list API."""
-        if "ats-portal/v1/job/list" in response.url and response.request.method == "POST":
+    def merge_detail(self, job_data):
+        """Merges a job/info payload into the matching list entry."""
+        jid = str(job_data.get("id"))
+        record = self.jobs.get(jid)
+        if record is None:
+            # Should not happen ideally if list was thorough, but just in case
+            record = self.jobs[jid] = JobRecord("mihoyo", jid)
+        # Update existing job with details
+        record.update(**record_fields(job_data))
+        if self.keep_raw:
+            record.raw = dict(record.raw or {}, **job_data)
+        if self.output and record.description:
+            self.output.add(record)
+        if self.journal and record.description and not self.journal.is_done(jid):
+            self.journal.record_job(jid, record.to_dict())
+        return jid
+
+    async def start_browser(self, pool):
+        self.context = await pool.new_context(self.profile)
+        self.page = await self.context.new_page()
+
+    def observe_response(self, response):
+        """Records a captured browser response in the run metrics."""
+        self.metrics.observe(endpoint_name(response.url), browser_latency(response), response_size(response),
+                             error=response.status >= 400)
+
+    async def handle_list_response(self, response):
+        """Intercepts the job list API. Returns the number of jobs in the page, or None."""
+        if is_list_response(response):
             try:
-                data = response.json()
+                data = await response.json()
+                self.observe_response(response)
                 if isinstance(data, dict):
-                     payload = data.get("data", {})
+                     payload = data.get("data", {}) or {}
                      job_list = payload.get("list", [])
                      if job_list:
                          print(f"Captured {len(job_list)} jobs from list API")
-                         for job in job_list:
-                             jid = str(job.get("id"))
-                             if jid not in self.jobs:
-                                 self.jobs[jid] = job
+                         self.add_list_jobs(job_list)
+                     if payload.get("total"):
+                         self.list_total = payload["total"]
+                     self.metrics.count("list_pages")
+                     if not job_list:
+                         self.metrics.count("empty_pages")
+                     return len(job_list)
             except Exception:
                 pass
+        return None
 
-    def handle_detail_response(self, response):
+    async def handle_detail_response(self, response):
         """Intercepts the job detail API."""
-        if "ats-portal/v1/job/info" in response.url:
+        if is_detail_response(response):
             try:
-                data = response.json()
+                data = await response.json()
+                self.observe_response(response)
                 if data.get("code") == 0 and "data" in data:
-                    job_data = data["data"]
-                    jid = str(job_data.get("id"))
-                    
-                    if jid in self.jobs:
-                        # Update existing job with details
-                        self.jobs[jid].update(job_data)
-                        print(f"Captured details for: {self.jobs[jid].get('title', jid)}")
-                    else:
-                        # Should not happen ideally if list was thorough, but just in case
-                        self.jobs[jid] = job_data
+                    jid = self.merge_detail(data["data"])
+                    print(f"Captured details for: {self.jobs[jid].title or jid}")
+                    return jid
             except Exception:
                 pass
+        return None
 
-    def scrape_list(self):
+    def reuse_stored_details(self):
+        """In incremental mode, fills in details of postings whose list fields are unchanged."""
+        if not self.incremental:
+            return
+        reused = 0
+        for jid, record in self.jobs.items():
+            cached = self.store.cached_detail("mihoyo", jid, self.list_hashes.get(jid))
+            if cached and cached.get("description"):
+                record.update(**{name: cached.get(name) for name in JobRecord.FIELDS})
+                reused += 1
+        print(f"Reusing {reused}/{len(self.jobs)} unchanged details from job store.")
+
+    def record_to_store(self):
+        if not self.store:
+            return
+        for jid, record in self.jobs.items():
+            self.store.upsert("mihoyo", jid, self.list_hashes.get(jid), record.to_dict() if record.description else None)
+        self.store.report("mihoyo")
+        self.store.close()
+
+    async def scrape_list(self):
         print("--- Phase 1: Scraping Job List ---")
-        self.page.on("response", self.handle_list_response)
         
-        url = "https://jobs.mihoyo.com/#/campus/position"
-        self.page.goto(url)
-        self.page.wait_for_timeout(3000)
+        url = f"{SITE_URL}/#/campus/position"
+        start = time.time()
+        async with self.page.expect_response(is_list_response, timeout=self.page_timeout) as response_info:
+            await self.page.goto(url)
+        await self.handle_list_response(await response_info.value)
+        self.page_times.append(time.time() - start)
+        print(f"List page 1 loaded in {self.page_times[-1]:.2f}s")
 
         page_num = 1
         while True:
-            print(f"Processing list page {page_num}...")
-            self.page.wait_for_timeout(2000) # Wait for page load
-            
-            # Scroll to trigger lazy loads
-            self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            
-            # Pagination Logic
+            if self.list_total and len(self.list_hashes) >= self.list_total:
+                print(f"Reached last page ({len(self.list_hashes)}/{self.list_total} jobs).")
+                break
+
             try:
-                # 1. Try "Next" button class
                 next_btn = self.page.locator("button.btn-next")
-                if next_btn.count() > 0 and next_btn.is_visible():
-                    if next_btn.is_disabled():
-                         print("Reached last page.")
-                         break
-                    next_btn.click()
-                    page_num += 1
-                    continue
-                
-                # 2. Try numeric pagination
-                next_page_num = str(page_num + 1)
-                next_link = self.page.get_by_text(next_page_num, exact=True)
-                if next_link.count() > 0 and next_link.first.is_visible():
-                     next_link.first.click()
-                     page_num += 1
-                     continue
-
-                print("No more pages found.")
-                break
+                if await next_btn.count() == 0 or not await next_btn.is_visible():
+                    print("No more pages found.")
+                    break
+                if await next_btn.is_disabled():
+                     print("Reached last page.")
+                     break
+                count = await self.goto_list_page(page_num + 1, next_btn)
             except Exception as e:
                 print(f"Pagination error: {e}")
                 break
-        
-        # Remove list listener to avoid noise
-        self.page.remove_listener("response", self.handle_list_response)
 
-    def scrape_details(self):
-        print(f"--- Phase 2: Scraping Details for {len(self.jobs)} Jobs ---")
-        self.page.on("response", self.handle_detail_response)
-        
-        job_ids = list(self.jobs.keys())
-        for i, jid in enumerate(job_ids):
-            job = self.jobs[jid]
-            # Skip if already has info (unlikely from list view)
-            if job.get("description"):
+            if count is None:
+                print(f"List page {page_num + 1} did not load. Stopping.")
+                break
+            page_num += 1
+            if count == 0:
+                print("Empty list page. Reached end.")
+                break
+
+        if self.page_times:
+            avg = sum(self.page_times) / len(self.page_times)
+            print(f"List phase: {len(self.page_times)} pages, avg {avg:.2f}s/page, total {sum(self.page_times):.1f}s")
+
+    async def goto_list_page(self, page_num, next_btn, attempts=3):
+        """Clicks to the given list page and returns once its job/list response is parsed.
+
+        Retries click the page number inside the pager rather than the next
+        button, so a slow response to an earlier click cannot skip a page.
+        """
+        def matches(response):
+            return is_list_response(response) and request_json(response).get("pageNo", page_num) == page_num
+
+        for attempt in range(1, attempts + 1):
+            target = next_btn
+            if attempt > 1:
+                self.metrics.retry("job/list")
+                target = self.page.locator(".el-pager").get_by_text(str(page_num), exact=True).first
+            start = time.time()
+            try:
+                async with self.page.expect_response(matches, timeout=self.page_timeout) as response_info:
+                    await target.click(timeout=self.page_timeout)
+                response = await response_info.value
+            except PlaywrightTimeoutError:
+                print(f"List page {page_num}: no response within {self.page_timeout / 1000:.0f}s (attempt {attempt}/{attempts})")
                 continue
+            count = await self.handle_list_response(response)
+            self.page_times.append(time.time() - start)
+            print(f"List page {page_num} loaded in {self.page_times[-1]:.2f}s")
+            return count
+        return None
+
+    async def scrape_details(self):
+        """Visits detail pages with a pool of pages that pull job IDs from a shared queue.
+
+        Each page is driven by its own coroutine: it navigates to a job and is
+        released as soon as the job/info response for that job arrives, or
+        after detail_timeout. Late responses for earlier jobs are still merged.
+        """
+        job_ids = deque(jid for jid, record in self.jobs.items() if not record.description)
+        total = len(job_ids)
+        print(f"--- Phase 2: Scraping Details for {total} Jobs with {self.workers} pages ---")
+        if not total:
+            return
+
+        workers = [DetailWorker(0, self.page)]
+        for i in range(1, min(self.workers, total)):
+            workers.append(DetailWorker(i, await self.context.new_page()))
+
+        waiting = {} # jid -> Future，收到该岗位的 job/info 响应时完成
+        async def collect(response):
+            if is_detail_response(response):
+                future = waiting.get(await self.handle_detail_response(response))
+                if future and not future.done():
+                    future.set_result(True)
+        self.context.on("response", collect)
+
+        done = 0
+        async def run(worker):
+            nonlocal done
+            loop = asyncio.get_running_loop()
+            while job_ids:
+                jid = job_ids.popleft()
+                waiting[jid] = future = loop.create_future()
+                worker.begin(jid)
+                ok = False
+                try:
+                    await worker.page.goto(f"{SITE_URL}/#/campus/position/{jid}", wait_until="commit")
+                    remaining = worker.deadline(self.detail_timeout) - time.time()
+                    await asyncio.wait_for(future, max(remaining, 0.001))
+                    ok = True
+                except asyncio.TimeoutError:
+                    print(f"[worker {worker.index}] Timed out waiting for job {jid}")
+                except Exception as e:
+                    print(f"[worker {worker.index}] Error visiting job {jid}: {e}")
+                finally:
+                    waiting.pop(jid, None)
+                worker.finish(ok=ok)
+                done += 1
+                if done % 10 == 0:
+                    print(f"Progress: {done}/{total}")
+
+        try:
+            await asyncio.gather(*(run(worker) for worker in workers))
+        finally:
+            self.context.remove_listener("response", collect)
+            for worker in workers[1:]:
+                await worker.page.close()
+            print_worker_stats(workers)
+
+    async def close(self):
+        if self.profile.blocked_count:
+            print(f"Blocked {self.profile.blocked_count} non-essential requests.")
+        if self.context:
+            await self.context.close()
+            self.context = None
+
+class DetailWorker:
+    """One page of the detail pool, with its own timing stats."""
+
+    def __init__(self, index, page):
+        self.index = index
+        self.page = page
+        self.jid = None
+        self.started = 0.0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.slowest = 0.0
+
+    def deadline(self, timeout):
+        return self.started + timeout
+
+    def begin(self, jid):
+        self.jid = jid
+        self.started = time.time()
+
+    def finish(self, ok):
+        elapsed = time.time() - self.started
+        self.busy_seconds += elapsed
+        self.slowest = max(self.slowest, elapsed)
+        if ok:
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.jid = None
+
+def is_list_response(response):
+    return "ats-portal/v1/job/list" in response.url and response.request.method == "POST"
+
+def is_detail_response(response):
+    return "ats-portal/v1/job/info" in response.url
 
-            url = f"https://jobs.mihoyo.com/#/campus/position/{jid}"
+def request_json(response):
+    """Returns the JSON body of the request behind a response, or {}."""
+    try:
+        body = response.request.post_data_json
+        return body if isinstance(body, dict) else {}
+    except Exception:
+        return {}
+
+def print_worker_stats(workers):
+    print("Detail worker stats:")
+    for w in workers:
+        handled = w.completed + w.failed
+        avg = w.busy_seconds / handled if handled else 0.0
+        print(f"  worker {w.index}: {w.completed} ok, {w.failed} failed, "
+              f"avg {avg:.2f}s/job, slowest {w.slowest:.2f}s, busy {w.busy_seconds:.1f}s")
+
+class MihoyoApiClient:
+    """Calls the ats-portal job/list and job/info endpoints directly, without a browser."""
+
+    def __init__(self, scraper, page_size=200, concurrency=8, api_base=API_BASE, reject_empty=False):
+        self.scraper = scraper
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.api_base = api_base.rstrip('/')
+        self.stop_event = threading.Event() # 在事件循环中被取消时通知工作线程尽快停下
+        # auto 模式下第一页为空视为被拒绝：请求参数是按前端推测的，接口可能接受却返回空列表
+        self.reject_empty = reject_empty
+        self.probe_attempts = 3 # 判定详情接口不可用前最多试探的岗位数
+        # 与官网前端发出的请求保持一致，若接口参数变化可在此调整
+        self.list_payload = {"channelDetailIds": [1], "hireType": 1}
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Content-Type': 'application/json',
+            'Origin': SITE_URL,
+            'Referer': f"{SITE_URL}/",
+        })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(concurrency, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        scraper.metrics.instrument(self.session)
+
+    def _check(self, res):
+        if res.status_code != 200:
+            raise ApiRejectedError(f"status code {res.status_code} from {res.url}")
+        try:
+            data = res.json()
+        except ValueError:
+            raise ApiRejectedError(f"non-JSON response from {res.url}")
+        if not isinstance(data, dict) or data.get("code") != 0:
+            raise ApiRejectedError(f"API returned code {data.get('code') if isinstance(data, dict) else data!r}")
+        return data.get("data") or {}
+
+    def scrape_list(self):
+        print("--- Phase 1: Fetching Job List via API ---")
+        url = f"{self.api_base}/ats-portal/v1/job/list"
+        page_num = 1
+        while not self.stop_event.is_set():
+            payload = dict(self.list_payload, pageNo=page_num, pageSize=self.page_size)
             try:
-                self.page.goto(url)
-                
-                # Wait for the data to populate
-                # We check if 'description' key exists in the shared dict
-                start_time = time.time()
-                while time.time() - start_time < 5:
-                    if self.jobs[jid].get("description"):
-                        break
-                    self.page.wait_for_timeout(200)
-                
-            except Exception as e:
-                print(f"Error visiting {url}: {e}")
+                res = self.session.post(url, json=payload, timeout=15)
+            except requests.RequestException as e:
+                raise ApiRejectedError(f"list request failed: {e}")
+            data = self._check(res)
+            job_list = data.get("list", [])
+            total = data.get("total", 0)
+            print(f"Fetched list page {page_num}: {len(job_list)} jobs")
+            if page_num == 1 and not job_list and self.reject_empty:
+                raise ApiRejectedError("first list page is empty")
+            self.scraper.metrics.count("list_pages")
+            if not job_list:
+                self.scraper.metrics.count("empty_pages")
+            self.scraper.add_list_jobs(job_list)
+            if len(job_list) < self.page_size or (total and len(self.scraper.list_hashes) >= total):
+                break
+            page_num += 1
+
+    def fetch_detail(self, jid):
+        url = f"{self.api_base}/ats-portal/v1/job/info"
+        params = {"id": jid, "channelDetailIds": self.list_payload["channelDetailIds"][0]}
+        res = self.session.get(url, params=params, timeout=15)
+        return self._check(res)
 
-            if (i + 1) % 10 == 0:
-                print(f"Progress: {i+1}/{len(job_ids)}")
+    def scrape_details(self):
+        job_ids = [jid for jid, record in self.scraper.jobs.items() if not record.description]
+        print(f"--- Phase 2: Fetching Details for {len(job_ids)} Jobs via API ---")
+        if not job_ids:
+            return
+        # 先同步请求详情，确认接口可用后再并发。偶发的超时或 5xx 不算被拒绝，
+        # 最多试探 probe_attempts 个岗位，全部失败才回退到浏览器模式
+        probe_ids = job_ids[:self.probe_attempts]
+        for attempt, jid in enumerate(probe_ids, 1):
+            try:
+                self.scraper.merge_detail(self.fetch_detail(jid))
+                break
+            except (ApiRejectedError, requests.RequestException) as e:
+                print(f"Detail probe {attempt}/{len(probe_ids)} failed for {jid}: {e}")
+                error = e
+        else:
+            raise ApiRejectedError(f"detail requests failed: {error}")
+        # 试探失败的岗位留给并发阶段再请求一次
+        remaining = [other for other in job_ids if other != jid]
+        done = 1
+        with ThreadPoolExecutor(max_workers=max(self.concurrency, 1)) as pool:
+            for jid, result in zip(remaining, pool.map(self._fetch_detail_safe, remaining)):
+                if self.stop_event.is_set():
+                    break
+                if result:
+                    self.scraper.merge_detail(result)
+                done += 1
+                if done % 50 == 0:
+                    print(f"Progress: {done}/{len(job_ids)}")
 
-        self.page.remove_listener("response", self.handle_detail_response)
+    def _fetch_detail_safe(self, jid):
+        if self.stop_event.is_set():
+            return {}
+        try:
+            return self.fetch_detail(jid)
+        except (ApiRejectedError, requests.RequestException) as e:
+            print(f"Failed to fetch detail for {jid}: {e}")
+            return {}
 
     def close(self):
-        if self.browser:
-            self.browser.close()
-
-def extract_education(text):
-    if not text: return ""
-    clean = text.replace('\n', ' ')
-    patterns = [r"博士", r"硕士", r"研究生", r"本科"]
-    intro = clean[:100] # Usually in first few lines
-    for p in patterns:
-        if re.search(p, intro):
-            return f"{p}及以上"
-    return "不限/未提及"
-
-def clean_text(text):
-    if not text: return ""
-    return text.strip()
-
-def save_to_excel(jobs_data, filename):
-    print(f"--- Phase 3: Saving to Excel {filename} ---")
-    
-    # Transform to DataFrame structure
-    rows = []
-    for job in jobs_data:
-        req = clean_text(job.get("jobRequire", ""))
-        rows.append({
-            "岗位名称": job.get("title", ""),
-            "岗位类别": job.get("competencyType", ""),
-            "性质": job.get("projectName", "") or job.get("jobNature", ""),
-            "学历要求": extract_education(req),
-            "任职要求": req,
-            "工作职责": clean_text(job.get("description", "")),
-            "加分项": clean_text(job.get("addition", ""))
-        })
-    
-    columns = ["岗位名称", "岗位类别", "性质", "学历要求", "任职要求", "工作职责", "加分项"]
-    df = pd.DataFrame(rows, columns=columns)
-    
-    # Save raw
-    df.to_excel(filename, index=False, engine='openpyxl')
-    
-    # Format
+        self.session.close()
+
+COLUMN_WIDTHS = [25, 15, 15, 15, 15, 12, 25, 60, 60, 30]
+
+def record_fields(job):
+    """Extracts the output fields present in a job/list or job/info payload."""
+    fields = {}
+    if "title" in job:
+        fields["title"] = job.get("title") or ""
+    if "competencyType" in job:
+        fields["category"] = job.get("competencyType") or ""
+    nature = job.get("projectName") or job.get("jobNature")
+    if nature:
+        fields["nature"] = nature
+    for name, key in (("requirement", "jobRequire"), ("description", "description"), ("addition", "addition")):
+        if key in job:
+            fields[name] = html_to_text(job.get(key))
+    return fields
+
+def save_jobs(jobs_data, output, complete=True):
+    print("--- Phase 3: Saving results ---")
     try:
-        wb = load_workbook(filename)
-        ws = wb.active
-        
-        # Styles
-        header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-        header_font = Font(name='微软雅黑', size=11, bold=True, color="FFFFFF")
-        content_font = Font(name='微软雅黑', size=10)
-        center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-        top_left_align = Alignment(horizontal='left', vertical='top', wrap_text=True)
-        thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), 
-                             top=Side(style='thin'), bottom=Side(style='thin'))
-
-        # Column Widths
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
-        ws.column_dimensions['E'].width = 60
-        ws.column_dimensions['F'].width = 60
-        ws.column_dimensions['G'].width = 30
-
-        for row in ws.iter_rows():
-            for cell in row:
-                cell.border = thin_border
-                if cell.row == 1:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = center_align
-                else:
-                    cell.font = content_font
-                    cell.alignment = top_left_align
-        
-        wb.save(filename)
-        print("Excel saved and formatted successfully.")
+        changes = output.save(jobs_data, complete)
+        print("Results saved successfully.")
+        return changes
     except Exception as e:
-        print(f"Formatting failed: {e}")
+        print(f"Saving failed: {e}")
+
+async def scrape_with_browser(scraper, pool):
+    await scraper.start_browser(pool)
+    try:
+        with scraper.metrics.phase("list"):
+            await scraper.scrape_list()
+        print(f"Total jobs found: {len(scraper.jobs)}")
+        if len(scraper.jobs) > 0:
+            scraper.reuse_stored_details()
+            with scraper.metrics.phase("detail"):
+                await scraper.scrape_details()
+    finally:
+        await scraper.close()
+
+def scrape_with_api(scraper, page_size=200, concurrency=8, api_base=API_BASE, client=None):
+    client = client or MihoyoApiClient(scraper, page_size=page_size, concurrency=concurrency, api_base=api_base)
+    try:
+        with scraper.metrics.phase("list"):
+            client.scrape_list()
+        print(f"Total jobs found: {len(scraper.jobs)}")
+        scraper.reuse_stored_details()
+        with scraper.metrics.phase("detail"):
+            client.scrape_details()
+    finally:
+        client.close()
 
-def run_crawler():
-    scraper = MihoyoJobScraper()
+async def scrape_with_api_async(scraper, page_size=200, concurrency=8, api_base=API_BASE, reject_empty=False):
+    """Runs the direct-API phases in a worker thread so other sites keep crawling on the event loop."""
+    client = MihoyoApiClient(scraper, page_size=page_size, concurrency=concurrency, api_base=api_base,
+                             reject_empty=reject_empty)
+    future = asyncio.get_running_loop().run_in_executor(
+        None, lambda: scrape_with_api(scraper, client=client))
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # 线程无法被强行取消：通知它停下，等它退出后再保存
+        client.stop_event.set()
+        await asyncio.wait([future])
+        raise
+
+async def crawl_mihoyo(mode="auto", page_size=200, concurrency=8, workers=4, fast=None, incremental=False,
+                       db=DEFAULT_DB, resume=False, keep_raw=False, formats=None, report=None, prometheus=None,
+                       pool=None):
+    """mode: "api" (browserless), "browser" (SPA interception) or "auto" (API, browser on rejection).
+
+    pool is a shared BrowserPool; without one the crawl launches and closes its own browser.
+    """
+    store = JobStore(db)
+    journal = CheckpointJournal("mihoyo", resume=resume)
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    output_file = os.path.join(script_dir, "mihoyo_campus_jobs_full.xlsx")
+    output = JobOutput(os.path.join(script_dir, "mihoyo_campus_jobs_full"), COLUMNS, COLUMN_WIDTHS, to_rows, formats,
+                       snapshot=SnapshotDiff("mihoyo"))
+    metrics = RunMetrics("mihoyo")
+    profile = BrowserProfile(fast=fast)
+    scraper = MihoyoJobScraper(workers=workers, profile=profile, store=store,
+                               incremental=incremental, journal=journal, keep_raw=keep_raw, output=output,
+                               metrics=metrics)
+    own_pool = pool is None
+    pool = pool or BrowserPool(profile)
     
-    with sync_playwright() as p:
-        scraper.start_browser(p)
-        try:
-            scraper.scrape_list()
-            print(f"Total jobs found: {len(scraper.jobs)}")
-            if len(scraper.jobs) > 0:
-                #scraper.scrape_details() # Uncomment to run full detail scrape
-                # For testing, we might want to just run it:
-                scraper.scrape_details()
-            
+    start = time.time()
+    finished = False
+    try:
+        if mode in ("api", "auto"):
+            try:
+                await scrape_with_api_async(scraper, page_size=page_size, concurrency=concurrency,
+                                            reject_empty=mode == "auto")
+            except ApiRejectedError as e:
+                if mode == "api":
+                    raise
+                # 已经拿到的列表和详情保留，浏览器模式只补齐缺失部分
+                print(f"Direct API rejected ({e}). Falling back to browser mode...")
+                await scrape_with_browser(scraper, pool)
+        else:
+            await scrape_with_browser(scraper, pool)
+        finished = True
+        print(f"Scraping finished in {time.time() - start:.1f}s")
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # 已抓取的数据在 finally 中保存，取消仍需向上传递给 gather/wait_for 等调用方
+        print("\nUser interrupted! Saving collected jobs so far...")
+        metrics.status = "interrupted"
+        raise
+    except Exception:
+        metrics.status = "failed"
+        raise
+    finally:
+        # 浏览器崩溃或中断时同样保存已抓取的数据，断点日志保留以便 --resume
+        scraper.record_to_store()
+        metrics.update("store", store.stats)
+        metrics.set("jobs", len(scraper.jobs))
+        if scraper.jobs:
             # Sort keys to ensure consistent order (optional)
-            sorted_jobs = [scraper.jobs[k] for k in sorted(scraper.jobs.keys())]
-            save_to_excel(sorted_jobs, output_file)
-            
-        finally:
-            scraper.close()
+            sorted_jobs = (scraper.jobs[k] for k in sorted(scraper.jobs.keys()))
+            with metrics.phase("save"):
+                changes = save_jobs(sorted_jobs, output, finished)
+            if changes:
+                metrics.update("changes", changes["counts"])
+        else:
+            output.close()
+        if finished:
+            journal.complete()
+        else:
+            journal.close()
+        metrics.write(report, prometheus)
+        if own_pool:
+            await pool.close()
+    return len(scraper.jobs)
+
+def run_crawler(mode="auto", page_size=200, concurrency=8, workers=4, fast=None, incremental=False, db=DEFAULT_DB,
+                resume=False, keep_raw=False, formats=None, report=None, prometheus=None):
+    """Synchronous entry point with its own browser; see crawl_mihoyo."""
+    return asyncio.run(crawl_mihoyo(mode=mode, page_size=page_size, concurrency=concurrency, workers=workers,
+                                    fast=fast, incremental=incremental, db=db, resume=resume, keep_raw=keep_raw,
+                                    formats=formats, report=report, prometheus=prometheus))
 
 if __name__ == "__main__":
-    run_crawler()
+    import argparse
+    parser = argparse.ArgumentParser(description="miHoYo campus jobs scraper")
+    parser.add_argument("--mode", choices=["auto", "api", "browser"], default="auto",
+                        help="auto: 直接调用接口，被拒绝时回退到浏览器; api: 仅接口; browser: 仅浏览器")
+    parser.add_argument("--page-size", type=int, default=200, help="接口模式下每页岗位数")
+    parser.add_argument("--concurrency", type=int, default=8, help="接口模式下同时进行的详情请求数")
+    parser.add_argument("--workers", type=int, default=4, help="浏览器模式下并行抓取详情的页面数")
+    parser.add_argument("--incremental", action="store_true", help="只抓取新增或列表字段变化的岗位详情")
+    parser.add_argument("--db", default=DEFAULT_DB, help="本地岗位库路径")
+    parser.add_argument("--resume", action="store_true", help="从上次中断处继续抓取（跳过已完成的详情）")
+    parser.add_argument("--keep-raw", action="store_true", help="调试用：保留每个岗位的原始接口数据")
+    add_profile_arguments(parser)
+    add_output_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        run_crawler(mode=args.mode, page_size=args.page_size, concurrency=args.concurrency,
+                    workers=args.workers, fast=args.fast, incremental=args.incremental, db=args.db,
+                    resume=args.resume, keep_raw=args.keep_raw, formats=args.formats,
+                    report=args.report, prometheus=args.prometheus)
+    except KeyboardInterrupt:
+        # 已抓取的岗位已经保存，--resume 可继续
+        pass
@@ -1,201 +1,432 @@
 import json
+import os
 
-import time
-import re
+import threading
 import requests
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from itertools import chain
+from requests.adapters import HTTPAdapter
+from job_store import DEFAULT_DB, JobStore, content_hash
+from http_cache import DEFAULT_CACHE_DIR, HttpCache, has_data
+from checkpoint import CheckpointJournal
+from job_record import COLUMNS, JobRecord, to_rows
+from html_text import html_to_text_many
+from sinks import JobOutput, add_output_arguments
+from metrics import RunMetrics, add_metrics_arguments
+from rate_limit import RateLimiter, add_rate_limit_arguments
+from retry_queue import RetryQueue
+from snapshot_diff import SnapshotDiff
+
+COLUMN_WIDTHS = [30, 15, 15, 15, 15, 12, 25, 50, 50, 20]
 
 class MeituanJobScraper:
-    def __init__(self):
-        self.jobs = []
+    def __init__(self, base_url='https://zhaopin.meituan.com', store=None, incremental=False, cache=None,
+                 journal=None, keep_raw=False, formats=None, metrics=None, limiter=None,
+                 snapshot=None, concurrency=8, list_workers=4):
+        self.jobs = [] # JobRecord 列表
         self.output_file = "meituan_campus_jobs.xlsx"
+        self.output = JobOutput(os.path.splitext(self.output_file)[0], COLUMNS, COLUMN_WIDTHS, to_rows, formats,
+                                snapshot=snapshot)
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency # 同时进行的详情请求数（各类别共享）
+        self.list_workers = list_workers # 同时请求的列表页数（各类别共享）
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Content-Type': 'application/json'
         }
-
-    def scrape(self):
-        print("--- Scraping Meituan Job List via Request API ---")
-        
-        page_index = 1
-        page_size = 50 # 每次请求50条岗位
-        total_fetched = 0
-        
-        job_types_to_scrape = [
+        self.job_types_to_scrape = [
             # 应届生 (jobType: 1, subCode: 1, 3, 7)
             {'name': '应届生', 'payload': {'jobType': [{'code': '1', 'subCode': ['1', '3', '7']}]}},
             # 实习生 (jobType: 2, subCode: 1, 3, 6)包含转正实习、北斗实习、日常实习
             {'name': '实习生', 'payload': {'jobType': [{'code': '2', 'subCode': ['1', '3', '6']}]}}
         ]
+        # 各类别线程共享同一个 keep-alive 连接池
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(concurrency, 1) + max(list_workers, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # 按接口统计请求数、耗时、字节数和错误，运行结束写出报告
+        self.metrics = metrics or RunMetrics("meituan")
+        self.metrics.instrument(self.session)
+        self.limiter = limiter or RateLimiter()
+        self.limiter.wrap(self.session)
+        # jobUnionId -> Future，保证同时出现在多个类别中的岗位只请求一次详情
+        self.detail_futures = {}
+        self.detail_lock = threading.Lock()
+        self.list_pool = ThreadPoolExecutor(max_workers=max(list_workers, 1))
+        self.detail_pool = ThreadPoolExecutor(max_workers=max(concurrency, 1))
+        self.stop_event = threading.Event()
+        # 可选的本地岗位库；incremental 模式下列表字段未变化的岗位直接复用已存详情
+        self.store = store
+        self.incremental = incremental and store is not None
+        self.cache = cache # 可选的详情接口 HTTP 缓存
+        self.journal = journal # 断点续爬日志
+        self.keep_raw = keep_raw # 调试用：在记录中保留原始接口数据
+        # 详情请求失败的岗位先放入重试队列，所有类别抓完后再退避重试，不阻塞翻页
+        self.retries = RetryQueue()
+
+    def scrape(self):
+        print("--- Scraping Meituan Job List via Request API ---")
+        
+        # 每个类别的行按抓取顺序收集，结束后再按类别顺序合并
+        rows_by_cat = {cat['name']: [] for cat in self.job_types_to_scrape}
+        if self.journal:
+            for name in rows_by_cat:
+                rows_by_cat[name] = [(job_id, JobRecord.from_dict(data))
+                                     for job_id, data in self.journal.restored_jobs(name)]
+                # 上次详情失败的岗位重新放回重试队列
+                pending = self.journal.pending_jobs(name)
+                for job_id, record in rows_by_cat[name]:
+                    if job_id in pending:
+                        self.retries.add(job_id, (record, pending[job_id], name))
+        pool = ThreadPoolExecutor(max_workers=len(self.job_types_to_scrape))
+        finished = False
 
         try:
-            for job_cat in job_types_to_scrape:
-                print(f"\n--- Scraping Category: {job_cat['name']} ---")
-                page_index = 1
-                cat_fetched = 0
-                
+            futures = [pool.submit(self.scrape_category, cat, rows_by_cat[cat['name']])
+                       for cat in self.job_types_to_scrape]
+            completed = []
+            for future in futures:
+                # 带超时的等待，让主线程可以及时响应 Ctrl+C
                 while True:
-                    print(f"Fetching page {page_index}...")
-                    url = 'https://zhaopin.meituan.com/api/official/job/getJobList'
-                    
-                    payload = {
-                        'page': {'pageNo': page_index, 'pageSize': page_size},
-                        'jobShareType': '1',
-                        'keywords': '',
-                        'cityList': [],
-                        'department': [],
-                        'jfJgList': [],
-                        'specialCode': []
-                    }
-                    payload.update(job_cat['payload'])
-                    
                     try:
-                        res = requests.post(url, json=payload, headers=self.headers, timeout=10)
-                    except Exception as e:
-                        print(f"Failed to fetch list API: {e}")
+                        completed.append(future.result(timeout=0.5))
                         break
-                        
-                    if res.status_code != 200:
-                        print(f"Error: status code {res.status_code}")
-                        break
-                        
-                    data = res.json().get('data', {})
-                    if not data:
-                        print("No data in response!")
-                        break
-                        
-                    position_list = data.get('list', [])
-                    total_count = data.get('page', {}).get('totalCount', 0)
-                    
-                    if not position_list:
-                        print("No more jobs found for this category.")
-                        break
-                        
-                    for pos in position_list:
-                        job_id = pos.get('jobUnionId')
-                        title = pos.get('name', "")
-                        category = pos.get('jobFamily', "")  # e.g., "技术类"
-                        
-                        # 城市列表解析
-                        city_list = pos.get('cityList', [])
-                        cities = " ".join([c.get('name', '') for c in city_list if c.get('name')])
-                        
-                        nature = job_cat['name']
-                        
-                        # 获取详细职责和要求
-                        print(f"  -> Fetching detail for: {title}")
-                        detail = self.get_job_detail(job_id)
-                        time.sleep(0.3) # 保护接口，防止被ban
-                        
-                        # 美团的数据中，jobDuty=工作职责，jobRequirement=任职要求
-                        desc = clean_text(detail.get('jobDuty', ''))
-                        req = clean_text(detail.get('jobRequirement', ''))
-                        
-                        # 提取学历
-                        education = extract_education(req + " " + desc)
-                        
-                        self.jobs.append({
-                            "岗位名称": title,
-                            "岗位类别": category,
-                            "工作城市": cities,
-                            "性质": nature,
-                            "学历要求": education,
-                            "任职要求": req,
-                            "工作职责": desc,
-                            "加分项": ""
-                        })
-                        cat_fetched += 1
-                        total_fetched += 1
-                        
-                    print(f"Fetched {cat_fetched}/{total_count} jobs in {job_cat['name']}.")
-                    
-                    if len(position_list) < page_size or cat_fetched >= total_count:
-                        break
-                        
-                    page_index += 1
+                    except FuturesTimeoutError:
+                        continue
+            self.retry_failed_details()
+            # 重试队列清空后才算完整，重试期间中断时保留断点日志和上次的快照
+            finished = all(completed)
                 
         except KeyboardInterrupt:
             print("\nUser interrupted! Saving collected jobs so far...")
+            self.metrics.status = "interrupted"
+            self.stop_event.set()
+        finally:
+            self.stop_event.set()
+            self.list_pool.shutdown(wait=False, cancel_futures=True)
+            self.detail_pool.shutdown(wait=False, cancel_futures=True)
+            # 各类别线程检查 stop_event 后很快退出；等它们排好序再合并，避免合并时 rows 仍在变化
+            pool.shutdown(wait=True)
+            self.metrics.set("missing_details", self.retries.report(lambda context: context[0].title))
+            self.jobs = self.merge_rows(rows_by_cat)
+            self.limiter.report(self.metrics)
+            if self.cache:
+                self.cache.report()
+                self.metrics.update("cache", self.cache.stats)
+            self.session.close()
+            if self.store:
+                self.store.report("meituan")
+                self.metrics.update("store", self.store.stats)
+                self.store.close()
+            self.save(finished)
+            if self.journal:
+                # 完整跑完才删除断点日志，中断时保留以便 --resume
+                if finished:
+                    self.journal.complete()
+                else:
+                    self.journal.close()
+
+    def scrape_category(self, job_cat, rows):
+        """Crawls one job type into rows. Returns True if the category was crawled to the end."""
+        print(f"\n--- Scraping Category: {job_cat['name']} ---")
+        page_index = 1
+        page_size = 50 # 每次请求50条岗位
+        cat_fetched = len(rows)
+        order = {} # jobUnionId -> (页码, 页内序号)，结束时恢复列表顺序
+        if self.journal:
+            page_index = self.journal.last_page(job_cat['name']) + 1
+            # 恢复的岗位按上次记录的列表位置排序
+            order.update(self.journal.restored_order(job_cat['name']))
+
+        position_list, total_count = self.load_list_page(job_cat, page_index, page_size)
+        if position_list is None:
+            return False
+        if not position_list:
+            print(f"No more jobs found for {job_cat['name']}.")
+            return True
+
+        # 第一页返回总数后，其余各页一次性并发请求；先到的页先抓详情，翻页不再排在详情之后
+        if len(position_list) >= page_size and total_count < (page_index - 1) * page_size + len(position_list):
+            # 总数缺失或小于已收到的岗位数时无法算出页数，逐页翻到不满一页为止
+            print(f"[{job_cat['name']}] Job count {total_count} is not usable; fetching pages one by one...")
+            rest = self.load_pages_until_short(job_cat, page_index + 1, page_size)
+        else:
+            last_page = max(page_index, -(-total_count // page_size))
+            futures = {self.list_pool.submit(self.load_list_page, job_cat, page, page_size): page
+                       for page in range(page_index + 1, last_page + 1)}
+            rest = ((futures[future], future.result()[0]) for future in as_completed(futures))
+        pages = chain([(page_index, position_list)], rest)
+        complete = True
+        try:
+            for page, position_list in pages:
+                if self.stop_event.is_set():
+                    return False
+                if position_list is None:
+                    # 失败的页不提交，--resume 时会重新请求
+                    complete = False
+                    continue
+                cat_fetched += self.process_page(job_cat, page, position_list, rows, order)
+                print(f"Fetched {cat_fetched}/{total_count} jobs in {job_cat['name']}.")
+                if self.store:
+                    self.store.commit()
+        finally:
+            rows.sort(key=lambda row: order.get(str(row[0]), (0, 0)))
+        return complete and not self.stop_event.is_set()
+
+    def load_list_page(self, job_cat, page_index, page_size=50):
+        """Returns (list, totalCount) for one page of a job type; list is None if the request failed."""
+        print(f"[{job_cat['name']}] Fetching page {page_index}...")
+        try:
+            with self.metrics.phase("list"):
+                res = self.fetch_list_page(job_cat, page_index, page_size)
+            if res.status_code != 200:
+                print(f"Error: status code {res.status_code} on {job_cat['name']} page {page_index}")
+                return None, 0
+            data = res.json().get('data', {})
+        except Exception as e:
+            print(f"Failed to fetch list API: {e}")
+            return None, 0
+        if not data:
+            print("No data in response!")
+            return None, 0
+        position_list = data.get('list', [])
+        self.metrics.count("list_pages")
+        if not position_list:
+            self.metrics.count("empty_pages")
+        return position_list, data.get('page', {}).get('totalCount', 0)
+
+    def load_pages_until_short(self, job_cat, page_index, page_size=50):
+        """Yields (page, list) one page at a time from page_index until a short or failed page."""
+        while not self.stop_event.is_set():
+            position_list, _ = self.load_list_page(job_cat, page_index, page_size)
+            yield page_index, position_list
+            if not position_list or len(position_list) < page_size:
+                return
+            page_index += 1
+
+    def process_page(self, job_cat, page_index, position_list, rows, order):
+        """Fetches details for one list page and appends its jobs to rows. Returns the number added."""
+        for i, pos in enumerate(position_list):
+            order[str(pos.get('jobUnionId'))] = (page_index, i)
+        if self.journal:
+            position_list = [pos for pos in position_list
+                             if not self.journal.is_done(pos.get('jobUnionId'), job_cat['name'])]
+        # 本页岗位的详情一起交给共享线程池（跨类别去重），再按列表顺序取回
+        list_hashes = [content_hash(pos) for pos in position_list]
+        futures = [self.detail_pool.submit(self.get_job_detail_once, pos.get('jobUnionId'), list_hash)
+                   for pos, list_hash in zip(position_list, list_hashes)]
+        added = 0
+        for pos, list_hash, future in zip(position_list, list_hashes, futures):
+            if self.stop_event.is_set():
+                return added
+            job_id = pos.get('jobUnionId')
+            title = pos.get('name', "")
+            category = pos.get('jobFamily', "")  # e.g., "技术类"
+            
+            # 城市列表解析
+            city_list = pos.get('cityList', [])
+            cities = " ".join([c.get('name', '') for c in city_list if c.get('name')])
+            
+            with self.metrics.phase("detail"):
+                detail, fetched = future.result()
+            if fetched:
+                print(f"  -> [{job_cat['name']}] Fetched detail for: {title}")
+            
+            # 美团的数据中，jobDuty=工作职责，jobRequirement=任职要求
+            req, desc = html_to_text_many([(detail or {}).get('jobRequirement', ''), (detail or {}).get('jobDuty', '')])
+            record = JobRecord("meituan", job_id, title=title, category=category, nature=job_cat['name'],
+                               city=cities, requirement=req, description=desc,
+                               raw={"list": pos, "detail": detail} if self.keep_raw else None)
+            rows.append((job_id, record))
+            if detail is None:
+                # 补齐详情后才写入流式输出
+                self.retries.add(job_id, (record, list_hash, job_cat['name']))
+            else:
+                self.output.add(record)
+            if self.journal:
+                # 详情失败的岗位记为待重试，--resume 时重新放回重试队列
+                self.journal.record_job(job_id, record.to_dict(), job_cat['name'],
+                                        pending=list_hash if detail is None else None, order=order[str(job_id)])
+            added += 1
+            
+        if self.journal:
+            self.journal.commit_page(page_index, job_cat['name'])
+        return added
+
+    def fetch_list_page(self, job_cat, page_index, page_size=50):
+        url = f'{self.base_url}/api/official/job/getJobList'
+        payload = {
+            'page': {'pageNo': page_index, 'pageSize': page_size},
+            'jobShareType': '1',
+            'keywords': '',
+            'cityList': [],
+            'department': [],
+            'jfJgList': [],
+            'specialCode': []
+        }
+        payload.update(job_cat['payload'])
+        return self.session.post(url, json=payload, timeout=10)
+
+    def probe(self):
+        """Fetches page 1 of each job type only; returns {type: {"count", "ids"}} for watch mode."""
+        state = {}
+        for job_cat in self.job_types_to_scrape:
+            res = self.fetch_list_page(job_cat, 1)
+            res.raise_for_status()
+            data = res.json().get('data') or {}
+            state[job_cat['name']] = {"count": data.get('page', {}).get('totalCount', 0),
+                                      "ids": [str(pos.get('jobUnionId')) for pos in data.get('list', [])]}
+        return state
+
+    def get_job_detail_once(self, job_id, list_hash=None):
+        """Returns (detail, from_network); concurrent callers for the same ID share one request.
+
+        detail is None if the fetch failed; the retry pass stores it later.
+        """
+        with self.detail_lock:
+            future = self.detail_futures.get(job_id)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.detail_futures[job_id] = future
+        if not owner:
+            return future.result(), False
+        detail = None
+        fetched = True
+        try:
+            cached = self.store.cached_detail("meituan", job_id, list_hash) if self.incremental else None
+            if cached is not None:
+                detail, fetched = cached, False
+            else:
+                detail, fetched = self.request_detail(job_id)
+            if self.store and detail is not None:
+                self.store.upsert("meituan", job_id, list_hash, detail)
         finally:
-            self.save()
+            future.set_result(detail)
+        return detail, fetched
+
+    def merge_rows(self, rows_by_cat):
+        """Merges records of postings that appear in several categories into one record."""
+        merged = []
+        index = {}
+        for job_cat in self.job_types_to_scrape:
+            for job_id, record in rows_by_cat[job_cat['name']]:
+                job_id = None if job_id is None else str(job_id)
+                if job_id is None or job_id not in index:
+                    if job_id is not None:
+                        index[job_id] = len(merged)
+                    merged.append(record)
+                    continue
+                existing = merged[index[job_id]]
+                if record.nature not in existing.nature.split("/"):
+                    existing.nature += "/" + record.nature
+        return merged
 
     def get_job_detail(self, job_id):
-        url = 'https://zhaopin.meituan.com/api/official/job/getJobDetail'
+        return self.request_detail(job_id)[0] or {}
+
+    def request_detail(self, job_id):
+        """Returns (detail, from_network); detail is None if the fetch failed. Cache hits skip the network."""
+        url = f'{self.base_url}/api/official/job/getJobDetail'
+        body = {'jobUnionId': job_id}
+        from_network = True
         try:
-            res = requests.post(url, json={'jobUnionId': job_id}, headers=self.headers, timeout=10)
+            if self.cache:
+                res, from_network = self.cache.request(self.session, 'POST', url, json_body=body, timeout=10,
+                                                       cacheable=has_data)
+            else:
+                res = self.session.post(url, json=body, timeout=10)
             if res.status_code == 200:
                 data = res.json().get('data')
-                return data if data else {}
+                if data:
+                    return data, from_network
         except Exception:
             pass
-        return {}
+        return None, from_network
+
+    def retry_failed_details(self):
+        """Retries details that failed during the main pass, with exponential backoff and jitter."""
+        if not self.retries:
+            return
+
+        def fetch(job_id):
+            self.metrics.retry("job/getJobDetail")
+            return self.request_detail(job_id)[0]
+
+        def fill(job_id, contexts, detail):
+            req, desc = html_to_text_many([detail.get('jobRequirement', ''), detail.get('jobDuty', '')])
+            # 同一岗位可能同时出现在应届生和实习生两个类别中
+            for record, _, category in contexts:
+                record.update(requirement=req, description=desc)
+                if self.keep_raw:
+                    # 从断点日志恢复的岗位没有原始列表数据，raw 为 None
+                    record.raw = dict(record.raw or {}, detail=detail)
+                self.output.add(record)
+                if self.journal:
+                    self.journal.record_job(job_id, record.to_dict(), category)
+            if self.store:
+                self.store.upsert("meituan", job_id, contexts[0][1], detail)
 
-    def save(self):
-        print(f"\n--- Saving {len(self.jobs)} jobs to {self.output_file} ---")
+        with self.metrics.phase("retry"):
+            missing = self.retries.drain(fetch, fill, workers=self.concurrency)
+        if self.store:
+            for job_id, contexts in missing.items():
+                self.store.upsert("meituan", job_id, contexts[0][1])
+            self.store.commit()
+
+    def save(self, complete=True):
+        print(f"\n--- Saving {len(self.jobs)} jobs ---")
+        self.metrics.set("jobs", len(self.jobs))
         if not self.jobs:
             print("No jobs to save.")
+            self.output.close()
             return
 
-        df = pd.DataFrame(self.jobs, columns=["岗位名称", "岗位类别", "工作城市", "性质", "学历要求", "任职要求", "工作职责", "加分项"])
-        df.to_excel(self.output_file, index=False, engine='openpyxl')
-        self.format_excel()
-        print(f"Successfully saved to {self.output_file}.")
+        with self.metrics.phase("save"):
+            changes = self.output.save(self.jobs, complete)
+        if changes:
+            self.metrics.update("changes", changes["counts"])
 
-    def format_excel(self):
-        try:
-            wb = load_workbook(self.output_file)
-            ws = wb.active
-            
-            header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-            header_font = Font(name='微软雅黑', size=11, bold=True, color="FFFFFF")
-            content_font = Font(name='微软雅黑', size=10)
-            center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            top_left_align = Alignment(horizontal='left', vertical='top', wrap_text=True)
-            thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), 
-                                 top=Side(style='thin'), bottom=Side(style='thin'))
-
-            ws.column_dimensions['A'].width = 30
-            ws.column_dimensions['B'].width = 15
-            ws.column_dimensions['C'].width = 15
-            ws.column_dimensions['D'].width = 15
-            ws.column_dimensions['E'].width = 15
-            ws.column_dimensions['F'].width = 50
-            ws.column_dimensions['G'].width = 50
-            ws.column_dimensions['H'].width = 20
-
-            for row in ws.iter_rows():
-                for cell in row:
-                    cell.border = thin_border
-                    if cell.row == 1:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = center_align
-                    else:
-                        cell.font = content_font
-                        cell.alignment = top_left_align
-            
-            wb.save(self.output_file)
-        except Exception as e:
-            print(f"Formatting failed: {e}")
-
-def extract_education(text):
-    if not text: return ""
-    clean = text.replace('\n', ' ')
-    patterns = [r"博士", r"硕士", r"研究生", r"本科"]
-    intro = clean[:800] 
-    for p in patterns:
-        if re.search(p, intro):
-            return f"{p}及以上"
-    return "不限/未提及"
-
-def clean_text(text):
-    if not text: return ""
-    text = re.sub(r'<[^>]+>', '', str(text))
-    text = re.sub(r'\n+', '\n', text)
-    return text.strip()
+def run_meituan_crawler(base_url='https://zhaopin.meituan.com', incremental=False, db=DEFAULT_DB,
+                        cache_dir=DEFAULT_CACHE_DIR, cache_ttl=6 * 3600, resume=False, keep_raw=False,
+                        formats=None, report=None, prometheus=None, rate=3.0, max_rate=5.0, concurrency=8):
+    """Runs a full Meituan crawl, writes the run report and returns the number of jobs saved."""
+    cache = HttpCache(cache_dir, ttl=cache_ttl) if cache_ttl > 0 else None
+    metrics = RunMetrics("meituan")
+    scraper = MeituanJobScraper(base_url=base_url, store=JobStore(db),
+                                incremental=incremental, cache=cache,
+                                journal=CheckpointJournal("meituan", resume=resume), keep_raw=keep_raw,
+                                formats=formats, metrics=metrics, limiter=RateLimiter(rate, max_rate),
+                                snapshot=SnapshotDiff("meituan"), concurrency=concurrency)
+    try:
+        scraper.scrape()
+    except Exception:
+        metrics.status = "failed"
+        raise
+    finally:
+        metrics.write(report, prometheus)
+    return len(scraper.jobs)
 
 if __name__ == "__main__":
-    scraper = MeituanJobScraper()
-    scraper.scrape()
+    import argparse
+    parser = argparse.ArgumentParser(description="Meituan campus jobs scraper")
+    parser.add_argument("--concurrency", type=int, default=8, help="同时进行的详情请求数")
+    parser.add_argument("--base-url", default="https://zhaopin.meituan.com", help="接口地址，可指向本地模拟服务")
+    parser.add_argument("--incremental", action="store_true", help="只抓取新增或列表字段变化的岗位详情")
+    parser.add_argument("--db", default=DEFAULT_DB, help="本地岗位库路径")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="详情接口 HTTP 缓存目录")
+    parser.add_argument("--cache-ttl", type=int, default=6 * 3600, help="缓存有效期（秒），0 表示禁用缓存")
+    parser.add_argument("--resume", action="store_true", help="从上次中断处继续抓取")
+    parser.add_argument("--keep-raw", action="store_true", help="调试用：保留每个岗位的原始接口数据")
+    add_output_arguments(parser)
+    add_metrics_arguments(parser)
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args()
+
+    run_meituan_crawler(base_url=args.base_url, incremental=args.incremental, db=args.db,
+                        cache_dir=args.cache_dir, cache_ttl=args.cache_ttl, resume=args.resume,
+                        keep_raw=args.keep_raw, formats=args.formats,
+                        report=args.report, prometheus=args.prometheus, rate=args.rate, max_rate=args.max_rate,
+                        concurrency=args.concurrency)
@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+# 请求耗时直方图的桶上限（秒），与 Prometheus 默认桶一致
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+def endpoint_name(url):
+    """Short endpoint label from a URL: its last two path segments, e.g. "job/list"."""
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    return "/".join(parts[-2:]) or "/"
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latencies = []
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def to_dict(self):
+        total = sum(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "latency_seconds": {
+                "mean": total / len(self.latencies) if self.latencies else 0.0,
+                "p50": self.percentile(50),
+                "p90": self.percentile(90),
+                "p99": self.percentile(99),
+                "max": max(self.latencies, default=0.0),
+            },
+            "histogram": {str(le): count for le, count in zip(LATENCY_BUCKETS + ["+Inf"], self.buckets)},
+        }
+
+class RunMetrics:
+    """Per-run metrics for one site: requests per endpoint, phases and event counters.
+
+    Thread-safe. HTTP scrapers call instrument(session) once, and every
+    request through that session is timed and counted. Browser scrapers
+    report captured responses with observe(). write() produces the JSON run
+    report and, optionally, a Prometheus text-format file.
+    """
+
+    def __init__(self, site):
+        self.site = site
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.endpoints = {}
+        self.phases = {}
+        self.counters = {}
+        self.gauges = {} # 本次运行的取值，如岗位数
+        self.status = "ok" # 中断时为 interrupted，异常退出时为 failed
+
+    def _endpoint(self, name):
+        stats = self.endpoints.get(name)
+        if stats is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def observe(self, endpoint, seconds=None, nbytes=0, error=False):
+        """Records one request; seconds may be None when the latency is unknown."""
+        with self.lock:
+            stats = self._endpoint(endpoint)
+            stats.requests += 1
+            stats.bytes += nbytes or 0
+            if error:
+                stats.errors += 1
+            if seconds is not None:
+                stats.latencies.append(seconds)
+                for i, le in enumerate(LATENCY_BUCKETS):
+                    if seconds <= le:
+                        stats.buckets[i] += 1
+                        break
+                else:
+                    stats.buckets[-1] += 1
+
+    def retry(self, endpoint):
+        with self.lock:
+            self._endpoint(endpoint).retries += 1
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def update(self, prefix, stats):
+        """Copies another component's stats dict (cache, job store) into the counters."""
+        with self.lock:
+            for name, value in stats.items():
+                self.counters[f"{prefix}_{name}"] = value
+
+    @contextmanager
+    def phase(self, name):
+        """Adds the wall time of the block to a phase; concurrent blocks add up."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases[name] = self.phases.get(name, 0.0) + time.time() - start
+
+    def instrument(self, session):
+        """Times and counts every request sent through a requests.Session."""
+        send = session.send
+        def timed_send(request, **kwargs):
+            start = time.perf_counter()
+            try:
+                response = send(request, **kwargs)
+            except Exception:
+                self.observe(endpoint_name(request.url), time.perf_counter() - start, error=True)
+                raise
+            if kwargs.get("stream"):
+                nbytes = int(response.headers.get("Content-Length") or 0)
+            else:
+                nbytes = len(response.content or b"")
+            self.observe(endpoint_name(request.url), time.perf_counter() - start, nbytes,
+                         error=response.status_code >= 400)
+            return response
+        session.send = timed_send
+        return session
+
+    def to_dict(self):
+        with self.lock:
+            finished = time.time()
+            return {
+                "site": self.site,
+                "status": self.status,
+                "started_at": datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+                "finished_at": datetime.fromtimestamp(finished).isoformat(timespec="seconds"),
+                "wall_seconds": finished - self.started,
+                "phases_seconds": dict(self.phases),
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "endpoints": {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())},
+            }
+
+    def to_prometheus(self):
+        report = self.to_dict()
+        site = self.site
+        lines = []
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in [("site", site)] + labels)
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        metric("scraper_run_success", "gauge", "1 if the last run finished, 0 if it was interrupted or failed.",
+               [([], 1 if self.status == "ok" else 0)])
+        metric("scraper_run_timestamp_seconds", "gauge", "Unix time the last run finished.",
+               [([], round(time.time()))])
+        metric("scraper_run_wall_seconds", "gauge", "Wall time of the last run.", [([], report["wall_seconds"])])
+        metric("scraper_phase_seconds", "gauge", "Wall time per phase, summed across worker threads.",
+               [([("phase", name)], seconds) for name, seconds in report["phases_seconds"].items()])
+        metric("scraper_events_total", "counter", "Run-level counters such as jobs, list pages and empty pages.",
+               [([("event", name)], value) for name, value in report["counters"].items()])
+        for name, value in report["gauges"].items():
+            metric(f"scraper_{name}", "gauge", f"{name} in the last run.", [([], value)])
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            metric("scraper_requests_total", "counter", "Requests per endpoint.",
+                   [([("endpoint", n)], s.requests) for n, s in endpoints])
+            metric("scraper_request_errors_total", "counter", "Failed requests (HTTP >= 400 or exceptions).",
+                   [([("endpoint", n)], s.errors) for n, s in endpoints])
+            metric("scraper_request_retries_total", "counter", "Retried requests per endpoint.",
+                   [([("endpoint", n)], s.retries) for n, s in endpoints])
+            metric("scraper_response_bytes_total", "counter", "Response body bytes per endpoint.",
+                   [([("endpoint", n)], s.bytes) for n, s in endpoints])
+            lines.append("# HELP scraper_request_duration_seconds Request latency per endpoint.")
+            lines.append("# TYPE scraper_request_duration_seconds histogram")
+            for name, stats in endpoints:
+                cumulative = 0
+                for le, count in zip(LATENCY_BUCKETS + ["+Inf"], stats.buckets):
+                    cumulative += count
+                    lines.append(f'scraper_request_duration_seconds_bucket{{site="{site}",endpoint="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'scraper_request_duration_seconds_sum{{site="{site}",endpoint="{name}"}} {sum(stats.latencies)}')
+                lines.append(f'scraper_request_duration_seconds_count{{site="{site}",endpoint="{name}"}} {len(stats.latencies)}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, report_path=None, prometheus_path=None):
+        """Writes the JSON run report (default reports/<site>.json) and an optional Prometheus file."""
+        report_path = report_path or os.path.join(REPORT_DIR, f"{self.site}.json")
+        for path, text in ((report_path, json.dumps(self.to_dict(), ensure_ascii=False, indent=2)),
+                           (prometheus_path, self.to_prometheus() if prometheus_path else None)):
+            if not path:
+                continue
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            # 先写临时文件再替换，调度器不会读到写了一半的报告
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        print(f"Run report written to {report_path}" + (f" and {prometheus_path}" if prometheus_path else ""))
+
+def browser_latency(response):
+    """Seconds from request start to the last response byte, from Playwright timing; None if unknown."""
+    try:
+        timing = response.request.timing
+        end = timing.get("responseEnd", -1)
+        if end is None or end < 0:
+            end = timing.get("responseStart", -1)
+        return end / 1000 if end is not None and end >= 0 else None
+    except Exception:
+        return None
+
+def response_size(response):
+    """Body size of a Playwright response from its Content-Length header, or 0."""
+    try:
+        return int(response.headers.get("content-length") or 0)
+    except (ValueError, AttributeError):
+        return 0
+
+def add_metrics_arguments(parser):
+    parser.add_argument("--report", default=None, help="JSON 运行报告路径（默认 reports/<站点>.json）")
+    parser.add_argument("--prometheus", default=None, help="同时写出 Prometheus 文本格式指标文件")
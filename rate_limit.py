@@ -0,0 +1,160 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+class HostLimiter:
+    """Token bucket for one host whose rate adapts with AIMD.
+
+    Until the first backoff every good response adds `increase` (slow start:
+    the rate roughly doubles each second); afterwards it adds increase / rate,
+    about `increase` requests/sec per second. A 429 or 403, a connection error, a
+    run of 5xx responses or latency well above the host's baseline multiplies
+    the rate by `decrease`, at most once per `cooldown` seconds so a burst of
+    in-flight failures counts once. A Retry-After header pauses the host.
+    """
+
+    def __init__(self, host, rate=3.0, min_rate=0.5, max_rate=5.0, burst=2, increase=1.0, decrease=0.5,
+                 latency_factor=2.0, cooldown=1.0):
+        self.host = host
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.baseline = None # 正常状态下的延迟基线（慢速 EWMA）
+        self.recent = None # 近期延迟（快速 EWMA）
+        self.error_ratio = 0.0 # 近期 5xx 比例（EWMA），个别岗位偶发 500 不触发降速
+        self.slow_start = True
+        self.logged_rate = rate
+        self.logged_at = 0.0
+        self.stats = {"requests": 0, "waited_seconds": 0.0, "decreases": 0}
+
+    def acquire(self):
+        """Blocks until the caller may send one request to this host."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # 令牌不足时预约下一个令牌，tokens 为负表示排队中的请求
+            wait = max((1 - self.tokens) / self.rate if self.tokens < 1 else 0.0, self.paused_until - now)
+            self.tokens -= 1
+            self.stats["requests"] += 1
+            self.stats["waited_seconds"] += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def feedback(self, status, latency, retry_after=None):
+        """Adjusts the rate from one response; status is None for a connection error."""
+        with self.lock:
+            now = time.monotonic()
+            reason = None
+            server_error = status is not None and status >= 500
+            self.error_ratio = 0.9 * self.error_ratio + (0.1 if server_error else 0.0)
+            # 403 多为反爬拦截，与 429 一样降速
+            if status is None or status in (429, 403):
+                reason = f"HTTP {status}" if status else "connection error"
+            elif server_error:
+                if self.error_ratio > 0.25:
+                    reason = f"{self.error_ratio:.0%} HTTP 5xx"
+                else:
+                    return
+            elif latency is not None:
+                self.recent = latency if self.recent is None else 0.7 * self.recent + 0.3 * latency
+                if self.baseline is None:
+                    self.baseline = latency
+                elif self.recent > self.baseline * self.latency_factor and self.recent - self.baseline > 0.1:
+                    reason = f"latency {self.recent * 1000:.0f} ms vs {self.baseline * 1000:.0f} ms baseline"
+                else:
+                    self.baseline = 0.95 * self.baseline + 0.05 * latency
+
+            if reason is None:
+                step = self.increase if self.slow_start else self.increase / self.rate
+                self.rate = min(self.max_rate, self.rate + step)
+                # 加速时最多每 5 秒记录一次，且只在变化超过 20% 时记录
+                if now - self.logged_at >= 5 and abs(self.rate - self.logged_rate) >= 0.2 * self.logged_rate:
+                    self._log(f"{self.logged_rate:.1f} -> {self.rate:.1f} req/s", now)
+                return
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+            if now - self.last_decrease < self.cooldown:
+                return
+            self.last_decrease = now
+            self.slow_start = False
+            self.stats["decreases"] += 1
+            old = self.rate
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # 延迟基线随之放宽，避免持续慢响应时一直降速
+            if self.recent is not None and reason.startswith("latency"):
+                self.baseline = 0.5 * (self.baseline + self.recent)
+            self._log(f"{old:.1f} -> {self.rate:.1f} req/s ({reason})", now)
+
+    def _log(self, change, now):
+        print(f"Rate limit {self.host}: {change}")
+        self.logged_rate = self.rate
+        self.logged_at = now
+
+class RateLimiter:
+    """Per-host adaptive limiters shared by every request sent through wrapped sessions."""
+
+    def __init__(self, rate=3.0, max_rate=5.0, min_rate=0.5):
+        self.settings = {"rate": rate, "max_rate": max_rate, "min_rate": min(min_rate, rate)}
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def for_host(self, host):
+        with self.lock:
+            limiter = self.hosts.get(host)
+            if limiter is None:
+                limiter = self.hosts[host] = HostLimiter(host, **self.settings)
+            return limiter
+
+    def wrap(self, session):
+        """Rate-limits every request sent through a requests.Session, per host.
+
+        Wrap after RunMetrics.instrument so the metrics time the request
+        itself, not the wait for a token.
+        """
+        send = session.send
+        def limited_send(request, **kwargs):
+            limiter = self.for_host(urlparse(request.url).netloc)
+            limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = send(request, **kwargs)
+            except Exception:
+                limiter.feedback(None, None)
+                raise
+            limiter.feedback(response.status_code, time.perf_counter() - start,
+                             retry_after_seconds(response.headers.get("Retry-After")))
+            return response
+        session.send = limited_send
+        return session
+
+    def report(self, metrics=None):
+        for host, limiter in sorted(self.hosts.items()):
+            s = limiter.stats
+            print(f"Rate limit {host}: final {limiter.rate:.1f} req/s, {s['requests']} requests, "
+                  f"{s['decreases']} backoffs, waited {s['waited_seconds']:.1f}s in total")
+            if metrics:
+                metrics.set("rate_limit_rps", round(limiter.rate, 2))
+                metrics.update("rate_limit", {"backoffs": s["decreases"], "waited_seconds": round(s["waited_seconds"], 2)})
+
+def retry_after_seconds(value):
+    """Parses a numeric Retry-After header; HTTP-date values are ignored."""
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
+def add_rate_limit_arguments(parser):
+    parser.add_argument("--rate", type=float, default=3.0, help="每个主机的初始请求速率（次/秒），之后按响应情况自动调整")
+    parser.add_argument("--max-rate", type=float, default=5.0,
+                        help="每个主机的请求速率上限（次/秒），默认与原先每次间隔 0.3 秒的节奏相近")
@@ -0,0 +1,85 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class RetryQueue:
+    """Failed fetches set aside during the main pass and retried once it ends.
+
+    The main pass only calls add(), so one slow or failing posting never holds
+    up the list loop. drain() then retries every queued key up to `attempts`
+    times. Before attempt k each key waits base_delay * 2^(k-1) seconds
+    (capped at max_delay), scaled by a random factor in [0.5, 1) so retries
+    do not arrive in lockstep. Keys that still fail are kept in `missing`.
+    """
+
+    def __init__(self, attempts=3, base_delay=1.0, max_delay=30.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.items = {} # key -> [context, ...]，同一岗位可能被多个类别引用
+        self.missing = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, key, context=None):
+        with self.lock:
+            self.items.setdefault(key, []).append(context)
+
+    def backoff(self, attempt):
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def drain(self, fetch, on_success, workers=1):
+        """Retries queued keys; fetch(key) returns a result or None on failure.
+
+        on_success(key, contexts, result) is called from this thread for every
+        key that eventually succeeds. Returns {key: contexts} still failing.
+        """
+        with self.lock:
+            pending = list(self.items.items())
+            self.items.clear()
+
+        def attempt_one(key, due):
+            time.sleep(max(due - time.monotonic(), 0))
+            try:
+                return fetch(key)
+            except Exception:
+                return None
+
+        for attempt in range(1, self.attempts + 1):
+            if not pending:
+                break
+            print(f"Retrying {len(pending)} failed fetches (attempt {attempt}/{self.attempts})...")
+            start = time.monotonic()
+            dues = [start + self.backoff(attempt) for _ in pending]
+            with ThreadPoolExecutor(max_workers=max(min(workers, len(pending)), 1)) as pool:
+                results = list(pool.map(attempt_one, [key for key, _ in pending], dues))
+            failed = []
+            for (key, contexts), result in zip(pending, results):
+                if result is None:
+                    failed.append((key, contexts))
+                else:
+                    on_success(key, contexts, result)
+            pending = failed
+
+        with self.lock:
+            self.missing.update(pending)
+        return dict(pending)
+
+    def report(self, describe=str, limit=20):
+        """Prints the keys still failing after drain(), plus any never drained (e.g. on Ctrl+C)."""
+        with self.lock:
+            missing = dict(self.missing)
+            for key, contexts in self.items.items():
+                missing.setdefault(key, contexts)
+        if not missing:
+            return 0
+        print(f"{len(missing)} jobs still missing details after retries:")
+        for key, contexts in list(missing.items())[:limit]:
+            print(f"  {key}: {describe(contexts[0])}")
+        if len(missing) > limit:
+            print(f"  ... and {len(missing) - limit} more")
+        return len(missing)
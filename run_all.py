@@ -0,0 +1,124 @@
+"""Runs all four campus scrapers in parallel, one process per site.
+
+Each site runs in its own spawned process with its output sent to
+logs/<site>.log, so a crash or hang in one site does not affect the others.
+A site that exceeds its timeout is terminated. A summary of job counts and
+wall time per site is printed at the end.
+
+Usage: python run_all.py [--sites mihoyo tencent] [--timeout 1800] [--timeout-mihoyo 900]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.path.join(SCRIPT_DIR, "logs")
+
+# 站点名 -> (模块, 入口函数)；入口函数返回保存的岗位数
+SITES = {
+    "mihoyo": ("main", "run_crawler"),
+    "bytedance": ("bytedance_crawler", "run_bd_crawler"),
+    "tencent": ("tencent_crawler", "run_tencent_crawler"),
+    "meituan": ("meituan_crawler", "run_meituan_crawler"),
+}
+
+def run_site(site, result_queue, log_dir, kwargs=None):
+    """Child process entry: runs one site with stdout/stderr redirected to its log file."""
+    os.chdir(SCRIPT_DIR)
+    sys.path.insert(0, SCRIPT_DIR)
+    os.makedirs(log_dir, exist_ok=True)
+    log = open(os.path.join(log_dir, f"{site}.log"), "w", encoding="utf-8", buffering=1)
+    sys.stdout = sys.stderr = log
+    try:
+        module_name, func_name = SITES[site]
+        module = __import__(module_name)
+        count = getattr(module, func_name)(**(kwargs or {}))
+        result_queue.put((site, "ok", count, ""))
+    except BaseException as e:
+        traceback.print_exc()
+        message = str(e).strip().splitlines()[0] if str(e).strip() else ""
+        result_queue.put((site, "failed", 0, f"{type(e).__name__}: {message}"))
+    finally:
+        log.flush()
+
+def run_all(sites, timeouts, log_dir=LOG_DIR, options=None):
+    """Runs the given sites concurrently. Returns ({site: summary dict}, wall seconds).
+
+    options maps a site to keyword arguments for its entry function.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    result_queue = ctx.Queue()
+    procs = {}
+    start = time.time()
+    for site in sites:
+        proc = ctx.Process(target=run_site, args=(site, result_queue, log_dir, (options or {}).get(site)), name=f"scraper-{site}")
+        proc.start()
+        procs[site] = proc
+        print(f"Started {site} (pid {proc.pid}, timeout {timeouts[site]}s)")
+
+    summary = {site: {"status": "running", "jobs": 0, "seconds": 0.0, "error": ""} for site in sites}
+    pending = set(sites)
+    while pending:
+        # 先收集已上报的结果，再检查退出与超时
+        while not result_queue.empty():
+            site, status, count, error = result_queue.get()
+            summary[site].update(status=status, jobs=count, error=error, seconds=time.time() - start)
+        now = time.time()
+        for site in list(pending):
+            proc = procs[site]
+            if not proc.is_alive():
+                proc.join()
+                if summary[site]["status"] == "running":
+                    # 进程没上报结果就退出了（如被系统杀掉）
+                    summary[site].update(status="crashed", error=f"exit code {proc.exitcode}",
+                                         seconds=now - start)
+                print(f"{site} finished: {summary[site]['status']}")
+                pending.discard(site)
+            elif now - start > timeouts[site]:
+                proc.terminate()
+                proc.join(5)
+                if proc.is_alive():
+                    proc.kill()
+                summary[site].update(status="timeout", seconds=now - start,
+                                     error=f"exceeded {timeouts[site]}s")
+                print(f"{site} timed out and was terminated")
+                pending.discard(site)
+        if pending:
+            time.sleep(0.5)
+
+    # 进程退出前放入队列的结果可能在最后一轮才读到
+    while not result_queue.empty():
+        site, status, count, error = result_queue.get()
+        if summary[site]["status"] in ("running", "crashed"):
+            summary[site].update(status=status, jobs=count, error=error)
+    return summary, time.time() - start
+
+def print_summary(summary, wall_time):
+    print("\n=== Run summary ===")
+    print(f"{'site':<10} {'status':<8} {'jobs':>6} {'time':>9}  error")
+    for site, info in summary.items():
+        print(f"{site:<10} {info['status']:<8} {info['jobs']:>6} {info['seconds']:>8.1f}s  {info['error']}")
+    total_jobs = sum(info["jobs"] for info in summary.values())
+    slowest = max((info["seconds"] for info in summary.values()), default=0.0)
+    print(f"{'total':<10} {'':<8} {total_jobs:>6} {wall_time:>8.1f}s  (slowest site {slowest:.1f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run all campus job scrapers in parallel")
+    parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES), help="要运行的站点")
+    parser.add_argument("--timeout", type=int, default=1800, help="每个站点的默认超时（秒）")
+    for site in SITES:
+        parser.add_argument(f"--timeout-{site}", type=int, default=None, help=f"{site} 的超时（秒）")
+    parser.add_argument("--log-dir", default=LOG_DIR, help="各站点日志目录")
+    args = parser.parse_args()
+
+    timeouts = {site: getattr(args, f"timeout_{site}") or args.timeout for site in args.sites}
+    summary, wall_time = run_all(args.sites, timeouts, log_dir=args.log_dir)
+    print_summary(summary, wall_time)
+    if any(info["status"] != "ok" for info in summary.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Runs the browser-based scrapers (miHoYo, ByteDance) together on one shared browser.
+
+Both sites are crawled at the same time on one asyncio event loop. A single
+Chromium process is launched (only once a site actually needs it), and each
+site gets its own context, so cookies, cache and request blocking never mix.
+miHoYo tries its direct API first and only opens a context if the API
+rejects it. A failure in one site does not stop the other; a summary of job
+counts and time per site is printed at the end.
+
+Usage: python run_browser.py [--sites mihoyo bytedance] [--mode browser] [--workers 4]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from browser_pool import BrowserPool
+from browser_profile import BrowserProfile, add_profile_arguments
+from bytedance_crawler import crawl_bytedance
+from job_store import DEFAULT_DB
+from main import crawl_mihoyo
+from run_all import print_summary
+from sinks import add_output_arguments
+
+# 站点名 -> 协程入口；都接受 pool 参数并返回保存的岗位数
+SITES = {"mihoyo": crawl_mihoyo, "bytedance": crawl_bytedance}
+
+async def crawl_site(site, pool, kwargs, start):
+    summary = {"status": "ok", "jobs": 0, "seconds": 0.0, "error": ""}
+    try:
+        summary["jobs"] = await SITES[site](pool=pool, **kwargs)
+    except Exception as e:
+        message = str(e).strip().splitlines()[0] if str(e).strip() else ""
+        summary.update(status="failed", error=f"{type(e).__name__}: {message}")
+        print(f"[{site}] failed: {summary['error']}")
+    summary["seconds"] = time.time() - start
+    print(f"{site} finished: {summary['status']}")
+    return summary
+
+async def run_browser(sites, fast=None, options=None):
+    """Crawls the given sites concurrently in one browser. Returns ({site: summary dict}, wall seconds).
+
+    options maps a site to keyword arguments for its entry coroutine.
+    """
+    start = time.time()
+    async with BrowserPool(BrowserProfile(fast=fast)) as pool:
+        results = await asyncio.gather(*(crawl_site(site, pool, (options or {}).get(site, {}), start)
+                                         for site in sites))
+    return dict(zip(sites, results)), time.time() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES), help="要运行的站点")
+    parser.add_argument("--mode", choices=["auto", "api", "browser"], default="auto", help="米哈游的抓取模式")
+    parser.add_argument("--workers", type=int, default=4, help="米哈游浏览器模式下并行抓取详情的页面数")
+    parser.add_argument("--incremental", action="store_true", help="米哈游只抓取新增或列表字段变化的岗位详情")
+    parser.add_argument("--db", default=DEFAULT_DB, help="本地岗位库路径")
+    parser.add_argument("--resume", action="store_true", help="从上次中断处继续抓取")
+    add_profile_arguments(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    common = {"fast": args.fast, "db": args.db, "resume": args.resume, "formats": args.formats}
+    options = {"mihoyo": dict(common, mode=args.mode, workers=args.workers, incremental=args.incremental),
+               "bytedance": common}
+    try:
+        summary, wall_time = asyncio.run(run_browser(args.sites, fast=args.fast, options=options))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+        sys.exit(1)
+    print_summary(summary, wall_time)
+    if any(info["status"] != "ok" for info in summary.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import csv
+import importlib.util
+import json
+import os
+import threading
+from excel_writer import write_styled_excel
+
+FORMATS = ["xlsx", "parquet", "jsonl", "csv"]
+
+class ExcelSink:
+    """Styled .xlsx report, written once at the end."""
+    streaming = False
+
+    def __init__(self, path, columns, widths):
+        self.path = path
+        self.columns = columns
+        self.widths = widths
+
+    def write_all(self, rows):
+        return write_styled_excel(rows, self.columns, self.widths, self.path)
+
+class CsvSink:
+    """UTF-8 CSV with a BOM so Excel opens the Chinese headers correctly."""
+    streaming = False
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+
+    def write_all(self, rows):
+        count = 0
+        with open(self.path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=self.columns, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+class ParquetSink:
+    """Columnar Parquet file via pandas; needs pyarrow or fastparquet."""
+    streaming = False
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = columns
+
+    @staticmethod
+    def available():
+        return any(importlib.util.find_spec(name) for name in ("pyarrow", "fastparquet"))
+
+    def write_all(self, rows):
+        import pandas as pd
+        df = pd.DataFrame(list(rows), columns=self.columns)
+        df.to_parquet(self.path, index=False)
+        return len(df)
+
+class JsonlSink:
+    """Line-delimited JSON, appended row by row while the crawl runs.
+
+    Each line carries the posting ID under "岗位ID"; a posting is written at most
+    once. Rows not streamed during the crawl (restored from a checkpoint or
+    reused from the job store) are appended when the run finishes.
+    """
+    streaming = True
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.seen = set()
+        self.lock = threading.Lock()
+
+    def add(self, job_id, row):
+        with self.lock:
+            if job_id in self.seen:
+                return
+            if self.file is None:
+                self.file = open(self.path, "w", encoding="utf-8")
+            self.seen.add(job_id)
+            self.file.write(json.dumps({"岗位ID": job_id, **row}, ensure_ascii=False) + "\n")
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+        return len(self.seen)
+
+class JobOutput:
+    """Writes a site's records to every requested format.
+
+    base_path has no extension; each format adds its own. to_rows maps an
+    iterable of JobRecords to row dicts keyed by column name. An optional
+    snapshot (snapshot_diff.SnapshotDiff) diffs each complete run against the
+    previous one.
+    """
+
+    def __init__(self, base_path, columns, widths, to_rows, formats=None, snapshot=None):
+        self.to_rows = to_rows
+        self.snapshot = snapshot
+        self.sinks = []
+        for fmt in formats or ["xlsx"]:
+            path = f"{base_path}.{fmt}"
+            if fmt == "xlsx":
+                self.sinks.append(ExcelSink(path, columns, widths))
+            elif fmt == "csv":
+                self.sinks.append(CsvSink(path, columns))
+            elif fmt == "jsonl":
+                self.sinks.append(JsonlSink(path))
+            elif fmt == "parquet":
+                if ParquetSink.available():
+                    self.sinks.append(ParquetSink(path, columns))
+                else:
+                    print("Parquet output needs pyarrow (pip install pyarrow); skipping .parquet.")
+            else:
+                raise ValueError(f"Unknown output format: {fmt}")
+
+    @property
+    def streaming(self):
+        return any(sink.streaming for sink in self.sinks)
+
+    def add(self, record):
+        """Streams one finished record to the streaming sinks."""
+        if not self.streaming:
+            return
+        row = next(iter(self.to_rows([record])))
+        for sink in self.sinks:
+            if sink.streaming:
+                sink.add(record.job_id, row)
+
+    def save(self, records, complete=True):
+        """Writes all records to the batch sinks and completes the streaming ones.
+
+        Returns the snapshot change report, or None when there is no snapshot,
+        no previous run, or the crawl was incomplete.
+        """
+        records = list(records)
+        batch = [sink for sink in self.sinks if not sink.streaming]
+        # 只有一个批量格式时直接传生成器，保持 Excel 流式写入的低内存
+        rows = self.to_rows(records) if len(batch) <= 1 else list(self.to_rows(records))
+        for sink in batch:
+            try:
+                count = sink.write_all(rows)
+                print(f"Saved {count} rows to {sink.path}")
+            except Exception as e:
+                print(f"Saving {sink.path} failed: {e}")
+        for sink in self.sinks:
+            if sink.streaming:
+                missing = [record for record in records if record.job_id not in sink.seen]
+                for record, row in zip(missing, self.to_rows(missing)):
+                    sink.add(record.job_id, row)
+                print(f"Saved {sink.close()} rows to {sink.path}")
+        if self.snapshot is None:
+            return None
+        if not complete:
+            # 中断或翻页失败时的结果不完整，不能据此判断岗位下线
+            print("Crawl incomplete; keeping the previous snapshot for the next diff.")
+            return None
+        try:
+            return self.snapshot.update(records, rows if isinstance(rows, list) else self.to_rows(records))
+        except Exception as e:
+            print(f"Snapshot diff failed: {e}")
+            return None
+
+    def close(self):
+        for sink in self.sinks:
+            if sink.streaming:
+                sink.close()
+
+def read_rows(path):
+    """Yields row dicts back from any output file written by JobOutput, by extension.
+
+    jsonl, csv and xlsx are streamed; parquet is read whole. Missing cells are "".
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif ext == ".csv":
+        with open(path, "r", newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+    elif ext == ".xlsx":
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(name) if name is not None else "" for name in next(rows, [])]
+            for values in rows:
+                if any(value is not None for value in values):
+                    yield {name: "" if value is None else value for name, value in zip(header, values)}
+        finally:
+            wb.close()
+    elif ext == ".parquet":
+        import pandas as pd
+        yield from pd.read_parquet(path).fillna("").to_dict("records")
+    else:
+        raise ValueError(f"Unknown output format: {path}")
+
+def find_output(base_path, formats=("jsonl", "csv", "xlsx", "parquet")):
+    """Returns the newest existing output file for base_path, or None.
+
+    Files written by the same run share a timestamp to within a few seconds,
+    so among those the cheapest format to read (earliest in formats) wins.
+    """
+    found = [(os.path.getmtime(f"{base_path}.{fmt}"), -i, f"{base_path}.{fmt}")
+             for i, fmt in enumerate(formats) if os.path.exists(f"{base_path}.{fmt}")]
+    if not found:
+        return None
+    newest = max(mtime for mtime, _, _ in found)
+    return max((entry for entry in found if entry[0] >= newest - 60), key=lambda entry: entry[1])[2]
+
+def add_output_arguments(parser):
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=["xlsx"],
+                        help="输出格式，可多选；jsonl 在抓取过程中逐条写入")
@@ -0,0 +1,179 @@
+"""Added / removed / changed postings between two crawl snapshots.
+
+Every posting is reduced to a fingerprint: its key (the site job ID, or
+岗位名称|岗位类别 when there is none) plus a short hash per field. After each
+complete run the scraper diffs its fingerprints against the previous run's
+snapshot in .snapshots/<site>.jsonl, writes the change report to
+reports/<site>_changes.json and replaces the snapshot. Only the new run's
+fingerprints are held in memory; the older snapshot is streamed line by line.
+
+The same diff works on any two output files (jsonl, csv, xlsx, parquet) or
+snapshots. Fields missing from either side (e.g. 工作城市 in older workbooks)
+are not compared.
+
+Usage: python snapshot_diff.py old.xlsx new.xlsx [--out changes.json]
+       python snapshot_diff.py .snapshots/tencent.jsonl tencent_campus_jobs.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+from metrics import REPORT_DIR
+from sinks import read_rows
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots")
+
+# 参与比较的输出列；学历要求、届别、技能关键词由正文派生，不单独比较
+FIELD_COLUMNS = ("岗位名称", "岗位类别", "性质", "工作城市", "任职要求", "工作职责", "加分项")
+
+def field_hash(value):
+    # 空白差异（换行、缩进）不算修改
+    text = " ".join(str(value or "").split())
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+def make_entry(job_id, row):
+    """Fingerprints one output row; returns {"key", "title", "category", "fields"}."""
+    title, category = str(row.get("岗位名称") or ""), str(row.get("岗位类别") or "")
+    return {"key": str(job_id) if job_id not in (None, "") else f"{title}|{category}",
+            "title": title, "category": category,
+            "fields": {column: field_hash(row[column]) for column in FIELD_COLUMNS if column in row}}
+
+def row_entries(rows, use_ids=True):
+    """Fingerprints output rows (or passes snapshot lines through).
+
+    With use_ids=False every posting is keyed by 岗位名称|岗位类别, for comparing
+    against a file without IDs (csv, xlsx, parquet).
+    """
+    for row in rows:
+        if "key" in row and "fields" in row:
+            yield row if use_ids else dict(row, key=f"{row['title']}|{row['category']}")
+        else:
+            yield make_entry(row.get("岗位ID") if use_ids else None, row)
+
+def has_ids(path):
+    """Whether the postings in an output file or snapshot carry site job IDs."""
+    rows = read_rows(path)
+    try:
+        row = next(rows, None)
+    finally:
+        rows.close()
+    if row is None:
+        return True
+    if "key" in row and "fields" in row:
+        return row["key"] != f"{row['title']}|{row['category']}"
+    return bool(row.get("岗位ID"))
+
+def unique_keys(entries):
+    # 无岗位ID时 名称|类别 可能重复，按出现顺序加 #2、#3 区分
+    seen = {}
+    for entry in entries:
+        count = seen[entry["key"]] = seen.get(entry["key"], 0) + 1
+        if count > 1:
+            entry = dict(entry, key=f"{entry['key']}#{count}")
+        yield entry
+
+def summary(entry):
+    return {"id": entry["key"], "title": entry["title"], "category": entry["category"]}
+
+def diff_snapshots(old_entries, new_entries):
+    """Compares two fingerprint streams; only new_entries is held in memory.
+
+    Returns {"counts", "added", "removed", "changed"}; each changed item lists
+    the columns whose content differs.
+    """
+    current = {entry["key"]: entry for entry in unique_keys(new_entries)}
+    seen = set()
+    removed, changed, unchanged = [], [], 0
+    for old in unique_keys(old_entries):
+        new = current.get(old["key"])
+        if new is None:
+            removed.append(summary(old))
+            continue
+        seen.add(old["key"])
+        old_fields, new_fields = old["fields"], new["fields"]
+        columns = [column for column in FIELD_COLUMNS
+                   if column in old_fields and column in new_fields and old_fields[column] != new_fields[column]]
+        if columns:
+            changed.append(dict(summary(new), fields=columns))
+        else:
+            unchanged += 1
+    added = [summary(entry) for key, entry in current.items() if key not in seen]
+    return {"counts": {"added": len(added), "removed": len(removed), "changed": len(changed), "unchanged": unchanged},
+            "added": added, "removed": removed, "changed": changed}
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def print_changes(report, limit=10):
+    counts = report["counts"]
+    print(f"Changes: {counts['added']} added, {counts['removed']} removed, {counts['changed']} changed, "
+          f"{counts['unchanged']} unchanged")
+    for label, key in (("+", "added"), ("-", "removed"), ("~", "changed")):
+        items = report[key]
+        for item in items[:limit]:
+            fields = f"  [{', '.join(item['fields'])}]" if "fields" in item else ""
+            print(f"  {label} {item['title']} | {item['category'] or '-'} ({item['id']}){fields}")
+        if len(items) > limit:
+            print(f"  {label} ... and {len(items) - limit} more")
+
+class SnapshotDiff:
+    """Diff stage run by JobOutput.save: compares a site's records with its last snapshot."""
+
+    def __init__(self, site, directory=SNAPSHOT_DIR, report_dir=REPORT_DIR):
+        self.site = site
+        self.path = os.path.join(directory, f"{site}.jsonl")
+        self.report_path = os.path.join(report_dir, f"{site}_changes.json")
+
+    def update(self, records, rows):
+        """Diffs a run's output rows against the previous snapshot, then replaces the snapshot.
+
+        rows are the output rows of records, in order. Returns the change
+        report, or None on the first run (the snapshot becomes the baseline).
+        """
+        entries = [make_entry(record.job_id, row) for record, row in zip(records, rows)]
+        report = None
+        if os.path.exists(self.path):
+            previous = datetime.fromtimestamp(os.path.getmtime(self.path)).isoformat(timespec="seconds")
+            report = dict({"site": self.site, "previous": previous,
+                           "generated_at": datetime.now().isoformat(timespec="seconds")},
+                          **diff_snapshots(row_entries(read_rows(self.path)), entries))
+            write_json(self.report_path, report)
+            print_changes(report)
+            print(f"Change report written to {self.report_path}")
+        else:
+            print(f"No previous snapshot for {self.site}; this run becomes the baseline.")
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # 旧快照读完后才替换，中途失败时保留上一次的快照
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("old", help="旧的输出文件或快照")
+    parser.add_argument("new", help="新的输出文件或快照")
+    parser.add_argument("--out", help="变更报告 JSON 路径（默认只打印）")
+    parser.add_argument("--limit", type=int, default=10, help="每类最多打印的岗位数")
+    args = parser.parse_args()
+
+    # 只有一侧带岗位ID时，两侧都改用 名称|类别 作键
+    use_ids = has_ids(args.old) and has_ids(args.new)
+    report = dict({"old": args.old, "new": args.new, "generated_at": datetime.now().isoformat(timespec="seconds")},
+                  **diff_snapshots(row_entries(read_rows(args.old), use_ids),
+                                   row_entries(read_rows(args.new), use_ids)))
+    print_changes(report, args.limit)
+    if args.out:
+        write_json(args.out, report)
+        print(f"Change report written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,65 @@
 import json
+import os
 import time
-import re
 import requests
-import pandas as pd
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from requests.adapters import HTTPAdapter
+from job_store import DEFAULT_DB, JobStore, content_hash
+from http_cache import DEFAULT_CACHE_DIR, HttpCache, has_data
+from checkpoint import CheckpointJournal
+from job_record import COLUMNS, JobRecord, to_rows
+from html_text import html_to_text_many
+from sinks import JobOutput, add_output_arguments
+from metrics import RunMetrics, add_metrics_arguments
+from rate_limit import RateLimiter, add_rate_limit_arguments
+from retry_queue import RetryQueue
+from snapshot_diff import SnapshotDiff
+
+COLUMN_WIDTHS = [30, 15, 15, 20, 15, 12, 25, 50, 50, 20]
 
 class TencentJobScraper:
-    def __init__(self):
-        self.jobs = []
+    def __init__(self, concurrency=8, base_url='https://join.qq.com', store=None, incremental=False, cache=None,
+                 journal=None, keep_raw=False, formats=None, metrics=None, limiter=None,
+                 snapshot=None, list_workers=4):
+        self.jobs = [] # JobRecord 列表
         self.output_file = "tencent_campus_jobs.xlsx"
+        # 输出格式：xlsx、parquet、jsonl、csv 任意组合，jsonl 在抓取过程中逐条写入
+        # snapshot 在完整抓取后与上次快照比较，输出新增/下线/修改的岗位
+        self.output = JobOutput(os.path.splitext(self.output_file)[0], COLUMNS, COLUMN_WIDTHS, to_rows, formats,
+                                snapshot=snapshot)
+        # base_url 可指向本地模拟服务，便于离线测试
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency # 同时进行的详情请求数
+        self.list_workers = list_workers # 同时请求的列表页数
+        # 整个抓取共用的详情线程池；requests 为阻塞调用，连接由 session 复用，节奏由限速器控制
+        self.detail_pool = ThreadPoolExecutor(max_workers=max(concurrency, 1))
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Content-Type': 'application/json'
         }
+        # 共享的 keep-alive 连接池，避免每个请求重新建立 TCP/TLS 连接
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(concurrency, 1) + max(list_workers, 1))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # 按接口统计请求数、耗时、字节数和错误，运行结束写出报告
+        self.metrics = metrics or RunMetrics("tencent")
+        self.metrics.instrument(self.session)
+        # 按主机自适应限速（令牌桶 + AIMD），替代每次请求后的固定间隔；缓存命中不占用令牌
+        self.limiter = limiter or RateLimiter()
+        self.limiter.wrap(self.session)
+        self.detail_count = 0
+        self.detail_seconds = 0.0
+        # 可选的本地岗位库；incremental 模式下列表字段未变化的岗位直接复用已存详情
+        self.store = store
+        self.incremental = incremental and store is not None
+        self.cache = cache # 可选的详情接口 HTTP 缓存
+        self.journal = journal # 断点续爬日志
+        self.keep_raw = keep_raw # 调试用：在记录中保留原始接口数据
+        # 详情请求失败的岗位先放入重试队列，主流程结束后再退避重试，不阻塞翻页
+        self.retries = RetryQueue()
         # 腾讯岗位大类映射
         self.category_map = {
             2: "技术",
@@ -29,147 +75,299 @@ class TencentJobScraper:
         page_index = 1
         page_size = 50 # 每次请求50条岗位
         total_fetched = 0
+        finished = False
+        order = {} # postId -> (页码, 页内序号)，保存前恢复列表顺序
+
+        if self.journal:
+            # 从断点恢复：已完成的岗位直接还原，从最后提交页的下一页继续
+            self.jobs = [JobRecord.from_dict(data) for data in self.journal.restored_rows()]
+            # 上次详情失败的岗位重新放回重试队列
+            pending = self.journal.pending_jobs()
+            for record in self.jobs:
+                if record.job_id in pending:
+                    self.retries.add(record.job_id, (record, pending[record.job_id]))
+            total_fetched = len(self.jobs)
+            page_index = self.journal.last_page() + 1
+            # 恢复的岗位按上次记录的列表位置排序
+            order.update(self.journal.restored_order())
         
+        # 第一页返回总数后，其余各页一次性并发请求；先到的页先抓详情，翻页不再排在详情之后
+        list_pool = ThreadPoolExecutor(max_workers=max(self.list_workers, 1))
         try:
-            while True:
-                print(f"Fetching page {page_index}...")
-                # projectId=1 对标 query=p_1，即应届生校园招聘项目
-                url = 'https://join.qq.com/api/v1/position/searchPosition'
-                payload = {'pageIndex': page_index, 'pageSize': page_size, 'projectId': 1}
-                
-                try:
-                    res = requests.post(url, json=payload, headers=self.headers)
-                except Exception as e:
-                    print(f"Failed to fetch list API: {e}")
-                    break
-                    
-                if res.status_code != 200:
-                    print(f"Error: status code {res.status_code}")
-                    break
-                    
-                data = res.json().get('data', {})
-                position_list = data.get('positionList', [])
-                total_count = data.get('count', 0)
-                
-                if not position_list:
-                    print("No more jobs found.")
-                    break
-                    
-                for pos in position_list:
-                    post_id = pos.get('postId')
-                    title = pos.get('positionTitle', "")
-                    family_id = pos.get('positionFamily')
-                    category = self.category_map.get(family_id, str(family_id))
-                    nature = pos.get('projectName', "校园招聘")
-                    
-                    # 获取详细职责和要求
-                    print(f"  -> Fetching detail for: {title}")
-                    detail = self.get_job_detail(post_id)
-                    time.sleep(0.3) # 保护接口，防止被ban
-                    
-                    # Tencent的数据中，request=任职要求，desc=工作职责
-                    req = clean_text(detail.get('request', ''))
-                    desc = clean_text(detail.get('desc', ''))
-                    
-                    # 提取学历
-                    education = extract_education(req + " " + desc)
-                    
-                    self.jobs.append({
-                        "岗位名称": title,
-                        "岗位类别": category,
-                        "性质": nature,
-                        "学历要求": education,
-                        "任职要求": req,
-                        "工作职责": desc,
-                        "加分项": ""
-                    })
-                    total_fetched += 1
-                    
-                print(f"Fetched {total_fetched}/{total_count} jobs.")
-                
-                # 若已抓取数量不小于总数，或者本页返回不足page_size，跳出
-                if len(position_list) < page_size or total_fetched >= total_count:
-                    break
-                    
-                page_index += 1
+            position_list, total_count = self.load_list_page(page_index, page_size)
+            pages = []
+            if position_list:
+                if len(position_list) >= page_size and total_count < (page_index - 1) * page_size + len(position_list):
+                    # 总数缺失或小于已收到的岗位数时无法算出页数，逐页翻到不满一页为止
+                    print(f"Job count {total_count} is not usable; fetching pages one by one...")
+                    rest = self.load_pages_until_short(page_index + 1, page_size)
+                else:
+                    last_page = max(page_index, -(-total_count // page_size))
+                    if last_page > page_index:
+                        print(f"{total_count} jobs in total; fetching pages {page_index + 1}-{last_page} concurrently...")
+                    futures = {list_pool.submit(self.load_list_page, page, page_size): page
+                               for page in range(page_index + 1, last_page + 1)}
+                    rest = ((futures[future], future.result()[0]) for future in as_completed(futures))
+                pages = chain([(page_index, position_list)], rest)
+            complete = position_list is not None
+            for page, position_list in pages:
+                if position_list is None:
+                    # 失败的页不提交，--resume 时会重新请求
+                    complete = False
+                    continue
+                total_fetched += self.process_page(page, position_list, order)
+                print(f"Fetched {total_fetched}/{total_count} jobs (page {page}).")
+
+            self.retry_failed_details()
+            # 重试队列清空后才算完整，重试期间中断时保留断点日志和上次的快照
+            finished = complete
         except KeyboardInterrupt:
             print("\nUser interrupted! Saving collected jobs so far...")
+            self.metrics.status = "interrupted"
         finally:
-            self.save()
+            list_pool.shutdown(wait=False, cancel_futures=True)
+            self.detail_pool.shutdown(wait=False, cancel_futures=True)
+            self.jobs.sort(key=lambda record: order.get(record.job_id, (0, 0)))
+            self.report_throughput()
+            self.metrics.set("missing_details", self.retries.report(lambda context: context[0].title))
+            self.limiter.report(self.metrics)
+            if self.cache:
+                self.cache.report()
+                self.metrics.update("cache", self.cache.stats)
+            self.session.close()
+            if self.store:
+                self.store.report("tencent")
+                self.metrics.update("store", self.store.stats)
+                self.store.close()
+            self.save(finished)
+            if self.journal:
+                # 完整跑完才删除断点日志，中断时保留以便 --resume
+                if finished:
+                    self.journal.complete()
+                else:
+                    self.journal.close()
+
+    def load_list_page(self, page_index, page_size=50):
+        """Returns (positionList, count) for one list page; positionList is None if the request failed."""
+        print(f"Fetching page {page_index}...")
+        try:
+            with self.metrics.phase("list"):
+                res = self.fetch_list_page(page_index, page_size)
+            if res.status_code != 200:
+                print(f"Error: status code {res.status_code} on list page {page_index}")
+                return None, 0
+            data = res.json().get('data', {})
+        except Exception as e:
+            print(f"Failed to fetch list page {page_index}: {e}")
+            return None, 0
+        position_list = data.get('positionList', [])
+        self.metrics.count("list_pages")
+        if not position_list:
+            self.metrics.count("empty_pages")
+        return position_list, data.get('count', 0)
+
+    def load_pages_until_short(self, page_index, page_size=50):
+        """Yields (page, positionList) one page at a time from page_index until a short or failed page."""
+        while True:
+            position_list, _ = self.load_list_page(page_index, page_size)
+            yield page_index, position_list
+            if not position_list or len(position_list) < page_size:
+                return
+            page_index += 1
+
+    def process_page(self, page_index, position_list, order):
+        """Fetches details for one list page and records its jobs. Returns the number of new jobs."""
+        for i, pos in enumerate(position_list):
+            order[str(pos.get('postId'))] = (page_index, i)
+        if self.journal:
+            position_list = [pos for pos in position_list if not self.journal.is_done(pos.get('postId'))]
+
+        # 并发获取本页所有岗位的详细职责和要求，结果顺序与列表一致
+        with self.metrics.phase("detail"):
+            details = self.load_details(position_list) if position_list else []
+        # Tencent的数据中，request=任职要求，desc=工作职责
+        requirements = html_to_text_many((d or {}).get('request', '') for d in details)
+        descriptions = html_to_text_many((d or {}).get('desc', '') for d in details)
+
+        for pos, detail, req, desc in zip(position_list, details, requirements, descriptions):
+            title = pos.get('positionTitle', "")
+            family_id = pos.get('positionFamily')
+            category = self.category_map.get(family_id, str(family_id))
+            nature = pos.get('projectName', "校园招聘")
+            
+            record = JobRecord("tencent", pos.get('postId'), title=title, category=category, nature=nature,
+                               requirement=req, description=desc,
+                               raw={"list": pos, "detail": detail} if self.keep_raw else None)
+            self.jobs.append(record)
+            list_hash = None
+            if detail is None:
+                # 补齐详情后才写入流式输出；断点日志中记为待重试
+                list_hash = content_hash(pos)
+                self.retries.add(pos.get('postId'), (record, list_hash))
+            else:
+                self.output.add(record)
+            if self.journal:
+                self.journal.record_job(pos.get('postId'), record.to_dict(), pending=list_hash,
+                                        order=order[str(pos.get('postId'))])
+            
+        if self.journal:
+            self.journal.commit_page(page_index)
+        return len(position_list)
+
+    def fetch_list_page(self, page_index, page_size=50):
+        # projectId=1 对标 query=p_1，即应届生校园招聘项目
+        url = f'{self.base_url}/api/v1/position/searchPosition'
+        payload = {'pageIndex': page_index, 'pageSize': page_size, 'projectId': 1}
+        return self.session.post(url, json=payload, timeout=10)
+
+    def probe(self):
+        """Fetches list page 1 only; returns {"count", "ids"} for watch mode."""
+        res = self.fetch_list_page(1)
+        res.raise_for_status()
+        data = res.json().get('data') or {}
+        return {"count": data.get('count', 0), "ids": [str(pos.get('postId')) for pos in data.get('positionList', [])]}
+
+    def load_details(self, position_list):
+        """Returns details for a list page in order, reusing stored ones in incremental mode.
+
+        Failed fetches are None; they are stored once their retry resolves.
+        """
+        list_hashes = [content_hash(pos) for pos in position_list]
+        details = [None] * len(position_list)
+        if self.incremental:
+            for i, (pos, list_hash) in enumerate(zip(position_list, list_hashes)):
+                details[i] = self.store.cached_detail("tencent", pos.get('postId'), list_hash)
+
+        missing = [i for i, detail in enumerate(details) if detail is None]
+        if len(missing) < len(details):
+            print(f"Reusing {len(details) - len(missing)} unchanged details from job store.")
+        fetched = self.fetch_details([position_list[i].get('postId') for i in missing]) if missing else []
+        for i, detail in zip(missing, fetched):
+            details[i] = detail
+
+        if self.store:
+            for pos, list_hash, detail in zip(position_list, list_hashes, details):
+                if detail is not None:
+                    self.store.upsert("tencent", pos.get('postId'), list_hash, detail)
+            self.store.commit()
+        return details
+
+    def fetch_details(self, post_ids):
+        """Fetches details for a batch of post IDs concurrently, preserving input order."""
+        start = time.time()
+        details = [detail for detail, _ in self.detail_pool.map(self.request_detail, post_ids)]
+        self.detail_seconds += time.time() - start
+        self.detail_count += len(post_ids)
+        return details
 
     def get_job_detail(self, post_id):
-        url = f'https://join.qq.com/api/v1/jobDetails/getJobDetailsByPostId?postId={post_id}'
+        return self.request_detail(post_id)[0] or {}
+
+    def request_detail(self, post_id):
+        """Returns (detail, from_network); detail is None if the fetch failed. Cache hits skip the network."""
+        url = f'{self.base_url}/api/v1/jobDetails/getJobDetailsByPostId'
+        params = {'postId': post_id}
+        from_network = True
         try:
-            res = requests.get(url, headers=self.headers, timeout=10)
+            if self.cache:
+                res, from_network = self.cache.request(self.session, 'GET', url, params=params, timeout=10,
+                                                       cacheable=has_data)
+            else:
+                res = self.session.get(url, params=params, timeout=10)
             if res.status_code == 200:
-                return res.json().get('data', {})
+                data = res.json().get('data')
+                if data:
+                    return data, from_network
         except Exception:
             pass
-        return {}
+        return None, from_network
+
+    def retry_failed_details(self):
+        """Retries details that failed during the main pass, with exponential backoff and jitter."""
+        if not self.retries:
+            return
+
+        def fetch(post_id):
+            self.metrics.retry("jobDetails/getJobDetailsByPostId")
+            return self.request_detail(post_id)[0]
+
+        def fill(post_id, contexts, detail):
+            requirement, description = html_to_text_many([detail.get('request', ''), detail.get('desc', '')])
+            for record, list_hash in contexts:
+                record.update(requirement=requirement, description=description)
+                if self.keep_raw:
+                    # 从断点日志恢复的岗位没有原始列表数据，raw 为 None
+                    record.raw = dict(record.raw or {}, detail=detail)
+                self.output.add(record)
+                if self.journal:
+                    self.journal.record_job(post_id, record.to_dict())
+                if self.store:
+                    self.store.upsert("tencent", post_id, list_hash, detail)
 
-    def save(self):
-        print(f"\n--- Saving {len(self.jobs)} jobs to {self.output_file} ---")
+        with self.metrics.phase("retry"):
+            missing = self.retries.drain(fetch, fill, workers=self.concurrency)
+        if self.store:
+            for post_id, contexts in missing.items():
+                for _, list_hash in contexts:
+                    self.store.upsert("tencent", post_id, list_hash)
+            self.store.commit()
+
+    def report_throughput(self):
+        if self.detail_count and self.detail_seconds > 0:
+            rate = self.detail_count / self.detail_seconds
+            print(f"Detail throughput: {self.detail_count} jobs in {self.detail_seconds:.1f}s ({rate:.2f} jobs/sec, concurrency={self.concurrency})")
+
+    def save(self, complete=True):
+        print(f"\n--- Saving {len(self.jobs)} jobs ---")
+        self.metrics.set("jobs", len(self.jobs))
         if not self.jobs:
             print("No jobs to save.")
+            self.output.close()
             return
 
-        df = pd.DataFrame(self.jobs, columns=["岗位名称", "岗位类别", "性质", "学历要求", "任职要求", "工作职责", "加分项"])
-        df.to_excel(self.output_file, index=False, engine='openpyxl')
-        self.format_excel()
-        print(f"Successfully saved to {self.output_file}.")
+        with self.metrics.phase("save"):
+            changes = self.output.save(self.jobs, complete)
+        if changes:
+            self.metrics.update("changes", changes["counts"])
 
-    def format_excel(self):
-        try:
-            wb = load_workbook(self.output_file)
-            ws = wb.active
-            
-            header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-            header_font = Font(name='微软雅黑', size=11, bold=True, color="FFFFFF")
-            content_font = Font(name='微软雅黑', size=10)
-            center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            top_left_align = Alignment(horizontal='left', vertical='top', wrap_text=True)
-            thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), 
-                                 top=Side(style='thin'), bottom=Side(style='thin'))
-
-            ws.column_dimensions['A'].width = 30
-            ws.column_dimensions['B'].width = 15
-            ws.column_dimensions['C'].width = 20
-            ws.column_dimensions['D'].width = 15
-            ws.column_dimensions['E'].width = 50
-            ws.column_dimensions['F'].width = 50
-            ws.column_dimensions['G'].width = 20
-
-            for row in ws.iter_rows():
-                for cell in row:
-                    cell.border = thin_border
-                    if cell.row == 1:
-                        cell.fill = header_fill
-                        cell.font = header_font
-                        cell.alignment = center_align
-                    else:
-                        cell.font = content_font
-                        cell.alignment = top_left_align
-            
-            wb.save(self.output_file)
-        except Exception as e:
-            print(f"Formatting failed: {e}")
-
-def extract_education(text):
-    if not text: return ""
-    clean = text.replace('\n', ' ')
-    patterns = [r"博士", r"硕士", r"研究生", r"本科"]
-    intro = clean[:800] 
-    for p in patterns:
-        if re.search(p, intro):
-            return f"{p}及以上"
-    return "不限/未提及"
-
-def clean_text(text):
-    if not text: return ""
-    text = re.sub(r'<[^>]+>', '', str(text))
-    text = re.sub(r'\n+', '\n', text)
-    return text.strip()
+def run_tencent_crawler(concurrency=8, base_url='https://join.qq.com', incremental=False, db=DEFAULT_DB,
+                        cache_dir=DEFAULT_CACHE_DIR, cache_ttl=6 * 3600, resume=False, keep_raw=False,
+                        formats=None, report=None, prometheus=None, rate=3.0, max_rate=5.0):
+    """Runs a full Tencent crawl, writes the run report and returns the number of jobs saved."""
+    store = JobStore(db)
+    cache = HttpCache(cache_dir, ttl=cache_ttl) if cache_ttl > 0 else None
+    metrics = RunMetrics("tencent")
+    scraper = TencentJobScraper(concurrency=concurrency, base_url=base_url,
+                                store=store, incremental=incremental, cache=cache,
+                                journal=CheckpointJournal("tencent", resume=resume), keep_raw=keep_raw,
+                                formats=formats, metrics=metrics, limiter=RateLimiter(rate, max_rate),
+                                snapshot=SnapshotDiff("tencent"))
+    try:
+        scraper.scrape()
+    except Exception:
+        metrics.status = "failed"
+        raise
+    finally:
+        metrics.write(report, prometheus)
+    return len(scraper.jobs)
 
 if __name__ == "__main__":
-    scraper = TencentJobScraper()
-    scraper.scrape()
+    import argparse
+    parser = argparse.ArgumentParser(description="Tencent campus jobs scraper")
+    parser.add_argument("--concurrency", type=int, default=8, help="同时进行的详情请求数")
+    parser.add_argument("--base-url", default="https://join.qq.com", help="接口地址，可指向本地模拟服务")
+    parser.add_argument("--incremental", action="store_true", help="只抓取新增或列表字段变化的岗位详情")
+    parser.add_argument("--db", default=DEFAULT_DB, help="本地岗位库路径")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="详情接口 HTTP 缓存目录")
+    parser.add_argument("--cache-ttl", type=int, default=6 * 3600, help="缓存有效期（秒），0 表示禁用缓存")
+    parser.add_argument("--resume", action="store_true", help="从上次中断处继续抓取")
+    parser.add_argument("--keep-raw", action="store_true", help="调试用：保留每个岗位的原始接口数据")
+    add_output_arguments(parser)
+    add_metrics_arguments(parser)
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args()
+
+    run_tencent_crawler(concurrency=args.concurrency, base_url=args.base_url, incremental=args.incremental,
+                        db=args.db, cache_dir=args.cache_dir, cache_ttl=args.cache_ttl, resume=args.resume,
+                        keep_raw=args.keep_raw, formats=args.formats,
+                        report=args.report, prometheus=args.prometheus, rate=args.rate, max_rate=args.max_rate)
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 脚本都在仓库根目录，模拟服务在 benchmarks/ 下
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from mock_servers import MockRecruitingServer
+
+@pytest.fixture
+def mock_server():
+    """Starts MockRecruitingServer instances with the given options; stops them after the test."""
+    servers = []
+
+    def start(**options):
+        options = dict({"latency": 0.0, "jitter": 0.0}, **options)
+        server = MockRecruitingServer(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # 输出文件写在当前目录，测试中切到临时目录，避免覆盖仓库里的结果
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,58 @@
+from checkpoint import CheckpointJournal
+
+def test_resume_restores_jobs_pages_and_pending(tmp_path):
+    journal = CheckpointJournal("site", directory=tmp_path)
+    journal.record_job("a", {"title": "A"}, order=(1, 0))
+    journal.record_job("b", {"title": "B"}, pending="hash-b", order=(1, 1))
+    journal.record_job("c", {"title": "C"}, category="实习生", order=(1, 0))
+    journal.commit_page(1)
+    journal.commit_page(3)
+    journal.close()
+
+    restored = CheckpointJournal("site", resume=True, directory=tmp_path)
+    assert restored.restored_jobs() == [("a", {"title": "A"}), ("b", {"title": "B"})]
+    assert restored.restored_jobs("实习生") == [("c", {"title": "C"})]
+    assert restored.pending_jobs() == {"b": "hash-b"}
+    assert restored.restored_order() == {"a": (1, 0), "b": (1, 1)}
+    assert restored.is_done("a") and not restored.is_done("a", "实习生")
+    # 第 2 页未提交，只能从第 2 页继续
+    assert restored.last_page() == 1
+    assert restored.last_page("实习生") == 0
+    restored.close()
+
+def test_recorded_again_replaces_row_and_keeps_order(tmp_path):
+    journal = CheckpointJournal("site", directory=tmp_path)
+    journal.record_job("a", {"title": "A"}, pending="hash-a", order=(2, 5))
+    journal.record_job("b", {"title": "B"}, order=(2, 6))
+    # 重试补齐详情后再次记录，不带位置
+    journal.record_job("a", {"title": "A", "description": "filled"})
+    journal.close()
+
+    restored = CheckpointJournal("site", resume=True, directory=tmp_path)
+    assert restored.restored_rows() == [{"title": "A", "description": "filled"}, {"title": "B"}]
+    assert restored.pending_jobs() == {}
+    assert restored.restored_order()["a"] == (2, 5)
+    restored.close()
+
+def test_torn_last_line_is_ignored(tmp_path):
+    journal = CheckpointJournal("site", directory=tmp_path)
+    journal.record_job("a", {"title": "A"})
+    journal.commit_page(1)
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "job", "id": "b", "ro')
+
+    restored = CheckpointJournal("site", resume=True, directory=tmp_path)
+    assert restored.restored_jobs() == [("a", {"title": "A"})]
+    assert restored.last_page() == 1
+    restored.close()
+
+def test_without_resume_starts_over_and_complete_removes_file(tmp_path):
+    journal = CheckpointJournal("site", directory=tmp_path)
+    journal.record_job("a", {"title": "A"})
+    journal.close()
+
+    fresh = CheckpointJournal("site", directory=tmp_path)
+    assert fresh.restored_jobs() == []
+    fresh.complete()
+    assert not (tmp_path / "site.jsonl").exists()
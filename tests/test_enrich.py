@@ -0,0 +1,28 @@
+import pytest
+
+from enrich import enrich
+
+def test_empty_text():
+    assert enrich("", None) == {"学历要求": "", "届别": "", "工作城市": "", "技能关键词": ""}
+
+def test_explicit_minimum_education_wins():
+    assert enrich("硕士优先", "本科及以上学历")["学历要求"] == "本科及以上"
+
+def test_lowest_mentioned_education_without_minimum():
+    assert enrich("博士或硕士学历")["学历要求"] == "硕士及以上"
+
+def test_years_cities_and_skills_keep_first_seen_order():
+    fields = enrich("2026届校园招聘，工作地点：上海、深圳、上海", "熟悉 Python 和 C++，了解 golang；python 优先")
+    assert fields["届别"] == "2026届"
+    assert fields["工作城市"] == "上海 深圳"
+    assert fields["技能关键词"] == "Python, C++, Go"
+
+def test_go_is_not_matched_inside_words():
+    assert enrich("Good communication skills, Google experience")["技能关键词"] == ""
+
+@pytest.mark.parametrize("text", ["北京大学毕业", "上海交通大学硕士优先", "北京电影学院相关专业"])
+def test_university_names_are_not_cities(text):
+    assert enrich(text)["工作城市"] == ""
+
+def test_city_next_to_university_name_still_counts():
+    assert enrich("base 深圳，香港中文大学优先")["工作城市"] == "深圳"
@@ -0,0 +1,25 @@
+from html_text import html_to_text, html_to_text_many
+
+def test_empty_and_plain_text():
+    assert html_to_text(None) == ""
+    assert html_to_text("  熟悉   Linux \n\n 优先 ") == "熟悉 Linux\n优先"
+
+def test_block_tags_and_breaks_become_lines():
+    assert html_to_text("<p>第一段</p><div>第二段<br/>第三行</div>") == "第一段\n第二段\n第三行"
+
+def test_list_items():
+    html = "<ul><li>负责后台开发</li><li>参与架构设计</li></ul><ol><li>本科</li><li>熟悉 C++</li></ol>"
+    assert html_to_text(html) == "- 负责后台开发\n- 参与架构设计\n1. 本科\n2. 熟悉 C++"
+
+def test_nested_lists_number_each_level():
+    html = "<ol><li>一<ol><li>甲</li><li>乙</li></ol></li><li>二</li></ol>"
+    assert html_to_text(html) == "1. 一\n1. 甲\n2. 乙\n2. 二"
+
+def test_entities_are_decoded_after_tags_are_removed():
+    assert html_to_text("<span>a &lt;b&gt; &amp;&nbsp;c</span>") == "a <b> & c"
+
+def test_comments_are_dropped():
+    assert html_to_text("<!-- <p>隐藏</p> -->可见") == "可见"
+
+def test_many_keeps_order():
+    assert html_to_text_many(["<p>a</p>", "", "b"]) == ["a", "", "b"]
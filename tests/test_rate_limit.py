@@ -0,0 +1,64 @@
+import pytest
+
+from rate_limit import HostLimiter, retry_after_seconds
+
+def make_limiter(**options):
+    return HostLimiter("example.com", **dict({"rate": 4.0, "max_rate": 10.0, "cooldown": 0.0}, **options))
+
+def test_good_responses_increase_up_to_max_rate():
+    limiter = make_limiter()
+    limiter.feedback(200, 0.05)
+    assert limiter.rate == 5.0
+    for _ in range(20):
+        limiter.feedback(200, 0.05)
+    assert limiter.rate == 10.0
+
+@pytest.mark.parametrize("status", [429, 403, None])
+def test_throttling_responses_halve_the_rate(status):
+    limiter = make_limiter()
+    limiter.feedback(status, 0.05)
+    assert limiter.rate == 2.0
+    assert limiter.stats["decreases"] == 1
+    # 降速后离开慢启动，每次正常响应只加 increase / rate
+    limiter.feedback(200, 0.05)
+    assert limiter.rate == pytest.approx(2.5)
+
+def test_backoffs_within_cooldown_count_once():
+    limiter = make_limiter(cooldown=60.0)
+    limiter.feedback(429, None)
+    limiter.feedback(429, None)
+    assert limiter.rate == 2.0
+    assert limiter.stats["decreases"] == 1
+
+def test_rate_never_drops_below_min_rate():
+    limiter = make_limiter(min_rate=1.5)
+    for _ in range(5):
+        limiter.feedback(429, None)
+    assert limiter.rate == 1.5
+
+def test_occasional_server_error_does_not_back_off():
+    limiter = make_limiter(cooldown=60.0)
+    limiter.feedback(500, 0.05)
+    assert limiter.rate == 4.0
+    assert limiter.stats["decreases"] == 0
+    # 连续的 5xx 使错误比例超过 25% 后才降速
+    for _ in range(3):
+        limiter.feedback(500, 0.05)
+    assert limiter.rate == 2.0
+
+def test_latency_well_above_baseline_backs_off():
+    limiter = make_limiter()
+    limiter.feedback(200, 0.05)
+    for _ in range(5):
+        limiter.feedback(200, 1.0)
+    assert limiter.stats["decreases"] >= 1
+
+def test_retry_after_pauses_the_host():
+    limiter = make_limiter()
+    limiter.feedback(429, None, retry_after=30)
+    assert limiter.paused_until - limiter.last_decrease == pytest.approx(30, abs=0.1)
+
+@pytest.mark.parametrize("value, seconds", [("5", 5.0), ("-1", 0.0), (None, None),
+                                            ("Wed, 21 Oct 2026 07:28:00 GMT", None)])
+def test_retry_after_seconds(value, seconds):
+    assert retry_after_seconds(value) == seconds
@@ -0,0 +1,41 @@
+from retry_queue import RetryQueue
+
+def test_drain_retries_until_success():
+    queue = RetryQueue(attempts=3, base_delay=0.0)
+    queue.add("a", "ctx-a")
+    queue.add("b", "ctx-b")
+    calls = {"a": 0, "b": 0}
+
+    def fetch(key):
+        calls[key] += 1
+        # a 第二次才成功，b 第一次就成功
+        return f"result-{key}" if key == "b" or calls[key] >= 2 else None
+
+    succeeded = {}
+    missing = queue.drain(fetch, lambda key, contexts, result: succeeded.update({key: (contexts, result)}))
+    assert missing == {}
+    assert succeeded == {"a": (["ctx-a"], "result-a"), "b": (["ctx-b"], "result-b")}
+    assert calls == {"a": 2, "b": 1}
+    assert len(queue) == 0
+
+def test_drain_keeps_keys_that_still_fail():
+    queue = RetryQueue(attempts=2, base_delay=0.0)
+    queue.add("a", "first")
+    queue.add("a", "second")
+    calls = []
+
+    def fetch(key):
+        calls.append(key)
+        raise RuntimeError("still down")
+
+    missing = queue.drain(fetch, lambda *args: None, workers=4)
+    # 同一键的多个上下文只请求一次，失败后全部保留
+    assert missing == {"a": ["first", "second"]}
+    assert calls == ["a", "a"]
+    assert queue.report() == 1
+
+def test_backoff_doubles_up_to_max_delay():
+    queue = RetryQueue(base_delay=1.0, max_delay=3.0)
+    assert 0.5 <= queue.backoff(1) <= 1.0
+    assert 1.0 <= queue.backoff(2) <= 2.0
+    assert 1.5 <= queue.backoff(5) <= 3.0
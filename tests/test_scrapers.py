@@ -0,0 +1,131 @@
+import pytest
+
+from checkpoint import CheckpointJournal
+from meituan_crawler import MeituanJobScraper
+from rate_limit import RateLimiter
+from retry_queue import RetryQueue
+from tencent_crawler import TencentJobScraper
+
+SCRAPERS = {"tencent": TencentJobScraper, "meituan": MeituanJobScraper}
+
+def make_scraper(site, server, journal_dir, resume=False, **options):
+    scraper = SCRAPERS[site](base_url=server.base_url, journal=CheckpointJournal(site, resume, directory=journal_dir),
+                             formats=["csv"], limiter=RateLimiter(rate=1000, max_rate=1000), **options)
+    # 测试中不做退避等待
+    scraper.retries = RetryQueue(base_delay=0.0)
+    return scraper
+
+def interrupt_before_retries(scraper):
+    def interrupt():
+        raise KeyboardInterrupt
+    scraper.retry_failed_details = interrupt
+
+def list_order(site, jobs):
+    """Expected job IDs in list order for the mock server."""
+    if site == "tencent":
+        return [f"tx{i}" for i in range(jobs)]
+    # 美团先列应届生（含与实习生重叠的岗位），再列只属于实习生的岗位
+    return [f"mt{i}" for i in range(jobs)]
+
+@pytest.mark.parametrize("site", ["tencent", "meituan"])
+def test_full_crawl_keeps_list_order(site, mock_server, tmp_path):
+    server = mock_server(jobs=120)
+    scraper = make_scraper(site, server, tmp_path / "journal")
+    scraper.scrape()
+    assert [record.job_id for record in scraper.jobs] == list_order(site, 120)
+    assert all(record.description and record.requirement for record in scraper.jobs)
+    assert not (tmp_path / "journal" / f"{site}.jsonl").exists()
+
+@pytest.mark.parametrize("site", ["tencent", "meituan"])
+def test_resume_fills_pending_details(site, mock_server, tmp_path):
+    journal_dir = tmp_path / "journal"
+    first = make_scraper(site, mock_server(jobs=120, error_rate=0.3, seed=5), journal_dir)
+    interrupt_before_retries(first)
+    first.scrape()
+    pending = {record.job_id for record in first.jobs if not record.description}
+    assert pending
+    assert (journal_dir / f"{site}.jsonl").exists()
+
+    server = mock_server(jobs=120)
+    second = make_scraper(site, server, journal_dir, resume=True, keep_raw=True)
+    second.scrape()
+    assert [record.job_id for record in second.jobs] == list_order(site, 120)
+    assert all(record.description for record in second.jobs)
+    # 只补抓上次缺详情的岗位；列表只请求最后提交页的下一页（每个类别一次），确认已到底
+    assert server.stats[f"{site}_detail"] == len(pending)
+    assert server.stats[f"{site}_list"] == len(second.job_types_to_scrape if site == "meituan" else [site])
+    # 恢复的岗位没有原始列表数据，--keep-raw 只保存补抓到的详情
+    for record in second.jobs:
+        if record.job_id in pending:
+            assert record.raw["detail"]
+    assert not (journal_dir / f"{site}.jsonl").exists()
+
+@pytest.mark.parametrize("site", ["tencent", "meituan"])
+def test_resume_continues_after_failed_list_page(site, mock_server, tmp_path, monkeypatch):
+    journal_dir = tmp_path / "journal"
+    server = mock_server(jobs=120)
+    first = make_scraper(site, server, journal_dir)
+    load_list_page = first.load_list_page
+
+    def fail_page_two(*args):
+        # 两个站点的页码都在倒数第二个位置参数
+        if args[-2] == 2:
+            return None, 0
+        return load_list_page(*args)
+
+    monkeypatch.setattr(first, "load_list_page", fail_page_two)
+    first.scrape()
+    assert (journal_dir / f"{site}.jsonl").exists()
+
+    second = make_scraper(site, mock_server(jobs=120), journal_dir, resume=True)
+    second.scrape()
+    assert [record.job_id for record in second.jobs] == list_order(site, 120)
+    assert not (journal_dir / f"{site}.jsonl").exists()
+
+def test_keep_raw_keeps_list_and_detail(mock_server, tmp_path):
+    scraper = make_scraper("tencent", mock_server(jobs=10), tmp_path / "journal", keep_raw=True)
+    scraper.scrape()
+    for record in scraper.jobs:
+        assert record.raw["list"]["postId"] == record.job_id
+        assert record.raw["detail"]["postId"] == record.job_id
+
+def test_meituan_posting_in_both_categories_is_merged(mock_server, tmp_path):
+    # 模拟服务中 mt30-mt35 同时出现在应届生和实习生两个类别
+    server = mock_server(jobs=60)
+    scraper = make_scraper("meituan", server, tmp_path / "journal")
+    scraper.scrape()
+    natures = {record.job_id: record.nature for record in scraper.jobs}
+    assert len(scraper.jobs) == 60
+    assert [job_id for job_id, nature in natures.items() if nature == "应届生/实习生"] == [f"mt{i}" for i in range(30, 36)]
+    # 两个类别共用一次详情请求
+    assert server.stats["meituan_detail"] == 60
+
+def test_meituan_pending_posting_in_both_categories(mock_server, tmp_path):
+    journal_dir = tmp_path / "journal"
+    first = make_scraper("meituan", mock_server(jobs=60, error_rate=1.0), journal_dir)
+    interrupt_before_retries(first)
+    first.scrape()
+    assert not any(record.description for record in first.jobs)
+
+    second = make_scraper("meituan", mock_server(jobs=60), journal_dir, resume=True)
+    second.scrape()
+    assert len(second.jobs) == 60
+    assert all(record.description for record in second.jobs)
+    assert sum(record.nature == "应届生/实习生" for record in second.jobs) == 6
+
+@pytest.mark.parametrize("site, field", [("tencent", "count"), ("meituan", "totalCount")])
+@pytest.mark.parametrize("count", [0, 10])
+def test_unusable_count_pages_until_short_page(site, field, count, mock_server, tmp_path, monkeypatch):
+    server = mock_server(jobs=120)
+    list_handler = getattr(server, f"{site}_list")
+
+    def wrong_count(body, query):
+        response = list_handler(body, query)
+        data = response["data"]
+        (data["page"] if site == "meituan" else data)[field] = count
+        return response
+
+    monkeypatch.setattr(server, f"{site}_list", wrong_count)
+    scraper = make_scraper(site, server, tmp_path / "journal")
+    scraper.scrape()
+    assert [record.job_id for record in scraper.jobs] == list_order(site, 120)
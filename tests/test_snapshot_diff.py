@@ -0,0 +1,32 @@
+from snapshot_diff import diff_snapshots, make_entry
+
+def row(title, requirement="本科", city="北京"):
+    return {"岗位名称": title, "岗位类别": "技术", "工作城市": city, "任职要求": requirement}
+
+def test_diff_reports_added_removed_and_changed():
+    old = [make_entry("1", row("后台开发")), make_entry("2", row("前端开发")), make_entry("3", row("测试开发"))]
+    new = [make_entry("1", row("后台开发")), make_entry("2", row("前端开发", requirement="硕士")),
+           make_entry("4", row("算法工程师"))]
+    diff = diff_snapshots(iter(old), new)
+    assert diff["counts"] == {"added": 1, "removed": 1, "changed": 1, "unchanged": 1}
+    assert diff["added"] == [{"id": "4", "title": "算法工程师", "category": "技术"}]
+    assert diff["removed"] == [{"id": "3", "title": "测试开发", "category": "技术"}]
+    assert diff["changed"] == [{"id": "2", "title": "前端开发", "category": "技术", "fields": ["任职要求"]}]
+
+def test_whitespace_only_changes_are_ignored():
+    old = [make_entry("1", row("后台开发", requirement="本科\n  及以上"))]
+    new = [make_entry("1", row("后台开发", requirement="本科 及以上"))]
+    assert diff_snapshots(old, new)["counts"]["unchanged"] == 1
+
+def test_columns_missing_on_one_side_are_not_compared():
+    old = [make_entry("1", {"岗位名称": "后台开发", "岗位类别": "技术"})]
+    new = [make_entry("1", row("后台开发", city="上海"))]
+    assert diff_snapshots(old, new)["counts"]["unchanged"] == 1
+
+def test_postings_without_ids_are_keyed_by_title_and_category():
+    old = [make_entry(None, row("后台开发")), make_entry(None, row("后台开发"))]
+    new = [make_entry(None, row("后台开发"))]
+    diff = diff_snapshots(old, new)
+    # 同名岗位按出现顺序编号，第二个视为下线
+    assert diff["removed"] == [{"id": "后台开发|技术#2", "title": "后台开发", "category": "技术"}]
+    assert diff["counts"]["unchanged"] == 1
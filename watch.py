@@ -0,0 +1,176 @@
+"""Long-running watch mode: re-crawls a site only when its job list has changed.
+
+Each site is polled on its own interval. Tencent and Meituan are probed first
+with a single list request per job type: the total count and the IDs on the
+first page. The crawl is started only when the probe differs from the state
+recorded after the last successful crawl, or when that crawl is older than
+--max-age. miHoYo and ByteDance have no cheap probe and are crawled on every
+poll, so their default interval is a day. Crawls run through run_all, one
+process per site with logs in logs/<site>.log. The last known state is kept
+in .watch_state.json, so a restart does not trigger a full round of crawls.
+
+Usage: python watch.py [--sites tencent meituan] [--interval-tencent 1800] [--incremental]
+       python watch.py --once    # probe every site once, crawl what changed, then exit (for cron)
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from run_all import LOG_DIR, SCRIPT_DIR, SITES, print_summary, run_all
+from sinks import add_output_arguments
+
+STATE_PATH = os.path.join(SCRIPT_DIR, ".watch_state.json")
+
+# 各站点默认轮询间隔（秒）；没有探测接口的站点每次轮询都会完整抓取
+DEFAULT_INTERVALS = {"mihoyo": 86400, "bytedance": 86400, "tencent": 1800, "meituan": 1800}
+DEFAULT_URLS = {"tencent": "https://join.qq.com", "meituan": "https://zhaopin.meituan.com"}
+INCREMENTAL_SITES = ("mihoyo", "tencent", "meituan") # 入口函数支持 incremental 参数的站点
+
+def probe_site(site, base_url):
+    """Returns the site's probe state, or None if the site has no probe."""
+    if site == "tencent":
+        from tencent_crawler import TencentJobScraper
+        scraper = TencentJobScraper(base_url=base_url)
+    elif site == "meituan":
+        from meituan_crawler import MeituanJobScraper
+        scraper = MeituanJobScraper(base_url=base_url)
+    else:
+        return None
+    try:
+        return scraper.probe()
+    finally:
+        scraper.session.close()
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state, path=STATE_PATH):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def describe(probe):
+    if "count" in probe:
+        return f"{probe['count']} jobs"
+    return ", ".join(f"{name} {value['count']}" for name, value in probe.items())
+
+class Watcher:
+    """Polls each site on its interval and crawls the ones whose probe changed."""
+
+    def __init__(self, sites, intervals, timeouts, urls=None, options=None, max_age=86400, log_dir=LOG_DIR,
+                 state_path=STATE_PATH):
+        self.sites = sites
+        self.intervals = intervals
+        self.timeouts = timeouts
+        self.urls = urls or {}
+        self.options = options or {} # 站点 -> 抓取入口函数的参数
+        self.max_age = max_age
+        self.log_dir = log_dir
+        self.state_path = state_path
+        self.state = load_state(state_path) # 站点 -> {"probe", "crawled_at"}
+        self.next_poll = {site: 0.0 for site in sites}
+        self.stats = {"polls": 0, "probes": 0, "skipped": 0, "crawls": 0}
+
+    def check(self, site):
+        """Probes one site; returns (needs crawl, probe state)."""
+        known = self.state.get(site, {})
+        age = time.time() - known.get("crawled_at", 0)
+        try:
+            probe = probe_site(site, self.urls.get(site, DEFAULT_URLS.get(site)))
+        except Exception as e:
+            # 探测失败时不贸然全量抓取，等下一次轮询
+            print(f"[{site}] Probe failed: {e}; retrying next poll.")
+            return False, None
+        if probe is None:
+            print(f"[{site}] No probe available; crawling.")
+            return True, None
+        self.stats["probes"] += 1
+        if probe != known.get("probe"):
+            print(f"[{site}] Changed ({describe(probe)}); crawling.")
+            return True, probe
+        if age > self.max_age:
+            print(f"[{site}] Unchanged, but last crawl was {age / 3600:.1f}h ago; crawling.")
+            return True, probe
+        print(f"[{site}] Unchanged ({describe(probe)}); skipping.")
+        self.stats["skipped"] += 1
+        return False, probe
+
+    def poll(self):
+        """Checks every due site and crawls the changed ones together. Returns the crawl summary."""
+        now = time.time()
+        due = [site for site in self.sites if self.next_poll[site] <= now]
+        to_crawl, probes = [], {}
+        for site in due:
+            self.stats["polls"] += 1
+            self.next_poll[site] = now + self.intervals[site]
+            crawl, probes[site] = self.check(site)
+            if crawl:
+                to_crawl.append(site)
+        if not to_crawl:
+            return {}
+        summary, wall_time = run_all(to_crawl, self.timeouts, log_dir=self.log_dir, options=self.options)
+        print_summary(summary, wall_time)
+        self.stats["crawls"] += len(to_crawl)
+        for site, info in summary.items():
+            # 只有抓取成功才记下新状态，失败的站点下次轮询会再次抓取
+            if info["status"] == "ok":
+                self.state[site] = {"probe": probes.get(site), "crawled_at": time.time(), "jobs": info["jobs"]}
+        save_state(self.state, self.state_path)
+        return summary
+
+    def run(self, once=False):
+        while True:
+            self.poll()
+            if once:
+                break
+            wake = min(self.next_poll.values())
+            nxt = min(self.next_poll, key=self.next_poll.get)
+            print(f"Next poll: {nxt} at {datetime.fromtimestamp(wake).strftime('%H:%M:%S')}")
+            time.sleep(max(wake - time.time(), 0))
+
+    def report(self):
+        print(f"\nWatch summary: {self.stats['polls']} polls, {self.stats['probes']} probes, "
+              f"{self.stats['skipped']} skipped, {self.stats['crawls']} crawls")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES), help="要监控的站点")
+    for site in SITES:
+        parser.add_argument(f"--interval-{site}", type=int, default=DEFAULT_INTERVALS[site],
+                            help=f"{site} 的轮询间隔（秒）")
+    parser.add_argument("--max-age", type=int, default=86400, help="列表未变化时，距上次抓取超过该秒数仍会重新抓取")
+    parser.add_argument("--timeout", type=int, default=1800, help="每次抓取的超时（秒）")
+    for site in DEFAULT_URLS:
+        parser.add_argument(f"--base-url-{site}", default=DEFAULT_URLS[site], help=f"{site} 接口地址，可指向本地模拟服务")
+    parser.add_argument("--incremental", action="store_true", help="以增量模式抓取（只请求新增或变化岗位的详情）")
+    parser.add_argument("--once", action="store_true", help="只轮询一次后退出，适合由 cron 调用")
+    parser.add_argument("--log-dir", default=LOG_DIR, help="各站点日志目录")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    urls = {site: getattr(args, f"base_url_{site}") for site in DEFAULT_URLS}
+    options = {}
+    for site in args.sites:
+        options[site] = {"formats": args.formats}
+        if site in urls:
+            options[site]["base_url"] = urls[site]
+        if args.incremental and site in INCREMENTAL_SITES:
+            options[site]["incremental"] = True
+    watcher = Watcher(args.sites, {site: getattr(args, f"interval_{site}") for site in args.sites},
+                      {site: args.timeout for site in args.sites}, urls=urls, options=options,
+                      max_age=args.max_age, log_dir=args.log_dir)
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        watcher.report()
+
+if __name__ == "__main__":
+    main()